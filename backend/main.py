@@ -1,39 +1,92 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import partial
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import bisect
+import hashlib
+import re
+import time
 import json
 from pathlib import Path
-import subprocess
 import logging
 import sys
 import os
-import requests
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from metrics import MetricsRegistry, render_prometheus
+from upstream_client import UpstreamClient
+from job_queue import Job, JobQueue
+from broadcaster import Broadcaster, Event, SubscriberLagged, delta
+from history_store import HISTORY_FIELDS
+from dal_calculation import (DALCalculator, DEFAULT_CONFIG_PATH, add_calculator_arguments, build_calculators,
+                             close_calculators, export_histories, live_results_file, network_files,
+                             save_results_and_update_history)
+from response_cache import DEFAULT_CACHE_PATH
+from baker_store import DEFAULT_STORE_PATH
+from baker_archive import BakerArchive
+from baker_lookup import BakerLookup
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# GitHub Pages URL and local fallback
-GITHUB_PAGES_URL = "https://aurelienmonteillet.github.io/dal-dashboard/dal_stats.json"
-LOCAL_RESULTS_FILE = Path("/opt/dal_dashboard/backend/data/dal_stats.json")
-GITHUB_PAGES_HISTORY_URL = "https://aurelienmonteillet.github.io/dal-dashboard/dal_stats_history.json"
+# GitHub Pages URL and local fallback (overridable, e.g. to point the load test at a stand-in)
+GITHUB_PAGES_BASE_URL = os.getenv("GITHUB_PAGES_BASE_URL", "https://aurelienmonteillet.github.io/dal-dashboard")
+LOCAL_DATA_DIR = Path(os.getenv("LOCAL_DATA_DIR", "/opt/dal_dashboard/backend/data"))
+GITHUB_PAGES_URL = f"{GITHUB_PAGES_BASE_URL}/dal_stats.json"
+LOCAL_RESULTS_FILE = LOCAL_DATA_DIR / "dal_stats.json"
+GITHUB_PAGES_HISTORY_URL = f"{GITHUB_PAGES_BASE_URL}/dal_stats_history.json"
+LOCAL_HISTORY_FILE = LOCAL_DATA_DIR / "dal_stats_history.json"
+LOCAL_RUN_REPORT_FILE = LOCAL_DATA_DIR / "dal_run_report.json"
+LOCAL_CACHE_DIR = Path(os.getenv("LOCAL_CACHE_DIR", "/opt/dal_dashboard/backend/cache"))
+LOCAL_ARCHIVE_DIR = Path(os.getenv("LOCAL_ARCHIVE_DIR", str(LOCAL_CACHE_DIR / "archive")))
 
-app = FastAPI(
-    title="DAL-o-meter API",
-    description="API for tracking DAL adoption on Tezos network",
-    version="1.0.0"
-)
+# TzKT endpoints and rate limits of the calculators behind the baker endpoints and calculation jobs
+NETWORK_CONFIG_FILE = Path(os.getenv("NETWORK_CONFIG_FILE", str(DEFAULT_CONFIG_PATH)))
 
-# CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Networks served from memory, mainnet always included
+NETWORKS = list(dict.fromkeys(
+    ["mainnet"] + [network.strip() for network in os.getenv("NETWORKS", "mainnet").split(",") if network.strip()]
+))
+
+# How often the background task refreshes the stats snapshot, and how old the
+# snapshot may get before a request triggers a revalidation
+STATS_REFRESH_INTERVAL = int(os.getenv("UPDATE_INTERVAL", "300"))
+STATS_CACHE_DURATION = int(os.getenv("CACHE_DURATION", "300"))
+
+# /api/stream: seconds between heartbeats, how often the live estimate file is
+# checked for changes, and how many missed cycles a resuming client is sent
+STREAM_HEARTBEAT = int(os.getenv("STREAM_HEARTBEAT", "15"))
+LIVE_POLL_INTERVAL = int(os.getenv("LIVE_POLL_INTERVAL", "10"))
+STREAM_RESUME_LIMIT = 100
+
+# Most addresses accepted by POST /api/bakers
+MAX_BAKERS_PER_REQUEST = 500
+BAKER_ADDRESS = re.compile(r"^tz[1-4][1-9A-HJ-NP-Za-km-z]{33}$")
+
+api_metrics = MetricsRegistry()
+api_metrics.describe("http_requests_total", "API requests by route and status")
+api_metrics.describe("http_request_duration_seconds", "API request latency by route")
+api_metrics.describe("upstream_fetch_seconds", "Time spent fetching data behind the API, by source")
+api_metrics.describe("upstream_coalesced_total", "Upstream requests served by joining an identical request in flight")
+api_metrics.describe("upstream_short_circuits_total", "Upstream requests skipped because the host's circuit was open")
+api_metrics.describe("stream_connections_total", "Clients connected to /api/stream")
+api_metrics.describe("stream_events_total", "Events published to /api/stream subscribers, by type")
+
+# Shared GitHub Pages client, closed by the app lifespan
+upstream = UpstreamClient(timeout=float(os.getenv("UPSTREAM_TIMEOUT", "5")), metrics=api_metrics)
+
+class BakersRequest(BaseModel):
+    """Body of POST /api/bakers"""
+    addresses: List[str]
+    network: str = "mainnet"
 
 class DALStatsResponse(BaseModel):
     """Response model for DAL statistics"""
@@ -49,13 +102,89 @@ class DALStatsResponse(BaseModel):
     dal_baking_power: float
     dal_participation_percentage: float = 0.0
     dal_adoption_percentage: float = 0.0
+    stake_gini: float = 0.0
+    top_stake_percentage: float = 0.0
+    top_dal_active_bakers: int = 0
+    stake_buckets: List[Dict] = []
+    provisional: bool = False
+    level: Optional[int] = None
+
+# Stats updates pushed to /api/stream clients, one broadcaster per network
+broadcasters: Dict[str, Broadcaster] = {network: Broadcaster() for network in NETWORKS}
 
-def read_dal_stats():
+def compact_stats(data: dict, fields=HISTORY_FIELDS) -> dict:
+    """Stats reduced to the history fields, as sent on /api/stream"""
+    compact = {field: data.get(field) for field in fields}
+    if isinstance(compact.get("timestamp"), datetime):
+        compact["timestamp"] = compact["timestamp"].isoformat()
+    return compact
+
+LIVE_FIELDS = HISTORY_FIELDS + ("total_bakers", "dal_inactive_bakers", "level")
+
+def stats_filename(network: str) -> str:
+    """Name of a network's results file, as written by dal_calculation.py"""
+    return "dal_stats.json" if network == "mainnet" else f"dal_stats_{network}.json"
+
+class StatsPending(Exception):
+    """No statistics to serve yet, a calculation job is producing them"""
+
+    def __init__(self, job: Job):
+        super().__init__(f"Calculation job {job.id} is {job.status}")
+        self.job = job
+
+# Calculations run in-process, one at a time and at most one per network
+calculation_jobs = JobQueue()
+calculators: Dict[str, DALCalculator] = {}
+
+def get_calculators() -> Dict[str, DALCalculator]:
+    """Calculators of every served network, built on first use with the dal_calculation.py defaults"""
+    if not calculators:
+        parser = argparse.ArgumentParser()
+        add_calculator_arguments(parser)
+        built, _ = build_calculators(parser.parse_args([
+            "--networks", ",".join(NETWORKS),
+            "--config", str(NETWORK_CONFIG_FILE),
+            "--cache-file", str(LOCAL_CACHE_DIR / DEFAULT_CACHE_PATH.name),
+            "--baker-store", str(LOCAL_CACHE_DIR / DEFAULT_STORE_PATH.name),
+            "--archive-dir", str(LOCAL_ARCHIVE_DIR),
+        ]))
+        calculators.update(built)
+    return calculators
+
+async def calculate_last_cycle(network: str) -> int:
+    """Calculate and save the last completed cycle of a network"""
+    calculator = (await asyncio.to_thread(get_calculators))[network]
+    cycle = await calculator._engine.run(calculator.get_current_cycle) - 1
+    stats = await calculator.calculate_stats_async(cycle=cycle)
+    await asyncio.to_thread(save_results_and_update_history, stats, *network_files(LOCAL_DATA_DIR, network))
+    await asyncio.to_thread(export_histories)
+    stats_snapshots[network].revalidate()
+    return cycle
+
+def calculation_key(network: str) -> str:
+    return f"calculation:{network}"
+
+def submit_calculation(network: str) -> Job:
+    """Queue a calculation of the network, or get the one already queued or running"""
+    return calculation_jobs.submit(calculation_key(network), partial(calculate_last_cycle, network))
+
+def read_local_stats(network: str = "mainnet"):
+    """Read DAL statistics from the local file (blocking)"""
+    local_file = LOCAL_DATA_DIR / stats_filename(network)
+    with open(local_file, 'r') as f:
+        data = json.load(f)
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        logger.info(f"Successfully read cycle {data['cycle']} from local file")
+        return data
+
+async def read_dal_stats(network: str = "mainnet"):
     """Read DAL statistics from GitHub Pages with local fallback"""
+    pages_url = f"{GITHUB_PAGES_BASE_URL}/{stats_filename(network)}"
     try:
         # Try to fetch from GitHub Pages first
-        logger.info("Fetching DAL stats from GitHub Pages...")
-        response = requests.get(GITHUB_PAGES_URL, timeout=5)
+        logger.info(f"Fetching {network} DAL stats from GitHub Pages...")
+        with api_metrics.timer("upstream_fetch_seconds", source="github_pages_stats"):
+            response = await upstream.get(pages_url)
         response.raise_for_status()
         data = response.json()
         # Convert string timestamp to datetime
@@ -65,35 +194,489 @@ def read_dal_stats():
     except Exception as e:
         logger.warning(f"Could not fetch from GitHub Pages: {e}. Falling back to local file.")
         try:
-            # Fallback to local file
-            with open(LOCAL_RESULTS_FILE, 'r') as f:
-                data = json.load(f)
-                data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-                logger.info(f"Successfully read cycle {data['cycle']} from local file")
-                return data
+            # The local file read blocks, keep it off the event loop
+            return await asyncio.to_thread(read_local_stats, network)
         except FileNotFoundError:
-            logger.error("Local DAL stats file not found. Running initial calculation...")
-            # Run the calculation script if file doesn't exist
-            script_path = "/opt/dal_dashboard/backend/scripts/dal_calculation.py"
-            subprocess.run([script_path, "--network", "mainnet"], check=True)
-            # Try reading again
-            with open(LOCAL_RESULTS_FILE, 'r') as f:
-                data = json.load(f)
-                data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-                return data
+            logger.error("Local DAL stats file not found. Queuing a calculation...")
+            raise StatsPending(submit_calculation(network))
         except Exception as e:
             logger.error(f"Error reading DAL stats: {e}")
             raise HTTPException(status_code=500, detail="Error reading DAL statistics")
 
+class StatsSnapshot:
+    """
+    In-memory copy of the latest DAL statistics.
+
+    Handlers read from memory and never wait on GitHub Pages once a first
+    snapshot exists: a stale snapshot is still served while a single
+    background refresh revalidates it.
+    """
+
+    def __init__(self, max_age: int, network: str = "mainnet"):
+        self.max_age = max_age
+        self.network = network
+        self.data: Optional[dict] = None
+        self.updated_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh"""
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+    def is_stale(self) -> bool:
+        return self.updated_at is None or self.age > self.max_age
+
+    def revalidate(self) -> asyncio.Task:
+        """Start a refresh unless one is already in flight"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self):
+        try:
+            data = await read_dal_stats(self.network)
+        except Exception as e:
+            logger.error(f"Could not refresh {self.network} DAL stats snapshot: {e}")
+            return
+        previous, self.data = self.data, data
+        self.updated_at = time.monotonic()
+        if previous is None or previous.get("cycle") != data.get("cycle"):
+            broadcasters[self.network].publish("stats", str(data["cycle"]), compact_stats(data))
+            api_metrics.inc("stream_events_total", network=self.network, type="stats")
+
+    async def get(self) -> dict:
+        """
+        Get the current snapshot.
+
+        Returns:
+            dict: Latest DAL statistics
+        """
+        if self.data is None:
+            await asyncio.shield(self.revalidate())
+        elif self.is_stale():
+            self.revalidate()
+        if self.data is None:
+            job = calculation_jobs.active(calculation_key(self.network))
+            if job is not None:
+                raise StatsPending(job)
+            raise HTTPException(status_code=503, detail="DAL statistics not available yet")
+        return self.data
+
+stats_snapshots = {network: StatsSnapshot(max_age=STATS_CACHE_DURATION, network=network) for network in NETWORKS}
+stats_snapshot = stats_snapshots["mainnet"]
+
+class LiveStats:
+    """
+    Provisional statistics of the running cycle.
+
+    Written by the cycle scheduler next to the API, so only the local
+    dal_stats_live.json is read, again whenever its mtime changes. Each new
+    estimate is pushed to the /api/stream clients as a delta of the previous one.
+    """
+
+    def __init__(self, local_file: Path, network: str = "mainnet"):
+        self.local_file = local_file
+        self.network = network
+        self.data: Optional[dict] = None
+        self._mtime: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _load(self, mtime: float):
+        with open(self.local_file, 'r') as f:
+            data = json.load(f)
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        self.data = data
+        self._mtime = mtime
+
+    async def refresh(self):
+        """Reload the estimate if the file changed, and broadcast what changed in it"""
+        try:
+            mtime = self.local_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        async with self._lock:
+            if mtime == self._mtime:
+                return
+            previous = self.data
+            try:
+                await asyncio.to_thread(self._load, mtime)
+            except Exception as e:
+                logger.error(f"Could not read live DAL stats {self.local_file}: {e}")
+                return
+        current = compact_stats(self.data, LIVE_FIELDS)
+        if previous is None or previous.get("cycle") != current["cycle"]:
+            changes = current
+        else:
+            changes = delta(compact_stats(previous, LIVE_FIELDS), current, keys=("cycle", "level"))
+        broadcasters[self.network].publish("live", f"{current['cycle']}.{current['level']}", changes)
+        api_metrics.inc("stream_events_total", network=self.network, type="live")
+
+    async def get(self) -> dict:
+        """
+        Get the latest live estimate.
+
+        Returns:
+            dict: Provisional DAL statistics of the running cycle
+        """
+        await self.refresh()
+        if self.data is None:
+            raise HTTPException(status_code=404, detail="No live estimate available")
+        return self.data
+
+live_stats = {network: LiveStats(live_results_file(LOCAL_DATA_DIR, network), network) for network in NETWORKS}
+
+class HistoryIndex:
+    """
+    Cycle-indexed copy of dal_stats_history.json.
+
+    The local file is preferred and reloaded when its mtime changes. Without
+    it, the GitHub Pages copy is revalidated with its ETag at most once every
+    max_age seconds.
+    """
+
+    def __init__(self, local_file: Path, url: str, max_age: int):
+        self.local_file = local_file
+        self.url = url
+        self.max_age = max_age
+        self.entries: List[dict] = []
+        self.raw: bytes = b"[]"
+        self.by_cycle: Dict[int, dict] = {}
+        self.cycles: List[int] = []
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+        self._local_mtime: Optional[float] = None
+        self._remote_etag: Optional[str] = None
+        self._remote_checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.etag is not None
+
+    def _local_file_mtime(self) -> Optional[float]:
+        try:
+            return self.local_file.stat().st_mtime
+        except OSError:
+            return None
+
+    def needs_reload(self) -> bool:
+        mtime = self._local_file_mtime()
+        if mtime is not None:
+            return mtime != self._local_mtime
+        return (self._remote_checked_at is None
+                or time.monotonic() - self._remote_checked_at > self.max_age)
+
+    def _index(self, raw: bytes, last_modified: datetime):
+        entries = json.loads(raw)
+        self.by_cycle = {entry["cycle"]: entry for entry in entries}
+        self.cycles = sorted(self.by_cycle)
+        self.entries = entries
+        # Served as is for the unfiltered history, rather than serialized again on each request
+        self.raw = raw
+        self.etag = f'"{hashlib.sha1(raw).hexdigest()}"'
+        self.last_modified = last_modified.replace(microsecond=0)
+
+    def _load_local(self, mtime: float):
+        with api_metrics.timer("upstream_fetch_seconds", source="local_history"):
+            raw = self.local_file.read_bytes()
+        self._index(raw, datetime.fromtimestamp(mtime, tz=timezone.utc))
+        self._local_mtime = mtime
+        logger.info(f"Loaded {len(self.cycles)} cycles of history from {self.local_file}")
+
+    async def _load_remote(self):
+        headers = {}
+        if self._remote_etag and self.loaded:
+            headers["If-None-Match"] = self._remote_etag
+        with api_metrics.timer("upstream_fetch_seconds", source="github_pages_history"):
+            response = await upstream.get(self.url, headers=headers)
+        self._remote_checked_at = time.monotonic()
+        if response.status_code == 304:
+            return
+        response.raise_for_status()
+        try:
+            last_modified = parsedate_to_datetime(response.headers["Last-Modified"])
+        except (KeyError, TypeError, ValueError):
+            last_modified = datetime.now(timezone.utc)
+        self._index(response.content, last_modified)
+        self._remote_etag = response.headers.get("ETag")
+        logger.info(f"Fetched {len(self.cycles)} cycles of history from GitHub Pages")
+
+    async def reload(self):
+        """Reload the history from the local file, or GitHub Pages without it"""
+        mtime = self._local_file_mtime()
+        if mtime is not None:
+            await asyncio.to_thread(self._load_local, mtime)
+        else:
+            await self._load_remote()
+
+    async def ensure_fresh(self):
+        """
+        Make sure the index reflects the latest history.
+
+        A failed reload keeps serving the previously loaded history.
+        """
+        if not self.needs_reload():
+            return
+        async with self._lock:
+            if not self.needs_reload():
+                return
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Could not reload DAL history: {e}")
+        if not self.loaded:
+            raise HTTPException(status_code=500, detail="Error fetching DAL history")
+
+    def get(self, cycle: int) -> Optional[dict]:
+        return self.by_cycle.get(cycle)
+
+    def range(self, from_cycle: Optional[int] = None, to_cycle: Optional[int] = None) -> List[dict]:
+        """
+        Get the history entries between two cycles, both included.
+
+        Returns:
+            List[dict]: Entries sorted by cycle (descending), like the history file
+        """
+        if from_cycle is None and to_cycle is None:
+            return self.entries
+        lo = 0 if from_cycle is None else bisect.bisect_left(self.cycles, from_cycle)
+        hi = len(self.cycles) if to_cycle is None else bisect.bisect_right(self.cycles, to_cycle)
+        return [self.by_cycle[cycle] for cycle in reversed(self.cycles[lo:hi])]
+
+history_index = HistoryIndex(LOCAL_HISTORY_FILE, GITHUB_PAGES_HISTORY_URL, max_age=STATS_CACHE_DURATION)
+
+# Per-baker archives written by dal_calculation.py, one per network
+baker_archives: Dict[str, BakerArchive] = {network: BakerArchive(LOCAL_ARCHIVE_DIR / network) for network in NETWORKS}
+
+def get_archive(network: str) -> BakerArchive:
+    archive = baker_archives.get(network)
+    if archive is None:
+        raise HTTPException(status_code=404, detail="Unknown network")
+    return archive
+
+# Single-baker lookups of the last completed cycle, built with the calculators on first use
+baker_lookups: Dict[str, BakerLookup] = {}
+
+async def get_baker_lookup(network: str) -> BakerLookup:
+    lookup = baker_lookups.get(network)
+    if lookup is None:
+        if network not in NETWORKS:
+            raise HTTPException(status_code=404, detail="Unknown network")
+        calculator = (await asyncio.to_thread(get_calculators))[network]
+        lookup = baker_lookups.setdefault(network, BakerLookup(calculator, metrics=api_metrics))
+    return lookup
+
+def check_baker_address(address: str):
+    if not BAKER_ADDRESS.match(address):
+        raise HTTPException(status_code=400, detail=f"Invalid baker address: {address}")
+
+def conditional_response(request: Request, payload, etag: str, last_modified: datetime) -> Response:
+    """
+    Build a JSON response carrying ETag/Last-Modified, or a 304 when the
+    client's copy is still current. A bytes payload is sent as already encoded JSON.
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags or f"W/{etag}" in tags:
+            return Response(status_code=304, headers=headers)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                if last_modified <= parsedate_to_datetime(if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+    if isinstance(payload, bytes):
+        return Response(payload, media_type="application/json", headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+async def refresh_stats_periodically():
+    """Keep the stats snapshot warm independently of incoming requests"""
+    while True:
+        await asyncio.shield(asyncio.gather(*(snapshot.revalidate() for snapshot in stats_snapshots.values())))
+        await asyncio.sleep(STATS_REFRESH_INTERVAL)
+
+async def watch_live_stats_periodically():
+    """Pick up new live estimates for the stream subscribers, without waiting for a request"""
+    while True:
+        await asyncio.gather(*(live.refresh() for live in live_stats.values()))
+        await asyncio.sleep(LIVE_POLL_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresher = asyncio.create_task(refresh_stats_periodically())
+    live_watcher = asyncio.create_task(watch_live_stats_periodically())
+    yield
+    refresher.cancel()
+    live_watcher.cancel()
+    await calculation_jobs.aclose()
+    await upstream.aclose()
+    close_calculators(calculators)
+
+app = FastAPI(
+    title="DAL-o-meter API",
+    description="API for tracking DAL adoption on Tezos network",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# CORS configuration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    api_metrics.observe("http_request_duration_seconds", time.perf_counter() - started,
+                        method=request.method, path=path)
+    api_metrics.inc("http_requests_total", method=request.method, path=path, status=response.status_code)
+    return response
+
+@app.exception_handler(StatsPending)
+async def stats_pending_handler(request: Request, exc: StatsPending):
+    """Tell the client the statistics are being computed and where to follow the job"""
+    return JSONResponse(
+        {"status": "computing", "job_id": exc.job.id, "status_url": f"/api/jobs/{exc.job.id}"},
+        status_code=202,
+        headers={"Retry-After": "30"}
+    )
+
 @app.get("/api/stats", response_model=DALStatsResponse)
-async def get_stats():
+async def get_stats(live: bool = Query(False, description="Provisional estimate of the running cycle")):
     """
-    Get the latest DAL statistics from GitHub Pages.
+    Get the latest DAL statistics from the in-memory snapshot of GitHub Pages.
     
     Returns:
-        DALStatsResponse: Current DAL statistics
+        DALStatsResponse: Current DAL statistics, or the live estimate of the running cycle
     """
-    return read_dal_stats()
+    if live:
+        return await live_stats["mainnet"].get()
+    return await stats_snapshot.get()
+
+@app.get("/api/{network}/stats", response_model=DALStatsResponse)
+async def get_network_stats(network: str,
+                            live: bool = Query(False, description="Provisional estimate of the running cycle")):
+    """
+    Get the latest DAL statistics of a network from its in-memory snapshot.
+    
+    Returns:
+        DALStatsResponse: Current DAL statistics of the network, or the live estimate of its running cycle
+    """
+    snapshot = stats_snapshots.get(network)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Unknown network")
+    if live:
+        return await live_stats[network].get()
+    return await snapshot.get()
+
+def resume_cycle(last_event_id: Optional[str]) -> Optional[int]:
+    """
+    Last cycle a reconnecting client has the statistics of.
+
+    Stats events are identified by their cycle, live events by cycle.level;
+    a live estimate of cycle N means the client has cycle N-1 at most.
+    """
+    if not last_event_id:
+        return None
+    cycle, _, level = last_event_id.partition(".")
+    try:
+        return int(cycle) - 1 if level else int(cycle)
+    except ValueError:
+        return None
+
+async def stream_events(network: str, last_cycle: Optional[int]):
+    """
+    Initial state (or missed cycles) of a subscriber, then every update.
+
+    The generator is cancelled by the server when the client disconnects.
+    """
+    broadcaster = broadcasters[network]
+    # Events published while the initial state is read are sent again; deltas only set fields, so that is harmless
+    cursor = broadcaster.seq
+    broadcaster.subscribers += 1
+    api_metrics.inc("stream_connections_total", network=network)
+    try:
+        yield f"retry: {STREAM_HEARTBEAT * 1000}\n\n".encode()
+        sent = last_cycle
+        if last_cycle is not None and network == "mainnet":
+            # Missed cycles come from the history index rather than the bounded backlog
+            try:
+                await history_index.ensure_fresh()
+                missed = history_index.range(from_cycle=last_cycle + 1)[:STREAM_RESUME_LIMIT]
+            except HTTPException:
+                missed = []
+            for entry in reversed(missed):
+                yield Event(0, "stats", str(entry["cycle"]), entry).frame
+                sent = entry["cycle"]
+        latest = stats_snapshots[network].data
+        if latest is not None and (sent is None or latest["cycle"] > sent):
+            yield Event(0, "stats", str(latest["cycle"]), compact_stats(latest)).frame
+        live = live_stats[network]
+        await live.refresh()
+        if live.data is not None:
+            current = compact_stats(live.data, LIVE_FIELDS)
+            yield Event(0, "live", f"{current['cycle']}.{current['level']}", current).frame
+
+        while True:
+            try:
+                events = await broadcaster.wait(cursor, STREAM_HEARTBEAT)
+            except SubscriberLagged:
+                # Closing makes the client reconnect with its Last-Event-ID and resume
+                return
+            if not events:
+                yield b": heartbeat\n\n"
+                continue
+            for event in events:
+                yield event.frame
+            cursor = events[-1].seq
+    finally:
+        broadcaster.subscribers -= 1
+
+@app.get("/api/stream")
+async def stream(
+    request: Request,
+    network: str = Query("mainnet", description="Network to follow"),
+    last_cycle: Optional[int] = Query(None, description="Resume after this cycle (or send Last-Event-ID)")
+):
+    """
+    Server-sent events pushing every new cycle and live estimate.
+    
+    A new client first gets the latest cycle and live estimate, then
+    "stats" events with each new cycle and "live" events with the fields of
+    the live estimate that changed. A reconnecting client gets the cycles it
+    missed instead of the latest one.
+    
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    if network not in broadcasters:
+        raise HTTPException(status_code=404, detail="Unknown network")
+    if last_cycle is None:
+        last_cycle = resume_cycle(request.headers.get("last-event-id"))
+    return StreamingResponse(
+        stream_events(network, last_cycle),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/health")
 async def health_check():
@@ -104,10 +687,11 @@ async def health_check():
         dict: Status of the API
     """
     try:
-        stats = read_dal_stats()
+        stats = await stats_snapshot.get()
         return JSONResponse({
             "status": "healthy",
-            "last_update": stats["timestamp"]
+            "last_update": stats["timestamp"].isoformat(),
+            "snapshot_age": stats_snapshot.age
         })
     except Exception:
         return JSONResponse({
@@ -116,31 +700,142 @@ async def health_check():
         }, status_code=500)
 
 @app.get("/api/history")
-async def get_history():
+async def get_history(
+    request: Request,
+    from_cycle: Optional[int] = Query(None, alias="from"),
+    to_cycle: Optional[int] = Query(None, alias="to"),
+):
+    """
+    Get the DAL statistics history, optionally restricted to a range of cycles.
+    """
+    if from_cycle is not None and to_cycle is not None and from_cycle > to_cycle:
+        raise HTTPException(status_code=400, detail="'from' must not be greater than 'to'")
+    await history_index.ensure_fresh()
+    unfiltered = from_cycle is None and to_cycle is None
+    return conditional_response(
+        request,
+        history_index.raw if unfiltered else history_index.range(from_cycle, to_cycle),
+        history_index.etag,
+        history_index.last_modified
+    )
+
+@app.get("/api/cycle/{cycle}")
+async def get_cycle(cycle: int, request: Request):
+    """
+    Get DAL statistics for a specific cycle from the history.
+    """
+    await history_index.ensure_fresh()
+    entry = history_index.get(cycle)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    return conditional_response(request, entry, history_index.etag, history_index.last_modified)
+
+@app.get("/api/baker/{address}")
+async def get_baker(
+    address: str,
+    from_cycle: Optional[int] = Query(None, alias="from"),
+    to_cycle: Optional[int] = Query(None, alias="to"),
+    network: str = "mainnet",
+):
     """
-    Get the complete DAL statistics history from GitHub Pages.
+    Get the DAL status of a baker in the last completed cycle, and its per-cycle results from the archive.
+    
+    The status is served from an in-memory cache, so it costs at most one
+    upstream lookup per baker and cycle.
     """
+    if from_cycle is not None and to_cycle is not None and from_cycle > to_cycle:
+        raise HTTPException(status_code=400, detail="'from' must not be greater than 'to'")
+    check_baker_address(address)
+    archive = get_archive(network)
+    lookup = await get_baker_lookup(network)
+    with api_metrics.timer("upstream_fetch_seconds", source="archive"):
+        timeline = await asyncio.to_thread(archive.baker_timeline, address, from_cycle, to_cycle)
     try:
-        response = requests.get(GITHUB_PAGES_HISTORY_URL, timeout=5)
-        response.raise_for_status()
-        return response.json()
+        result = await lookup.get(address)
     except Exception as e:
-        logger.error(f"Error fetching DAL history: {e}")
-        raise HTTPException(status_code=500, detail="Error fetching DAL history")
+        logger.warning(f"Could not look up baker {address}: {e}")
+        if timeline is None:
+            raise HTTPException(status_code=503, detail="Baker status not available")
+        result = {}
+    if timeline is None and result.get("dal_status") is None:
+        raise HTTPException(status_code=404, detail="Baker not found")
+    return {**result, "address": address, "network": network, "cycles": timeline or []}
 
-@app.get("/api/cycle/{cycle}")
-async def get_cycle(cycle: int):
+@app.post("/api/bakers")
+async def get_bakers(request: BakersRequest):
     """
-    Get DAL statistics for a specific cycle from GitHub Pages history.
+    Get the DAL status of many bakers in the last completed cycle.
+    
+    Bakers missing from the cache are looked up concurrently.
     """
+    addresses = list(dict.fromkeys(request.addresses))
+    if len(addresses) > MAX_BAKERS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BAKERS_PER_REQUEST} addresses per request")
+    for address in addresses:
+        check_baker_address(address)
+    lookup = await get_baker_lookup(request.network)
     try:
-        response = requests.get(GITHUB_PAGES_HISTORY_URL, timeout=5)
-        response.raise_for_status()
-        history = response.json()
-        for entry in history:
-            if entry.get("cycle") == cycle:
-                return entry
-        raise HTTPException(status_code=404, detail="Cycle not found")
+        cycle, bakers = await lookup.get_many(addresses)
     except Exception as e:
-        logger.error(f"Error fetching cycle {cycle}: {e}")
-        raise HTTPException(status_code=500, detail="Error fetching cycle data") 
\ No newline at end of file
+        logger.warning(f"Could not look up bakers: {e}")
+        raise HTTPException(status_code=503, detail="Baker status not available")
+    return {"network": request.network, "cycle": cycle, "bakers": bakers}
+
+@app.get("/api/distribution")
+async def get_distribution(
+    from_cycle: Optional[int] = Query(None, alias="from"),
+    to_cycle: Optional[int] = Query(None, alias="to"),
+    network: str = "mainnet",
+):
+    """
+    Get DAL adoption by stake bucket, for the latest archived cycle by default.
+    """
+    if from_cycle is not None and to_cycle is not None and from_cycle > to_cycle:
+        raise HTTPException(status_code=400, detail="'from' must not be greater than 'to'")
+    archive = get_archive(network)
+    if from_cycle is None and to_cycle is None:
+        cycles = await asyncio.to_thread(archive.cycles)
+        if not cycles:
+            raise HTTPException(status_code=404, detail="No archived cycle")
+        from_cycle = cycles[-1]
+    with api_metrics.timer("upstream_fetch_seconds", source="archive"):
+        distribution = await asyncio.to_thread(archive.distribution, from_cycle, to_cycle)
+    return {"network": network, "cycles": distribution}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a background calculation job.
+    """
+    job = calculation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+def read_run_report() -> Optional[dict]:
+    """Read the report of the last dal_calculation.py run, if any"""
+    try:
+        with open(LOCAL_RUN_REPORT_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus metrics of the API and of the last calculation run.
+    """
+    body = render_prometheus(api_metrics.snapshot(), prefix="dal_api_")
+    body += "# TYPE dal_api_stats_snapshot_age_seconds gauge\n"
+    for network, snapshot in stats_snapshots.items():
+        if snapshot.age is not None:
+            body += f'dal_api_stats_snapshot_age_seconds{{network="{network}"}} {snapshot.age}\n'
+
+    report = await asyncio.to_thread(read_run_report)
+    if report:
+        body += render_prometheus(report.get("metrics", {}), prefix="dal_calculation_")
+        body += "# TYPE dal_calculation_run_wall_time_seconds gauge\n"
+        body += f"dal_calculation_run_wall_time_seconds {report.get('wall_time_s', 0)}\n"
+        body += "# TYPE dal_calculation_run_success gauge\n"
+        body += f"dal_calculation_run_success {1 if report.get('status') == 'ok' else 0}\n"
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# dal_status encoding in typed status arrays
+STATUS_UNKNOWN = -1
+STATUS_INACTIVE = 0
+STATUS_ACTIVE = 1
+
+# Stake bucket edges in mutez: 10k, 100k, 1M and 10M tez
+DEFAULT_STAKE_BUCKETS = (1e10, 1e11, 1e12, 1e13)
+
+# Number of largest bakers in the concentration figures
+TOP_BAKERS = 10
+
+
+def encode_status(dal_status: Optional[bool]) -> int:
+    if dal_status is None:
+        return STATUS_UNKNOWN
+    return STATUS_ACTIVE if dal_status else STATUS_INACTIVE
+
+
+def decode_status(status: int) -> Optional[bool]:
+    if status == STATUS_UNKNOWN:
+        return None
+    return status == STATUS_ACTIVE
+
+
+def results_to_columns(results: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collect per-baker results into typed arrays.
+
+    Args:
+        results: BakerResult-like objects (stake, dal_status)
+
+    Returns:
+        (stake float64, status int8)
+    """
+    results = list(results)
+    # A stake that could not be fetched counts as zero
+    stake = np.fromiter((r.stake or 0.0 for r in results), dtype=np.float64, count=len(results))
+    status = np.fromiter((encode_status(r.dal_status) for r in results), dtype=np.int8, count=len(results))
+    return stake, status
+
+
+def _percentage(part: np.ndarray, whole: np.ndarray) -> np.ndarray:
+    return np.divide(100 * part, whole, out=np.zeros(len(whole)), where=whole > 0)
+
+
+def aggregate_cycles(groups: np.ndarray, stake: np.ndarray, status: np.ndarray, n_groups: int,
+                     top_n: int = TOP_BAKERS, buckets: Sequence[float] = DEFAULT_STAKE_BUCKETS) -> List[Dict]:
+    """
+    Compute the statistics of many cycles at once.
+
+    Every baker of every cycle is one row of the input arrays; groups gives
+    the index of its cycle. All figures are reduced with bincount over the
+    group index, so the cost does not depend on the number of cycles.
+
+    Args:
+        groups: Cycle index of each row, in [0, n_groups)
+        stake: Stake of each row (mutez)
+        status: Encoded dal_status of each row (STATUS_*)
+        n_groups: Number of cycles
+        top_n: Number of largest bakers in the concentration figures
+        buckets: Upper bounds (mutez) of every stake bucket but the last
+
+    Returns:
+        One dict of DALStats fields (all but cycle and timestamp) per group
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    stake = np.asarray(stake, dtype=np.float64)
+    status = np.asarray(status, dtype=np.int8)
+
+    def count(mask=None, weights=None) -> np.ndarray:
+        if mask is not None:
+            weights = mask if weights is None else np.where(mask, weights, 0.0)
+        return np.bincount(groups, weights=weights, minlength=n_groups)
+
+    active = status == STATUS_ACTIVE
+    unknown = status == STATUS_UNKNOWN
+    non_attesting_mask = unknown & (stake == 0)
+
+    total = count()
+    dal_active = count(active)
+    dal_inactive = count(status == STATUS_INACTIVE)
+    non_attesting = count(non_attesting_mask)
+    unclassified = count(unknown & ~non_attesting_mask)
+    total_stake = count(weights=stake)
+    dal_stake = count(active, stake)
+
+    # Rank every baker within its cycle by ascending stake
+    order = np.lexsort((stake, groups))
+    sorted_groups = groups[order]
+    sorted_stake = stake[order]
+    starts = np.cumsum(total) - total
+    rank = np.arange(len(order)) - starts[sorted_groups] + 1
+
+    # Gini coefficient of the stake distribution: 2 sum(i x_i) / (n sum(x)) - (n + 1) / n
+    weighted = np.bincount(sorted_groups, weights=rank * sorted_stake, minlength=n_groups)
+    valid = (total > 0) & (total_stake > 0)
+    gini = np.zeros(n_groups)
+    gini[valid] = (2 * weighted[valid] / (total[valid] * total_stake[valid])
+                   - (total[valid] + 1) / total[valid])
+
+    top = np.zeros(len(order), dtype=bool)
+    top[order] = total[sorted_groups] - rank < top_n
+    top_stake = count(top, stake)
+    top_dal_active = count(top & active)
+
+    edges = np.asarray(buckets, dtype=np.float64)
+    size = len(edges) + 1
+    cells = groups * size + np.searchsorted(edges, stake, side="right")
+
+    def bucket_count(mask=None, weights=None) -> np.ndarray:
+        if mask is not None:
+            weights = mask if weights is None else np.where(mask, weights, 0.0)
+        return np.bincount(cells, weights=weights, minlength=n_groups * size).reshape(n_groups, size)
+
+    bucket_bakers = bucket_count()
+    bucket_active = bucket_count(active)
+    bucket_stake = bucket_count(weights=stake)
+    bucket_dal_stake = bucket_count(active, stake)
+    bounds = [0.0] + [float(edge) for edge in edges] + [None]
+
+    participation = _percentage(dal_active, total - non_attesting)
+    adoption = _percentage(total - dal_inactive - unclassified - non_attesting, total)
+    baking_power = _percentage(dal_stake, total_stake)
+    top_percentage = _percentage(top_stake, total_stake)
+
+    return [
+        {
+            "total_bakers": int(total[g]),
+            "dal_active_bakers": int(dal_active[g]),
+            "dal_inactive_bakers": int(dal_inactive[g]),
+            "unclassified_bakers": int(unclassified[g]),
+            "non_attesting_bakers": int(non_attesting[g]),
+            "dal_baking_power_percentage": float(baking_power[g]),
+            "total_baking_power": float(total_stake[g]),
+            "dal_baking_power": float(dal_stake[g]),
+            "dal_participation_percentage": float(participation[g]),
+            "dal_adoption_percentage": float(adoption[g]),
+            "stake_gini": float(gini[g]),
+            "top_stake_percentage": float(top_percentage[g]),
+            "top_dal_active_bakers": int(top_dal_active[g]),
+            "stake_buckets": [
+                {
+                    "min_stake": bounds[i],
+                    "max_stake": bounds[i + 1],
+                    "bakers": int(bucket_bakers[g, i]),
+                    "dal_active_bakers": int(bucket_active[g, i]),
+                    "stake": float(bucket_stake[g, i]),
+                    "dal_stake": float(bucket_dal_stake[g, i]),
+                    "dal_adoption_percentage":
+                        float(100 * bucket_active[g, i] / bucket_bakers[g, i]) if bucket_bakers[g, i] else 0.0,
+                    "dal_stake_percentage":
+                        float(100 * bucket_dal_stake[g, i] / bucket_stake[g, i]) if bucket_stake[g, i] else 0.0,
+                }
+                for i in range(size)
+            ],
+        }
+        for g in range(n_groups)
+    ]
+
+
+def aggregate_columns(stake: np.ndarray, status: np.ndarray, top_n: int = TOP_BAKERS,
+                      buckets: Sequence[float] = DEFAULT_STAKE_BUCKETS) -> Dict:
+    """Compute the statistics of a single cycle (see aggregate_cycles)"""
+    return aggregate_cycles(np.zeros(len(stake), dtype=np.int64), stake, status, 1, top_n, buckets)[0]
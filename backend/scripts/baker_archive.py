@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import fcntl
+import shutil
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from aggregation import DEFAULT_STAKE_BUCKETS, decode_status, results_to_columns, aggregate_cycles
+
+logger = logging.getLogger(__name__)
+
+# Default on-disk location, next to the other derived stores and outside of git
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parent.parent / "cache" / "archive"
+
+COLUMNS = ("baker_id", "stake", "status", "attested_slots")
+
+
+class BakerArchive:
+    """
+    Columnar per-cycle, per-baker archive of DAL results for one network.
+
+    Baker addresses are dictionary-encoded into integer ids (addresses.json).
+    Each cycle is a directory of .npy columns sorted by baker id:
+
+        baker_id int32, stake float64, status int8, attested_slots int32 (-1 if unknown)
+
+    Readers memory-map the columns, so a baker timeline is one binary search
+    per cycle and a distribution is a handful of vector operations. Writers
+    in different processes (scheduler, cron fallback, backfill, API jobs) are
+    serialized by an flock on .lock, so they agree on the id of every address.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Open (or create) the archive.
+
+        Args:
+            root: Archive directory of the network (e.g. cache/archive/mainnet)
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._addresses: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._addresses_version: Optional[tuple] = None
+        self._columns: Dict[int, tuple] = {}
+
+    @property
+    def _addresses_file(self) -> Path:
+        return self.root / "addresses.json"
+
+    def _cycle_dir(self, cycle: int) -> Path:
+        return self.root / f"cycle_{cycle}"
+
+    @contextmanager
+    def _write_lock(self):
+        """Hold the archive lock of this process and the lock file shared with other processes"""
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / ".lock", 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_addresses(self):
+        """Reload the address dictionary if another process extended it. Caller must hold the lock."""
+        try:
+            stat = self._addresses_file.stat()
+        except OSError:
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._addresses_version:
+            return
+        with open(self._addresses_file, 'r') as f:
+            self._addresses = json.load(f)
+        self._ids = {address: baker_id for baker_id, address in enumerate(self._addresses)}
+        self._addresses_version = version
+
+    def _save_addresses(self):
+        """Replace addresses.json. Caller must hold the write lock."""
+        tmp_file = self._addresses_file.with_name(f".addresses.json.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self._addresses, f, separators=(",", ":"))
+        os.replace(tmp_file, self._addresses_file)
+        stat = self._addresses_file.stat()
+        self._addresses_version = (stat.st_mtime_ns, stat.st_size)
+
+    def write_cycle(self, cycle: int, results: Iterable):
+        """
+        Store (or replace) the per-baker results of a cycle.
+
+        Args:
+            cycle: Cycle number
+            results: BakerResult-like objects (address, stake, dal_status, attested_slots)
+        """
+        results = list(results)
+        with self._write_lock():
+            self._load_addresses()
+            added = False
+            for result in results:
+                if result.address not in self._ids:
+                    self._ids[result.address] = len(self._addresses)
+                    self._addresses.append(result.address)
+                    added = True
+            if added:
+                self._save_addresses()
+
+            baker_ids = np.fromiter((self._ids[r.address] for r in results), dtype=np.int32, count=len(results))
+            order = np.argsort(baker_ids, kind="stable")
+            stake, status = results_to_columns(results)
+            columns = {
+                "baker_id": baker_ids[order],
+                "stake": stake[order],
+                "status": status[order],
+                "attested_slots": np.fromiter(
+                    (-1 if r.attested_slots is None else r.attested_slots for r in results),
+                    dtype=np.int32, count=len(results))[order],
+            }
+
+            # Write the new columns aside, then swap the directories
+            cycle_dir = self._cycle_dir(cycle)
+            tmp_dir = cycle_dir.with_name(f".{cycle_dir.name}.{os.getpid()}.tmp")
+            old_dir = cycle_dir.with_name(f".{cycle_dir.name}.{os.getpid()}.old")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir()
+            for name, values in columns.items():
+                np.save(tmp_dir / f"{name}.npy", values)
+            if cycle_dir.exists():
+                cycle_dir.rename(old_dir)
+            tmp_dir.rename(cycle_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+            self._columns.pop(cycle, None)
+        logger.info(f"Archived {len(results)} baker results for cycle {cycle}")
+
+    def cycles(self) -> List[int]:
+        """Archived cycles, in ascending order"""
+        if not self.root.exists():
+            return []
+        return sorted(int(entry.name[len("cycle_"):]) for entry in self.root.iterdir()
+                      if entry.is_dir() and entry.name.startswith("cycle_"))
+
+    def columns(self, cycle: int) -> Optional[tuple]:
+        """
+        Memory-mapped columns of a cycle.
+
+        Returns:
+            (baker_id, stake, status, attested_slots), or None if the cycle is not archived
+        """
+        cycle_dir = self._cycle_dir(cycle)
+        try:
+            mtime = cycle_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._columns.get(cycle)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            columns = tuple(np.load(cycle_dir / f"{name}.npy", mmap_mode="r") for name in COLUMNS)
+            self._columns[cycle] = (mtime, columns)
+            return columns
+
+    def _select_cycles(self, from_cycle: Optional[int], to_cycle: Optional[int]) -> List[int]:
+        return [cycle for cycle in self.cycles()
+                if (from_cycle is None or cycle >= from_cycle) and (to_cycle is None or cycle <= to_cycle)]
+
+    def baker_timeline(self, address: str, from_cycle: Optional[int] = None,
+                       to_cycle: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Get the archived results of one baker over a range of cycles.
+
+        Returns:
+            One entry per cycle where the baker appears (ascending), or None for an unknown baker
+        """
+        with self._lock:
+            self._load_addresses()
+            baker_id = self._ids.get(address)
+        if baker_id is None:
+            return None
+
+        timeline = []
+        for cycle in self._select_cycles(from_cycle, to_cycle):
+            columns = self.columns(cycle)
+            if columns is None:
+                continue
+            baker_ids, stake, status, attested_slots = columns
+            index = int(np.searchsorted(baker_ids, baker_id))
+            if index < len(baker_ids) and baker_ids[index] == baker_id:
+                slots = int(attested_slots[index])
+                timeline.append({
+                    "cycle": cycle,
+                    "stake": float(stake[index]),
+                    "dal_status": decode_status(int(status[index])),
+                    "attested_slots": None if slots < 0 else slots,
+                })
+        return timeline
+
+    def distribution(self, from_cycle: Optional[int] = None, to_cycle: Optional[int] = None,
+                     buckets: Sequence[float] = DEFAULT_STAKE_BUCKETS) -> List[Dict]:
+        """
+        Break DAL adoption down by stake bucket for a range of cycles.
+
+        Args:
+            from_cycle: First cycle (inclusive, default: first archived)
+            to_cycle: Last cycle (inclusive, default: last archived)
+            buckets: Upper bounds (mutez) of every bucket but the last
+
+        Returns:
+            Per cycle, the bakers, DAL active bakers, stake and DAL stake of each bucket
+        """
+        cycles = []
+        stakes = []
+        statuses = []
+        for cycle in self._select_cycles(from_cycle, to_cycle):
+            columns = self.columns(cycle)
+            if columns is not None:
+                cycles.append(cycle)
+                stakes.append(columns[1])
+                statuses.append(columns[2])
+        if not cycles:
+            return []
+        groups = np.repeat(np.arange(len(cycles)), [len(stake) for stake in stakes])
+        aggregates = aggregate_cycles(groups, np.concatenate(stakes), np.concatenate(statuses), len(cycles),
+                                      buckets=buckets)
+        return [{"cycle": cycle, "buckets": aggregate["stake_buckets"]}
+                for cycle, aggregate in zip(cycles, aggregates)]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from baker_store import BakerResult
+from dal_calculation import DALCalculator
+from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Baker results kept in memory
+DEFAULT_MAX_ENTRIES = 10000
+
+# Seconds the last completed cycle is trusted before head is read again
+DEFAULT_HEAD_TTL = 60.0
+
+# Seconds before a baker whose DAL status could not be determined is queried again
+DEFAULT_RETRY_TTL = 300.0
+
+
+def result_to_dict(cycle: int, result: BakerResult) -> Dict:
+    """JSON view of a baker's result, has_dal being what the bakers page reads"""
+    return {
+        "address": result.address,
+        "cycle": cycle,
+        "stake": result.stake,
+        "dal_status": result.dal_status,
+        "has_dal": result.dal_status,
+        "attested_slots": result.attested_slots,
+    }
+
+
+class BakerLookup:
+    """
+    Cached DAL status of single bakers for the last completed cycle.
+
+    Results are kept in an LRU keyed by (cycle, address): a settled result
+    stays valid for the whole cycle and is dropped once the next cycle
+    completes, an unsettled one is retried after retry_ttl seconds.
+    Concurrent lookups of the same baker share a single query, so a popular
+    baker costs at most one upstream lookup per cycle.
+    """
+
+    def __init__(self, calculator: DALCalculator, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 head_ttl: float = DEFAULT_HEAD_TTL, retry_ttl: float = DEFAULT_RETRY_TTL,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the lookup.
+
+        Args:
+            calculator: Calculator of the network, whose worker pool runs the queries
+            max_entries: Baker results kept in memory
+            head_ttl: Seconds the last completed cycle is trusted before head is read again
+            retry_ttl: Seconds before an unsettled baker is queried again
+            metrics: Registry receiving the lookup counters
+        """
+        self.calculator = calculator
+        self.max_entries = max_entries
+        self.head_ttl = head_ttl
+        self.retry_ttl = retry_ttl
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics.describe("baker_lookups_total", "Single baker lookups by outcome (hit, miss, coalesced)")
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, BakerResult]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._cycle: Optional[int] = None
+        self._cycle_checked_at: Optional[float] = None
+        self._cycle_task: Optional[asyncio.Task] = None
+
+    async def _read_cycle(self) -> int:
+        engine = self.calculator._engine
+        cycle = await engine.run(self.calculator.get_current_cycle) - 1
+        self._cycle = cycle
+        self._cycle_checked_at = time.monotonic()
+        return cycle
+
+    async def last_completed_cycle(self) -> int:
+        """Last completed cycle, reading head at most once every head_ttl seconds"""
+        if self._cycle is not None and time.monotonic() - self._cycle_checked_at < self.head_ttl:
+            return self._cycle
+        if self._cycle_task is None or self._cycle_task.done():
+            self._cycle_task = asyncio.create_task(self._read_cycle())
+        return await asyncio.shield(self._cycle_task)
+
+    def _cached(self, key: Tuple[int, str]) -> Optional[BakerResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if not result.settled and time.monotonic() - stored_at >= self.retry_ttl:
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    async def _query(self, key: Tuple[int, str]) -> BakerResult:
+        cycle, address = key
+        result = await self.calculator._engine.run(self.calculator.lookup_baker, address, cycle)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    async def get(self, address: str, cycle: Optional[int] = None) -> Dict:
+        """
+        Get a baker's result for the last completed cycle.
+
+        Args:
+            address: Baker address
+            cycle: Cycle already resolved by the caller (default: last completed)
+
+        Returns:
+            The baker's result (see result_to_dict)
+        """
+        if cycle is None:
+            cycle = await self.last_completed_cycle()
+        key = (cycle, address)
+        result = self._cached(key)
+        if result is not None:
+            self.metrics.inc("baker_lookups_total", network=self.calculator.network, result="hit")
+            return result_to_dict(cycle, result)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.metrics.inc("baker_lookups_total", network=self.calculator.network, result="miss")
+            task = self._in_flight[key] = asyncio.create_task(self._query(key))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.metrics.inc("baker_lookups_total", network=self.calculator.network, result="coalesced")
+        # A cancelled caller must not cancel the query the others are waiting for
+        return result_to_dict(cycle, await asyncio.shield(task))
+
+    async def get_many(self, addresses: Iterable[str]) -> Tuple[int, Dict[str, Dict]]:
+        """
+        Get the results of many bakers at once.
+
+        Cache misses are queried concurrently on the calculator's worker pool.
+
+        Returns:
+            (last completed cycle, results keyed by address)
+        """
+        cycle = await self.last_completed_cycle()
+        addresses = list(dict.fromkeys(addresses))
+        results = await asyncio.gather(*(self.get(address, cycle) for address in addresses))
+        return cycle, dict(zip(addresses, results))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default on-disk location, next to the response cache and outside of git
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / "cache" / "baker_results.sqlite3"
+
+
+@dataclass
+class BakerResult:
+    """Outcome of a cycle for a single baker"""
+    address: str
+    stake: Optional[float]
+    dal_status: Optional[bool]
+    attested_slots: Optional[int] = None
+    fetched_at: float = 0.0
+
+    @property
+    def settled(self) -> bool:
+        """Whether the result is final and the baker needs no new query"""
+        return self.stake is not None and self.dal_status is not None
+
+
+class BakerStore:
+    """
+    Per-(cycle, baker) DAL results stored in SQLite.
+
+    Lets a re-run of a cycle skip every baker whose DAL status is already
+    known, and lets the cycle statistics be rebuilt without network access.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS baker_results (
+                network TEXT NOT NULL,
+                cycle INTEGER NOT NULL,
+                address TEXT NOT NULL,
+                stake REAL,
+                dal_status INTEGER,
+                attested_slots INTEGER,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (network, cycle, address)
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cycles (
+                network TEXT NOT NULL,
+                cycle INTEGER NOT NULL,
+                start_time TEXT NOT NULL,
+                PRIMARY KEY (network, cycle)
+            )"""
+        )
+        self._conn.commit()
+
+    def get_cycle(self, network: str, cycle: int) -> Dict[str, BakerResult]:
+        """
+        Load every stored result of a cycle.
+
+        Returns:
+            Results keyed by baker address
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT address, stake, dal_status, attested_slots, fetched_at FROM baker_results "
+                "WHERE network = ? AND cycle = ?", (network, cycle)
+            ).fetchall()
+        return {
+            address: BakerResult(address, stake, None if dal_status is None else bool(dal_status),
+                                 attested_slots, fetched_at)
+            for address, stake, dal_status, attested_slots, fetched_at in rows
+        }
+
+    def get_result(self, network: str, cycle: int, address: str) -> Optional[BakerResult]:
+        """Load the stored result of one baker, None if there is none"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stake, dal_status, attested_slots, fetched_at FROM baker_results "
+                "WHERE network = ? AND cycle = ? AND address = ?", (network, cycle, address)
+            ).fetchone()
+        if row is None:
+            return None
+        stake, dal_status, attested_slots, fetched_at = row
+        return BakerResult(address, stake, None if dal_status is None else bool(dal_status), attested_slots, fetched_at)
+
+    def get_columns(self, network: str, from_cycle: int, to_cycle: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Load the stored results of a range of cycles as typed arrays.
+
+        Returns:
+            (cycle int64, stake float64, status int8) with one row per (cycle, baker),
+            status encoded as in aggregation (-1 when the DAL status is unknown) and an unknown stake read as 0
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cycle, COALESCE(stake, 0), COALESCE(dal_status, -1) FROM baker_results "
+                "WHERE network = ? AND cycle BETWEEN ? AND ?", (network, from_cycle, to_cycle)
+            ).fetchall()
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 3)
+        return columns[:, 0].astype(np.int64), columns[:, 1], columns[:, 2].astype(np.int8)
+
+    def put_results(self, network: str, cycle: int, results: Iterable[BakerResult]):
+        """Insert or replace the results of some bakers of a cycle"""
+        now = time.time()
+        rows = [
+            (network, cycle, r.address, r.stake, None if r.dal_status is None else int(r.dal_status),
+             r.attested_slots, r.fetched_at or now)
+            for r in results
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO baker_results "
+                "(network, cycle, address, stake, dal_status, attested_slots, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def get_cycle_start(self, network: str, cycle: int) -> Optional[datetime]:
+        """Start time recorded for a cycle, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT start_time FROM cycles WHERE network = ? AND cycle = ?", (network, cycle)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def put_cycle_start(self, network: str, cycle: int, start_time: datetime):
+        """Record the start time of a cycle"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cycles (network, cycle, start_time) VALUES (?, ?, ?)",
+                (network, cycle, start_time.isoformat())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
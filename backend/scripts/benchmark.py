@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark DALCalculator against a local stand-in for the TzKT API and RPC.
+
+The mock serves synthetic (or recorded) bakers with a configurable latency and
+can answer a share of requests with 429. Each run reports wall time, request
+counts per endpoint, requests/s and peak Python memory as JSON, so two runs can
+be compared with any JSON diff tool.
+
+    python backend/scripts/benchmark.py --bakers 300 3000 --latency-ms 20 --output bench.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import contextlib
+import tracemalloc
+import multiprocessing
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from urllib.request import urlopen
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dal_calculation import DALCalculator
+from fetch_missing_cycles import fetch_missing_cycles
+
+DEFAULT_BAKER_COUNTS = [300, 3000, 30000]
+HEAD_CYCLE = 1000
+BLOCKS_PER_CYCLE = 10800
+GENESIS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+_BLOCK_PATH = re.compile(r"^/rpc/chains/main/blocks/(\d+)/context/delegates/([^/]+)/dal_participation$")
+_CYCLE_PATH = re.compile(r"^/v1/cycles/(\d+)$")
+_BAKER_REWARDS_PATH = re.compile(r"^/v1/rewards/bakers/([^/]+)$")
+_DELEGATE_PATH = re.compile(r"^/v1/delegates/([^/]+)$")
+
+
+def synthetic_bakers(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Build a deterministic baker population.
+
+    Roughly 60% of the bakers attest DAL slots, 30% do not and the rest
+    cannot be classified (their dal_participation call fails).
+    """
+    rng = random.Random(seed)
+    bakers = []
+    for i in range(count):
+        stake = float(rng.randint(6_000, 5_000_000) * 1_000_000)
+        roll = rng.random()
+        attested_slots = rng.randint(1, 500) if roll < 0.6 else 0 if roll < 0.9 else None
+        bakers.append({
+            "address": f"tz1bench{i:028d}",
+            "stakingBalance": stake,
+            "bakingPower": stake,
+            "attestedSlots": attested_slots,
+        })
+    return bakers
+
+
+class MockChain:
+    """Answers the TzKT API and RPC calls made by DALCalculator"""
+
+    def __init__(self, bakers: List[Dict], latency: float = 0.0, throttle_every: int = 0):
+        """
+        Args:
+            bakers: Baker fixtures (address, stakingBalance, bakingPower, attestedSlots)
+            latency: Seconds added to every response
+            throttle_every: Answer every Nth request with 429 (0 disables throttling)
+        """
+        self.bakers = bakers
+        self.by_address = {baker["address"]: baker for baker in bakers}
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.head_cycle = HEAD_CYCLE
+        self.counts = Counter()
+        self._served = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            self._served = 0
+
+    def _route(self, path: str, query: Dict[str, List[str]]):
+        def arg(name, default=None):
+            return query.get(name, [default])[0]
+
+        if path == "/v1/head":
+            return "head", 200, {"level": (self.head_cycle + 1) * BLOCKS_PER_CYCLE - 100, "cycle": self.head_cycle}
+
+        match = _CYCLE_PATH.match(path)
+        if match:
+            cycle = int(match.group(1))
+            return "cycles", 200, {
+                "index": cycle,
+                "firstLevel": cycle * BLOCKS_PER_CYCLE + 1,
+                "lastLevel": (cycle + 1) * BLOCKS_PER_CYCLE,
+                "startTime": (GENESIS + timedelta(days=cycle)).isoformat().replace("+00:00", "Z"),
+            }
+
+        if path == "/v1/delegates":
+            offset, limit = int(arg("offset", 0)), int(arg("limit", 100))
+            fields = arg("select", "").split(",")
+            page = self.bakers[offset:offset + limit]
+            return "delegates", 200, [{field: baker.get(field) for field in fields if field} or baker
+                                      for baker in page]
+
+        if path == "/v1/rewards/bakers":
+            offset, limit = int(arg("offset", 0)), int(arg("limit", 100))
+            page = self.bakers[offset:offset + limit]
+            return "rewards_bulk", 200, [{"baker": {"address": baker["address"]}, "bakingPower": baker["bakingPower"]}
+                                         for baker in page]
+
+        match = _BAKER_REWARDS_PATH.match(path)
+        if match:
+            baker = self.by_address.get(match.group(1))
+            if baker is None:
+                return "rewards_baker", 404, {}
+            return "rewards_baker", 200, [{"bakingPower": baker["bakingPower"]}]
+
+        match = _DELEGATE_PATH.match(path)
+        if match:
+            baker = self.by_address.get(match.group(1))
+            if baker is None:
+                return "delegate", 404, {}
+            return "delegate", 200, {"address": baker["address"], "stakingBalance": baker["stakingBalance"]}
+
+        match = _BLOCK_PATH.match(path)
+        if match:
+            baker = self.by_address.get(match.group(2))
+            if baker is None or baker["attestedSlots"] is None:
+                return "dal_participation", 500, {}
+            return "dal_participation", 200, {"delegate_attested_dal_slots": baker["attestedSlots"]}
+
+        return "unknown", 404, {}
+
+    def handle(self, url: str):
+        """
+        Serve one request.
+
+        Returns:
+            (HTTP status, JSON body)
+        """
+        parsed = urlparse(url)
+        endpoint, status, body = self._route(parsed.path, parse_qs(parsed.query))
+        with self._lock:
+            self._served += 1
+            throttled = self.throttle_every and self._served % self.throttle_every == 0
+            self.counts[endpoint] += 1
+            if throttled:
+                self.counts["throttled"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            return 429, {"error": "Too many requests"}
+        return status, body
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        chain = self.server.chain
+        if self.path == "/__stats":
+            status, body = 200, chain.stats()
+        elif self.path == "/__reset":
+            chain.reset()
+            status, body = 200, {}
+        elif self.path.startswith("/__head?"):
+            chain.head_cycle = int(parse_qs(urlparse(self.path).query)["cycle"][0])
+            status, body = 200, {"cycle": chain.head_cycle}
+        else:
+            status, body = chain.handle(self.path)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(bakers: List[Dict], latency: float, throttle_every: int, ports):
+    """Run the API and RPC stand-ins on two ports sharing one chain (child process entry point)"""
+    chain = MockChain(bakers, latency, throttle_every)
+    servers = []
+    for _ in range(2):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+        server.daemon_threads = True
+        server.chain = chain
+        servers.append(server)
+    for server in servers[1:]:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    ports.put([server.server_address[1] for server in servers])
+    servers[0].serve_forever()
+
+
+class MockServer:
+    """Mock TzKT API and RPC running in a separate process, so they do not skew the measurements"""
+
+    def __init__(self, bakers: List[Dict], latency: float = 0.0, throttle_every: int = 0):
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=serve, args=(bakers, latency, throttle_every, ports),
+                                                daemon=True)
+        self._process.start()
+        api_port, rpc_port = ports.get(timeout=30)
+        self.api_url = f"http://127.0.0.1:{api_port}/v1"
+        self.rpc_url = f"http://127.0.0.1:{rpc_port}/rpc"
+        self._control_url = f"http://127.0.0.1:{api_port}"
+
+    def stats(self) -> Dict[str, int]:
+        with urlopen(f"{self._control_url}/__stats") as response:
+            return json.load(response)
+
+    def reset(self):
+        urlopen(f"{self._control_url}/__reset").close()
+
+    def set_head(self, cycle: int):
+        """Move the chain head to another cycle"""
+        urlopen(f"{self._control_url}/__head?cycle={cycle}").close()
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+
+def measure(server: MockServer, run) -> Dict:
+    """Run a scenario and collect its wall time, peak memory and request counts"""
+    server.reset()
+    tracemalloc.start()
+    started = time.perf_counter()
+    run()
+    wall_time = time.perf_counter() - started
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    requests_by_endpoint = server.stats()
+    throttled = requests_by_endpoint.pop("throttled", 0)
+    total = sum(requests_by_endpoint.values())
+    return {
+        "wall_time_s": round(wall_time, 3),
+        "requests": total,
+        "requests_per_s": round(total / wall_time, 1) if wall_time > 0 else None,
+        "requests_by_endpoint": requests_by_endpoint,
+        "throttled": throttled,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_benchmark(baker_counts: List[int], latency: float, throttle_every: int, concurrency: int,
+                  api_rate: float, rpc_rate: float, backfill_cycles: int, parallel: int,
+                  fixture: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Benchmark calculate_stats and fetch_missing_cycles for each baker count.
+
+    Returns:
+        One result per (baker count, scenario)
+    """
+    results = []
+    for count in baker_counts:
+        bakers = fixture[:count] if fixture else synthetic_bakers(count)
+        server = MockServer(bakers, latency, throttle_every)
+
+        def new_calculator():
+            return DALCalculator(max_concurrency=concurrency, api_rate=api_rate, rpc_rate=rpc_rate,
+                                 api_url=server.api_url, rpc_url=server.rpc_url)
+
+        try:
+            last_cycle = HEAD_CYCLE - 1
+            result = measure(server, lambda: new_calculator().calculate_stats(cycle=last_cycle))
+            results.append({"scenario": "calculate_stats", "bakers": len(bakers), **result})
+
+            first_cycle = last_cycle - backfill_cycles + 1
+            with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, "w") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    result = measure(server, lambda: fetch_missing_cycles(
+                        first_cycle, last_cycle, output_dir, parallel=parallel, force=True,
+                        calculator=new_calculator()))
+            results.append({"scenario": "fetch_missing_cycles", "bakers": len(bakers),
+                            "cycles": backfill_cycles, **result})
+        finally:
+            server.stop()
+        print(f"{len(bakers)} bakers done", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DALCalculator against a local TzKT/RPC stand-in')
+    parser.add_argument('--bakers', type=int, nargs='+', default=DEFAULT_BAKER_COUNTS,
+                        help='Baker counts to benchmark (default: 300 3000 30000)')
+    parser.add_argument('--fixture', type=str,
+                        help='JSON list of recorded bakers (address, stakingBalance, bakingPower, attestedSlots)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency added to every mock response')
+    parser.add_argument('--throttle-every', type=int, default=0,
+                        help='Answer every Nth request with 429 (default: never)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Maximum number of concurrent requests')
+    parser.add_argument('--api-rate', type=float, default=10000, help='Requests per second allowed to the mock API')
+    parser.add_argument('--rpc-rate', type=float, default=10000, help='Requests per second allowed to the mock RPC')
+    parser.add_argument('--backfill-cycles', type=int, default=3, help='Cycles computed by the backfill scenario')
+    parser.add_argument('--parallel', type=int, default=3, help='Cycles computed concurrently by the backfill')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    # Per-delegate progress logs would dominate the measurements
+    logging.getLogger("dal_calculation").setLevel(logging.CRITICAL)
+
+    fixture = None
+    if args.fixture:
+        with open(args.fixture, 'r') as f:
+            fixture = json.load(f)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "throttle_every": args.throttle_every,
+            "concurrency": args.concurrency,
+            "api_rate": args.api_rate,
+            "rpc_rate": args.rpc_rate,
+            "fixture": args.fixture,
+        },
+        "results": run_benchmark(args.bakers, args.latency_ms / 1000, args.throttle_every, args.concurrency,
+                                 args.api_rate, args.rpc_rate, args.backfill_cycles, args.parallel, fixture),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import json
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Events kept for subscribers that fell behind
+DEFAULT_BACKLOG = 256
+
+
+class SubscriberLagged(Exception):
+    """A subscriber missed events that already left the backlog and must resume from scratch"""
+
+
+@dataclass
+class Event:
+    """One server-sent event"""
+    seq: int
+    name: str
+    id: str
+    data: Dict
+
+    def __post_init__(self):
+        # Encoded once and shared by every subscriber
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        self.frame = f"id: {self.id}\nevent: {self.name}\ndata: {payload}\n\n".encode()
+
+
+def delta(previous: Optional[Dict], current: Dict, keys: Iterable[str] = ("cycle",)) -> Dict:
+    """
+    Fields of current that differ from previous.
+
+    Args:
+        previous: Last state sent to the subscribers, None to send current in full
+        current: New state
+        keys: Fields always included so the delta can be placed
+
+    Returns:
+        The changed fields plus the keys
+    """
+    if previous is None:
+        return dict(current)
+    return {name: value for name, value in current.items() if name in keys or previous.get(name) != value}
+
+
+class Broadcaster:
+    """
+    In-memory fan-out of events to any number of subscribers.
+
+    Publishing appends to a bounded backlog and wakes every waiting
+    subscriber through a single asyncio.Event, so its cost does not depend
+    on the number of subscribers. Each subscriber only keeps the sequence
+    number of the last event it sent.
+    """
+
+    def __init__(self, backlog: int = DEFAULT_BACKLOG):
+        self._events: deque = deque(maxlen=backlog)
+        self._seq = 0
+        self._changed: Optional[asyncio.Event] = None
+        self.subscribers = 0
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last published event"""
+        return self._seq
+
+    def publish(self, name: str, event_id: str, data: Dict) -> Event:
+        """Append an event and wake the subscribers"""
+        self._seq += 1
+        event = Event(self._seq, name, event_id, data)
+        self._events.append(event)
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+        logger.info(f"Broadcasting {name} event {event_id} to {self.subscribers} subscriber(s)")
+        return event
+
+    async def wait(self, after: int, timeout: float) -> List[Event]:
+        """
+        Get the events published after a sequence number, waiting for one if there is none.
+
+        Args:
+            after: Sequence number of the last event the subscriber has
+            timeout: Seconds to wait before returning no event (e.g. to send a heartbeat)
+
+        Returns:
+            Events in publication order, empty on timeout
+
+        Raises:
+            SubscriberLagged: Some of the events were dropped from the backlog
+        """
+        if after >= self._seq:
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if not self._events:
+            return []
+        first = self._events[0].seq
+        if first > after + 1:
+            raise SubscriberLagged(f"Events {after + 1} to {first - 1} are gone")
+        # Sequence numbers are contiguous, so the new events are the tail of the backlog
+        return list(islice(self._events, after + 1 - first, None))
@@ -0,0 +1,12 @@
+#!/bin/bash
+
+# Print the networks of backend/config/config.json as a comma-separated list
+# for --networks, falling back to config.example.json like load_network_config.
+# Run from the project root.
+
+CONFIG_FILE="backend/config/config.json"
+if [ ! -f "$CONFIG_FILE" ]; then
+    CONFIG_FILE="backend/config/config.example.json"
+fi
+
+jq -r '(.networks // {"mainnet": {}}) | keys_unsorted | join(",")' "$CONFIG_FILE"
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+# Add the scripts directory to the path to import dal_calculation
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dal_calculation import (DALCalculator, DALStats, DATA_DIR, DEFAULT_LIVE_BLOCKS, add_calculator_arguments,
+                             build_calculators, close_calculators, configure_logging, export_histories,
+                             live_results_file, log_stats, network_files, save_results_and_update_history,
+                             stats_to_dict, write_run_report)
+from history_store import write_json_atomic
+from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 30
+DEFAULT_RETRY_DELAY = 300
+
+
+def saved_cycle(results_file: Path) -> Optional[int]:
+    """Cycle of a saved results file, None if there is none"""
+    try:
+        with open(results_file, 'r') as f:
+            return int(json.load(f)["cycle"])
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class CycleScheduler:
+    """
+    Long-running service computing every cycle as soon as the next one begins.
+
+    Head is polled every poll_interval seconds, one small /head request per
+    network. When a network enters cycle N, cycle N-1 is calculated, saved and
+    published. The baking powers of cycle N are then prefetched during the
+    idle time, so the calculation at the next boundary only has the DAL
+    participation left to fetch.
+
+    With live_blocks set, a provisional estimate of the running cycle is also
+    refreshed every live_blocks blocks and saved to dal_stats_live.json.
+    """
+
+    def __init__(self, calculators: Dict[str, DALCalculator], data_dir: Path, metrics: MetricsRegistry,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, retry_delay: float = DEFAULT_RETRY_DELAY,
+                 publish_command: Optional[str] = None, run_report_file: Optional[Path] = None,
+                 live_blocks: int = DEFAULT_LIVE_BLOCKS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            calculators: Calculators keyed by network (see build_calculators)
+            data_dir: Directory of the results and history files
+            metrics: Registry shared with the calculators, saved in the run reports
+            poll_interval: Seconds between two head polls
+            retry_delay: Seconds before a failed calculation is retried
+            publish_command: Shell command run after new results are saved (e.g. update_dal_stats.sh)
+            run_report_file: JSON run report written after each calculation
+            live_blocks: Blocks between two refreshes of the live estimate, 0 to disable it
+        """
+        self.calculators = calculators
+        self.data_dir = data_dir
+        self.metrics = metrics
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.publish_command = publish_command
+        self.run_report_file = run_report_file or data_dir / "dal_run_report.json"
+        self.live_blocks = live_blocks
+        self.head_cycles: Dict[str, int] = {}
+        self.saved_cycles: Dict[str, Optional[int]] = {
+            network: saved_cycle(network_files(data_dir, network)[0]) for network in calculators
+        }
+        self._prefetched: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._live_levels: Dict[str, int] = {}
+        self.metrics.describe("scheduled_calculations_total", "Cycle calculations started by the scheduler, by outcome")
+        self.metrics.describe("cycle_end_lag_seconds", "Time from detecting a new cycle to saving the previous one")
+
+    async def _check(self, network: str, calculator: DALCalculator) -> Optional[object]:
+        """
+        Handle one network: calculate the cycle that just ended, then prefetch the running one.
+
+        Returns:
+            DALStats or the exception of a calculation, None when nothing was calculated
+        """
+        try:
+            head = await calculator._engine.run(calculator.get_head)
+            head_cycle = int(head["cycle"])
+        except Exception as e:
+            logger.warning(f"Could not read {network} head: {e}")
+            return None
+        if self.head_cycles.get(network) != head_cycle:
+            logger.info(f"{network} is at cycle {head_cycle}")
+            self.head_cycles[network] = head_cycle
+
+        outcome = None
+        target = head_cycle - 1
+        saved = self.saved_cycles.get(network)
+        if (saved is None or saved < target) and time.monotonic() >= self._retry_at.get(network, 0):
+            logger.info(f"Cycle {target} of {network} has ended, calculating it")
+            started = time.perf_counter()
+            calculator.reset_delegates()
+            try:
+                outcome = await calculator.calculate_stats_async(cycle=target)
+                await asyncio.to_thread(save_results_and_update_history, outcome, *network_files(self.data_dir, network))
+                log_stats(outcome)
+                self.saved_cycles[network] = target
+                self.metrics.inc("scheduled_calculations_total", network=network, status="ok")
+                self.metrics.observe("cycle_end_lag_seconds", time.perf_counter() - started, network=network)
+            except Exception as e:
+                logger.error(f"Error calculating cycle {target} of {network}, retrying in {self.retry_delay}s: {e}")
+                outcome = e
+                self._retry_at[network] = time.monotonic() + self.retry_delay
+                self.metrics.inc("scheduled_calculations_total", network=network, status="error")
+
+        if self._prefetched.get(network) != head_cycle:
+            try:
+                await calculator._engine.run(calculator.prefetch_cycle, head_cycle)
+                self._prefetched[network] = head_cycle
+            except Exception as e:
+                logger.warning(f"Could not prefetch cycle {head_cycle} of {network}: {e}")
+
+        if self.live_blocks:
+            await self._refresh_live(network, calculator, head)
+        return outcome
+
+    async def _refresh_live(self, network: str, calculator: DALCalculator, head: Dict):
+        """Save the live estimate of the running cycle when it moved on"""
+        try:
+            stats = await calculator.refresh_live(self.live_blocks, head)
+        except Exception as e:
+            logger.warning(f"Could not refresh the live estimate of {network}: {e}")
+            return
+        if self._live_levels.get(network) != stats.level:
+            await asyncio.to_thread(write_json_atomic, live_results_file(self.data_dir, network), stats_to_dict(stats))
+            self._live_levels[network] = stats.level
+
+    async def poll(self) -> Dict[str, object]:
+        """
+        Run one round over every network, then report and publish new results.
+
+        Returns:
+            DALStats or exception of every network whose cycle was calculated
+        """
+        started_at = datetime.now()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._check(network, calculator)
+                                         for network, calculator in self.calculators.items()))
+        outcomes = {network: outcome for network, outcome in zip(self.calculators, results) if outcome is not None}
+        if not outcomes:
+            return outcomes
+        await asyncio.to_thread(export_histories)
+
+        errors = {network: str(outcome) for network, outcome in outcomes.items() if isinstance(outcome, Exception)}
+        write_run_report(self.run_report_file, {
+            "networks": {
+                network: {
+                    "cycle": outcome.cycle if isinstance(outcome, DALStats) else self.head_cycles[network] - 1,
+                    "status": "error" if network in errors else "ok",
+                    "error": errors.get(network),
+                }
+                for network, outcome in outcomes.items()
+            },
+            "status": "error" if errors else "ok",
+            "error": "; ".join(f"{network}: {error}" for network, error in errors.items()) or None,
+            "started_at": started_at.isoformat(),
+            "wall_time_s": round(time.perf_counter() - started, 3),
+            "metrics": self.metrics.snapshot(),
+        })
+        if self.publish_command and len(errors) < len(outcomes):
+            await self.publish()
+        return outcomes
+
+    async def publish(self):
+        """Run the publish command, e.g. to push the new results to GitHub Pages"""
+        logger.info(f"Publishing: {self.publish_command}")
+        process = await asyncio.create_subprocess_shell(self.publish_command)
+        returncode = await process.wait()
+        if returncode != 0:
+            logger.error(f"Publish command exited with status {returncode}")
+
+    async def run_forever(self):
+        """Poll head until cancelled"""
+        logger.info(f"Watching {', '.join(self.calculators)} every {self.poll_interval}s")
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calculate each cycle as soon as it ends')
+    add_calculator_arguments(parser)
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f'Seconds between two head polls (default: {DEFAULT_POLL_INTERVAL})')
+    parser.add_argument('--retry-delay', type=float, default=DEFAULT_RETRY_DELAY,
+                        help=f'Seconds before a failed calculation is retried (default: {DEFAULT_RETRY_DELAY})')
+    parser.add_argument('--publish-command', type=str,
+                        help='Shell command run after new results are saved, e.g. ./backend/scripts/update_dal_stats.sh')
+    parser.add_argument('--live-blocks', type=int, default=DEFAULT_LIVE_BLOCKS,
+                        help=f'Blocks between two refreshes of the live estimate, 0 to disable '
+                             f'(default: {DEFAULT_LIVE_BLOCKS})')
+    parser.add_argument('--once', action='store_true', help='Run a single round and exit')
+    args = parser.parse_args()
+    configure_logging()
+
+    data_dir = Path(args.output_dir) if args.output_dir else DATA_DIR
+    calculators, metrics = build_calculators(args)
+    scheduler = CycleScheduler(
+        calculators,
+        data_dir,
+        metrics,
+        poll_interval=args.poll_interval,
+        retry_delay=args.retry_delay,
+        publish_command=args.publish_command,
+        run_report_file=Path(args.run_report) if args.run_report else None,
+        live_blocks=args.live_blocks,
+    )
+    try:
+        asyncio.run(scheduler.poll() if args.once else scheduler.run_forever())
+    except KeyboardInterrupt:
+        logger.info("Scheduler stopped")
+    finally:
+        close_calculators(calculators)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,35 +4,119 @@ import sys
 import json
 import logging
 import argparse
-import requests
+import asyncio
+import re
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Tuple, Optional
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from pathlib import Path
-import os
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/dal_stats.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from urllib.parse import urlparse
+
+import numpy as np
+
+from fetch_engine import FetchEngine, RetryPolicy, DEFAULT_MAX_CONCURRENCY, DEFAULT_RATE_LIMIT, DEFAULT_MAX_ATTEMPTS
+from response_cache import ResponseCache, CachePolicy, DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
+from history_store import HistoryStore, write_json_atomic
+from baker_store import BakerStore, BakerResult, DEFAULT_STORE_PATH
+from metrics import MetricsRegistry
+from dal_participation import DALParticipationResolver, sample_levels
+from baker_archive import BakerArchive, DEFAULT_ARCHIVE_DIR
+from aggregation import results_to_columns, aggregate_columns, aggregate_cycles
+
 logger = logging.getLogger(__name__)
 
+def configure_logging():
+    """Log to logs/dal_stats.log and stdout; called by the command-line entry points, not on import"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('logs/dal_stats.log'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
 # Define the path for storing results
 DATA_DIR = Path("/opt/dal_dashboard/backend/data")
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+DEFAULT_CONFIG_PATH = CONFIG_DIR / "config.json"
+
+# Page size for cycle-wide TzKT listings
+REWARDS_PAGE_SIZE = 1000
+DELEGATES_PAGE_SIZE = 500
+
+# Number of baker results buffered before they are written to the baker store
+BAKER_STORE_BATCH = 100
+
+# Blocks between two refreshes of the live estimate of the running cycle
+DEFAULT_LIVE_BLOCKS = 300
+
+# Upstream endpoints, as reported in the metrics
+_UPSTREAM_ENDPOINTS = (
+    ("head", re.compile(r"/head$")),
+    ("cycles", re.compile(r"/cycles/\d+$")),
+    ("rewards_bulk", re.compile(r"/rewards/bakers$")),
+    ("rewards_baker", re.compile(r"/rewards/bakers/[^/]+$")),
+    ("delegates", re.compile(r"/delegates$")),
+    ("delegate_at", re.compile(r"/delegates/[^/]+$")),
+    ("dal_participation", re.compile(r"/dal_participation$")),
+)
+
+def upstream_endpoint(url: str) -> str:
+    """Name of the TzKT/RPC endpoint serving url, used as a metrics label"""
+    path = urlparse(url).path.rstrip("/")
+    for name, pattern in _UPSTREAM_ENDPOINTS:
+        if pattern.search(path):
+            return name
+    return "other"
+
+def add_calculator_arguments(parser: argparse.ArgumentParser):
+    """Add the options shared by every script that builds calculators (see build_calculators)"""
+    parser.add_argument('--network', type=str, default='mainnet', help='Network to analyze (default: mainnet)')
+    parser.add_argument('--networks', type=str,
+                        help='Comma-separated networks computed together on a shared worker pool (overrides --network)')
+    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG_PATH),
+                        help='Configuration file with per-network endpoints and rate limits')
+    parser.add_argument('--output-dir', type=str, help='Output directory for data files')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f'Maximum number of concurrent requests (default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--api-rate', type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f'Requests per second allowed to the TzKT API (default: {DEFAULT_RATE_LIMIT})')
+    parser.add_argument('--rpc-rate', type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f'Requests per second allowed to the TzKT RPC (default: {DEFAULT_RATE_LIMIT})')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f'Attempts per request on 429/5xx and timeouts (default: {DEFAULT_MAX_ATTEMPTS})')
+    parser.add_argument('--dal-samples', type=int, default=1,
+                        help='Levels of the cycle tried for bakers whose DAL participation is unknown (default: 1)')
+    parser.add_argument('--cache-file', type=str, default=str(DEFAULT_CACHE_PATH),
+                        help='Persistent HTTP response cache (default: backend/cache/http_cache.sqlite3)')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Maximum size of the response cache in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the persistent response cache')
+    parser.add_argument('--baker-store', type=str, default=str(DEFAULT_STORE_PATH),
+                        help='Per-baker results store (default: backend/cache/baker_results.sqlite3)')
+    parser.add_argument('--no-baker-store', action='store_true', help='Disable the per-baker results store')
+    parser.add_argument('--run-report', type=str,
+                        help='JSON run report with timings and metrics (default: <output-dir>/dal_run_report.json)')
+    parser.add_argument('--archive-dir', type=str, default=str(DEFAULT_ARCHIVE_DIR),
+                        help='Columnar per-baker archive, one subdirectory per network (default: backend/cache/archive)')
+    parser.add_argument('--no-archive', action='store_true', help='Do not write the per-baker archive')
 
 # Create argument parser to accept output directory
 def parse_args():
     parser = argparse.ArgumentParser(description='Calculate DAL statistics for Tezos network')
-    parser.add_argument('--network', type=str, default='mainnet', help='Network to analyze (default: mainnet)')
-    parser.add_argument('--output-dir', type=str, help='Output directory for data files')
+    add_calculator_arguments(parser)
+    parser.add_argument('--last-completed', action='store_true',
+                        help='Analyze the last completed cycle of each network instead of the current one')
     parser.add_argument('--cycle', type=int, help='Specific cycle to analyze (default: current cycle)')
+    parser.add_argument('--from-store', action='store_true',
+                        help='Rebuild the statistics of --cycle from the baker store without network access')
+    parser.add_argument('--to-cycle', type=int,
+                        help='With --from-store, rebuild every cycle from --cycle to this one')
+    parser.add_argument('--live', action='store_true',
+                        help='Write a provisional estimate of the running cycle to dal_stats_live.json instead')
     return parser.parse_args()
 
 @dataclass
@@ -51,28 +135,198 @@ class DALStats:
     # Extended attributes for historical tracking
     dal_participation_percentage: float = 0.0
     dal_adoption_percentage: float = 0.0
+    # Stake concentration and adoption by stake bucket
+    stake_gini: float = 0.0
+    top_stake_percentage: float = 0.0
+    top_dal_active_bakers: int = 0
+    stake_buckets: List[Dict] = field(default_factory=list)
+    # Live estimate of a running cycle, as of level
+    provisional: bool = False
+    level: Optional[int] = None
+
+@dataclass
+class LiveCycle:
+    """Per-baker state of the running cycle kept by the live mode"""
+    cycle: int
+    timestamp: datetime
+    last_level: int
+    results: Dict[str, BakerResult]
+    level: Optional[int] = None
+    stats: Optional[DALStats] = None
+
+class DelegateFeed:
+    """
+    Paginated enumeration of the active delegates, shared by every cycle of a run.
+
+    Pages are fetched by a background task and kept, so several consumers can
+    iterate at once and the next page is already on its way while delegates
+    of the current one are processed. Once complete, the feed can be replayed
+    from any event loop without new requests.
+    """
+
+    def __init__(self, fetch_page: Callable[[int], Awaitable[Optional[List[Dict]]]]):
+        """
+        Start the enumeration on the running event loop.
+
+        Args:
+            fetch_page: Coroutine function returning the page at an offset, None on failure
+        """
+        self.pages: List[List[Dict]] = []
+        self.complete = False
+        self.failed = False
+        self.loop = asyncio.get_running_loop()
+        self._fetch_page = fetch_page
+        self._changed = asyncio.Condition()
+        self._task = asyncio.create_task(self._produce())
+
+    async def _produce(self):
+        offset = 0
+        try:
+            while True:
+                page = await self._fetch_page(offset)
+                if not isinstance(page, list):
+                    self.failed = True
+                    break
+                async with self._changed:
+                    self.pages.append(page)
+                    self._changed.notify_all()
+                if len(page) < DELEGATES_PAGE_SIZE:
+                    break
+                offset += DELEGATES_PAGE_SIZE
+        except Exception as e:
+            logger.error(f"Error enumerating delegates: {e}")
+            self.failed = True
+        finally:
+            async with self._changed:
+                self.complete = True
+                self._changed.notify_all()
+
+    async def __aiter__(self) -> AsyncIterator[Dict]:
+        index = 0
+        while True:
+            if not self.complete:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: index < len(self.pages) or self.complete)
+            if index < len(self.pages):
+                for delegate in self.pages[index]:
+                    yield delegate
+                index += 1
+            elif self.failed:
+                raise RuntimeError("Failed to fetch delegates data")
+            else:
+                return
 
 class DALCalculator:
     """Calculator for DAL statistics on Tezos network"""
     
-    def __init__(self, network: str = "mainnet"):
+    def __init__(self, network: str = "mainnet", max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 api_rate: float = DEFAULT_RATE_LIMIT, rpc_rate: float = DEFAULT_RATE_LIMIT,
+                 response_cache: Optional[ResponseCache] = None,
+                 baker_store: Optional[BakerStore] = None,
+                 api_url: Optional[str] = None, rpc_url: Optional[str] = None,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, dal_samples: int = 1,
+                 engine: Optional[FetchEngine] = None, metrics: Optional[MetricsRegistry] = None,
+                 archive: Optional[BakerArchive] = None):
         """
         Initialize the DAL calculator.
         
         Args:
             network: Tezos network to use (default: mainnet)
+            max_concurrency: Maximum number of requests in flight
+            api_rate: Requests per second allowed to the TzKT API host
+            rpc_rate: Requests per second allowed to the TzKT RPC host
+            response_cache: Persistent response cache (default: no persistent cache)
+            baker_store: Per-baker results store (default: every baker is queried on each run)
+            api_url: TzKT API base URL (default: public TzKT API of the network)
+            rpc_url: Tezos RPC base URL (default: TzKT RPC of the network)
+            max_attempts: Attempts per request on 429/5xx and timeouts
+            dal_samples: Levels of the cycle tried for bakers whose DAL participation is unknown
+            engine: Fetch engine shared with other calculators (default: a dedicated one,
+                and max_concurrency/max_attempts are then ignored)
+            metrics: Registry shared with other calculators (default: the engine's, or a new one)
+            archive: Columnar per-baker archive of the network (default: not archived)
         """
         self.network = network
-        self.rpc_url = "https://rpc.tzkt.io/mainnet"  # Using TzKT RPC for dal_participation
-        self.api_url = f"https://api.{network}.tzkt.io/v1"
+        self.rpc_url = rpc_url or f"https://rpc.tzkt.io/{network}"  # Using TzKT RPC for dal_participation
+        self.api_url = api_url or f"https://api.{network}.tzkt.io/v1"
         self.cache = {}
         self.cache_duration = timedelta(minutes=5)
-        self._session = requests.Session()
+        self.metrics = metrics or (engine.metrics if engine is not None else None) or MetricsRegistry()
+        self.metrics.describe("upstream_requests_total", "Upstream requests by endpoint and HTTP status")
+        self.metrics.describe("upstream_request_duration_seconds", "Upstream request latency by endpoint")
+        self.metrics.describe("rate_limit_wait_seconds_total", "Time spent waiting for a rate limit token")
+        self.metrics.describe("upstream_retries_total", "Upstream requests retried, by host and reason")
+        self.metrics.describe("concurrency_decreases_total", "Times the adaptive concurrency limit was halved")
+        self.metrics.describe("bakers_recovered_total", "Unclassified bakers classified by the final retry pass")
+        self.metrics.describe("response_cache_lookups_total", "Persistent response cache lookups by result")
+        self.metrics.describe("bakers_total", "Bakers aggregated, by whether they were queried or reused from the store")
+        self.metrics.describe("cycle_duration_seconds", "Wall time of a cycle calculation")
+        self.metrics.describe("live_refresh_queries_total", "dal_participation lookups made by live refreshes")
+        rate_limits = {
+            urlparse(self.api_url).netloc: api_rate,
+            urlparse(self.rpc_url).netloc: rpc_rate,
+        }
+        if engine is None:
+            engine = FetchEngine(
+                max_concurrency=max_concurrency,
+                rate_limits=rate_limits,
+                metrics=self.metrics,
+                retry=RetryPolicy(max_attempts=max_attempts),
+            )
+        else:
+            for host, rate in rate_limits.items():
+                engine.limiter.ensure_rate(host, rate)
+        self._engine = engine
+        self._session = self._engine.session
         self._cycle_bounds_cache = {}
+        self._response_cache = response_cache
+        self._cache_policy = CachePolicy()
+        self._baker_store = baker_store
+        self._archive = archive
+        self._delegate_feed: Optional[DelegateFeed] = None
+        self._prefetched_baking_powers: Dict[int, Dict[str, float]] = {}
+        self._live: Optional[LiveCycle] = None
+        self.dal_samples = dal_samples
+        self.dal_resolver = DALParticipationResolver(self.rpc_url, self._fetch_rpc_json, self._engine)
+
+    def close(self):
+        """Release the fetch engine's worker and connection pools, shared with other calculators if any"""
+        self._engine.close()
+
+    def _cache_get(self, url: str) -> Optional[dict]:
+        """Look up url in the persistent response cache, if enabled"""
+        if self._response_cache is None:
+            return None
+        data = self._response_cache.get(url)
+        self.metrics.inc("response_cache_lookups_total", network=self.network, endpoint=upstream_endpoint(url),
+                         result="miss" if data is None else "hit")
+        return data
+
+    def _cache_put(self, url: str, data) -> None:
+        """Store a successful response in the persistent cache, if enabled"""
+        if self._response_cache is not None and data is not None:
+            self._response_cache.put(url, data, self._cache_policy.ttl_for(url))
+
+    def _get(self, url: str, timeout: float):
+        """Rate-limited GET on the fetch engine, recording its latency and status"""
+        endpoint = upstream_endpoint(url)
+        started = time.perf_counter()
+        try:
+            response = self._engine.get(url, timeout=timeout)
+        except Exception:
+            self.metrics.observe("upstream_request_duration_seconds", time.perf_counter() - started,
+                                 network=self.network, endpoint=endpoint)
+            self.metrics.inc("upstream_requests_total", network=self.network, endpoint=endpoint, status="error")
+            raise
+        # elapsed leaves out the time spent waiting for a rate limit token
+        self.metrics.observe("upstream_request_duration_seconds", response.elapsed.total_seconds(),
+                             network=self.network, endpoint=endpoint)
+        self.metrics.inc("upstream_requests_total", network=self.network, endpoint=endpoint, status=response.status_code)
+        return response
 
     def _fetch_json(self, url: str) -> Optional[dict]:
         """
-        Fetch JSON data from a URL with caching and rate limiting.
+        Fetch JSON data from a URL, rate limited per host by the fetch engine.
         
         Args:
             url: URL to fetch data from
@@ -80,18 +334,56 @@ class DALCalculator:
         Returns:
             JSON response as dict or None if request failed
         """
+        cached = self._cache_get(url)
+        if cached is not None:
+            return cached
         try:
-            response = self._session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             response.raise_for_status()
-            # Add a small delay between requests to avoid rate limiting
-            time.sleep(0.5)
-            return response.json()
+            data = response.json()
+            self._cache_put(url, data)
+            return data
         except Exception as e:
             logger.error(f"Error fetching data from {url}: {e}")
-            # Add a longer delay if we hit an error (might be rate limiting)
-            time.sleep(2)
             return None
 
+    def _fetch_rpc_json(self, url: str) -> Optional[dict]:
+        """
+        Fetch JSON from the RPC. Unlike _fetch_json, a non-200 answer is expected
+        for some delegates and only logged at debug level.
+        
+        Args:
+            url: URL to fetch data from
+            
+        Returns:
+            JSON response as dict or None if request failed
+        """
+        cached = self._cache_get(url)
+        if cached is not None:
+            return cached
+        try:
+            response = self._get(url, timeout=15)
+            if response.status_code != 200:
+                logger.debug(f"Could not get {url}: HTTP {response.status_code}")
+                return None
+            data = response.json()
+            self._cache_put(url, data)
+            return data
+        except Exception as e:
+            logger.debug(f"Error fetching data from {url}: {e}")
+            return None
+
+    def get_head(self) -> Dict:
+        """
+        Get the chain head (level and cycle).
+        
+        Returns:
+            TzKT head dict
+        """
+        head = self._fetch_json(f"{self.api_url}/head")
+        self._cache_policy.observe_head(head)
+        return head
+
     def get_current_cycle(self) -> int:
         """
         Get the current Tezos cycle.
@@ -99,9 +391,60 @@ class DALCalculator:
         Returns:
             Current cycle number
         """
-        head = self._fetch_json(f"{self.api_url}/head")
-        return head["cycle"]
+        return self.get_head()["cycle"]
     
+    def get_delegates_page(self, offset: int) -> Optional[List[Dict]]:
+        """
+        Get one page of active delegates, with only the fields used by the calculation.
+        
+        Args:
+            offset: Number of delegates to skip
+            
+        Returns:
+            List of delegates or None on failure
+        """
+        return self._fetch_json(
+            f"{self.api_url}/delegates?active=true&select=address,stakingBalance&sort.asc=id"
+            f"&limit={DELEGATES_PAGE_SIZE}&offset={offset}"
+        )
+
+    async def iter_delegates(self) -> AsyncIterator[Dict]:
+        """
+        Stream the active delegates page by page.
+        
+        The list is enumerated once per calculator and reused by every cycle,
+        including cycles computed concurrently during a backfill.
+        
+        Yields:
+            Delegates with their address and staking balance
+        """
+        feed = self._delegate_feed
+        if feed is None or feed.failed or (not feed.complete and feed.loop is not asyncio.get_running_loop()):
+            feed = self._delegate_feed = DelegateFeed(partial(self._engine.run, self.get_delegates_page))
+        async for delegate in feed:
+            yield delegate
+
+    def reset_delegates(self):
+        """Enumerate the active delegates again for the next cycle (long-running processes)"""
+        self._delegate_feed = None
+
+    def prefetch_cycle(self, cycle: int):
+        """
+        Fetch ahead of time what the calculation of a running cycle can already use.
+        
+        The cycle bounds and the bulk baking powers are fixed once the cycle
+        has started, so a long-running process fetches them while idle and the
+        calculation at the end of the cycle only has the DAL participation left.
+        
+        Args:
+            cycle: Cycle that has started but not ended
+        """
+        self.get_cycle_info(cycle)
+        baking_powers = self.get_cycle_baking_powers(cycle)
+        if baking_powers:
+            self._prefetched_baking_powers = {cycle: baking_powers}
+            logger.info(f"Prefetched baking power of {len(baking_powers)} bakers for cycle {cycle}")
+
     def get_cycle_info(self, cycle: int) -> Optional[Dict]:
         """
         Get cycle information from TzKT API (cached).
@@ -140,58 +483,95 @@ class DALCalculator:
         except (KeyError, ValueError):
             return None
 
-    def get_delegate_stake(self, delegate: Dict, cycle: int) -> float:
+    def get_cycle_baking_powers(self, cycle: int) -> Dict[str, float]:
+        """
+        Get the baking power of every baker of a cycle in a few paginated bulk queries.
+        
+        Args:
+            cycle: Cycle number
+            
+        Returns:
+            Mapping of baker address to baking power. Bakers missing from the
+            map (or every baker after a failed page) fall back to per-delegate
+            lookups in get_delegate_stake.
+        """
+        baking_powers = {}
+        offset = 0
+        while True:
+            page = self._fetch_json(
+                f"{self.api_url}/rewards/bakers?cycle={cycle}&select=baker,bakingPower"
+                f"&limit={REWARDS_PAGE_SIZE}&offset={offset}"
+            )
+            if not isinstance(page, list):
+                break
+            for entry in page:
+                baker = entry.get("baker")
+                address = baker.get("address") if isinstance(baker, dict) else baker
+                try:
+                    baking_powers[address] = float(entry.get("bakingPower") or 0)
+                except (ValueError, TypeError):
+                    continue
+            if len(page) < REWARDS_PAGE_SIZE:
+                break
+            offset += REWARDS_PAGE_SIZE
+        return baking_powers
+
+    def get_delegate_stake(self, delegate: Dict, cycle: int,
+                           baking_powers: Optional[Dict[str, float]] = None) -> Optional[float]:
         """
         Get a delegate's stake for a given cycle.
         
         Args:
             delegate: Delegate information
             cycle: Cycle number
+            baking_powers: Bulk result of get_cycle_baking_powers, if available
             
         Returns:
-            Delegate's baking power
+            Delegate's baking power, None if it could not be fetched
         """
-        # Try to get baking power from rewards endpoint
-        rights = self._fetch_json(f"{self.api_url}/rewards/bakers/{delegate['address']}?cycle={cycle}")
-        if rights:
-            try:
-                if isinstance(rights, list) and rights:
-                    bp = rights[0].get("bakingPower", 0)
-                    if bp and bp > 0:
-                        return float(bp)
-                elif isinstance(rights, dict):
-                    bp = rights.get("bakingPower", 0)
-                    if bp and bp > 0:
-                        return float(bp)
-            except (KeyError, ValueError, TypeError):
-                pass
+        if baking_powers is not None and delegate['address'] in baking_powers:
+            bp = baking_powers[delegate['address']]
+            if bp > 0:
+                return bp
+            # Known zero baking power: skip the rewards call, go straight to the fallback
+        else:
+            # Try to get baking power from rewards endpoint
+            rights = self._fetch_json(f"{self.api_url}/rewards/bakers/{delegate['address']}?cycle={cycle}")
+            if rights:
+                try:
+                    if isinstance(rights, list) and rights:
+                        bp = rights[0].get("bakingPower", 0)
+                        if bp and bp > 0:
+                            return float(bp)
+                    elif isinstance(rights, dict):
+                        bp = rights.get("bakingPower", 0)
+                        if bp and bp > 0:
+                            return float(bp)
+                except (KeyError, ValueError, TypeError):
+                    pass
         
         # Fallback: get staking balance at cycle start
         bounds = self.get_cycle_bounds(cycle)
         if bounds:
             first_level, _ = bounds
             delegate_info = self._fetch_json(f"{self.api_url}/delegates/{delegate['address']}?at={first_level}")
-            if delegate_info:
-                staking_balance = delegate_info.get("stakingBalance", 0)
-                if staking_balance:
-                    return float(staking_balance)
+            if delegate_info is not None:
+                return float(delegate_info.get("stakingBalance") or 0)
         
-        return 0.0
+        return None
 
-    def check_dal_activation(self, delegate: Dict, cycle: int) -> Optional[bool]:
+    def get_dal_attested_slots(self, delegate: Dict, cycle: int) -> Optional[int]:
         """
-        Check if a delegate has DAL activated using the dal_participation RPC endpoint.
-        This method checks if the delegate has actually attested DAL slots.
+        Get the number of DAL slots a delegate attested during a cycle, using the
+        dal_participation RPC endpoint.
         
         Args:
             delegate: Delegate information
             cycle: Cycle number
             
         Returns:
-            True if DAL is activated, False if not, None if cannot determine
+            Number of attested DAL slots, None if cannot determine
         """
-        baker_address = delegate['address']
-        
         # Get cycle bounds
         bounds = self.get_cycle_bounds(cycle)
         if not bounds:
@@ -201,46 +581,93 @@ class DALCalculator:
         first_level, last_level = bounds
         
         # Use before-last level to avoid reset (dal_participation resets at last block)
-        check_level = last_level - 1
+        return self.dal_resolver.lookup(delegate['address'], last_level - 1)
+
+    def check_dal_activation(self, delegate: Dict, cycle: int) -> Optional[bool]:
+        """
+        Check if a delegate has DAL activated using the dal_participation RPC endpoint.
+        This method checks if the delegate has actually attested DAL slots.
         
-        try:
-            # Query RPC dal_participation endpoint
-            url = f"{self.rpc_url}/chains/main/blocks/{check_level}/context/delegates/{baker_address}/dal_participation"
-            response = self._session.get(url, timeout=15)
-            
-            if response.status_code != 200:
-                logger.debug(f"Could not get dal_participation for {baker_address}: HTTP {response.status_code}")
-                return None
-            
-            data = response.json()
-            attested_slots = data.get('delegate_attested_dal_slots', 0)
-            
-            # If attested_slots > 0, the baker has DAL activated
-            return attested_slots > 0
+        Args:
+            delegate: Delegate information
+            cycle: Cycle number
             
-        except Exception as e:
-            logger.debug(f"Error checking DAL activation for {baker_address}: {e}")
+        Returns:
+            True if DAL is activated, False if not, None if cannot determine
+        """
+        attested_slots = self.get_dal_attested_slots(delegate, cycle)
+        if attested_slots is None:
             return None
+        # If attested_slots > 0, the baker has DAL activated
+        return attested_slots > 0
 
-    def process_delegate(self, delegate: Dict, cycle: int) -> Tuple[Dict, float, Optional[bool]]:
+    def process_delegate(self, delegate: Dict, cycle: int,
+                         baking_powers: Optional[Dict[str, float]] = None,
+                         dal_slots: Optional[Dict[str, Optional[int]]] = None) -> BakerResult:
         """
         Process a delegate to get their stake and DAL status.
         
         Args:
             delegate: Delegate information
             cycle: Cycle number
+            baking_powers: Bulk result of get_cycle_baking_powers, if available
+            dal_slots: Attested slots resolved in bulk for the cycle's delegates, if available
+                (the delegate is then not looked up on its own)
+            
+        Returns:
+            The delegate's result for the cycle
+        """
+        stake = self.get_delegate_stake(delegate, cycle, baking_powers)
+        if dal_slots is not None:
+            attested_slots = dal_slots.get(delegate['address'])
+        else:
+            attested_slots = self.get_dal_attested_slots(delegate, cycle)
+        dal_status = None if attested_slots is None else attested_slots > 0
+        return BakerResult(delegate['address'], stake, dal_status, attested_slots, time.time())
+
+    def lookup_baker(self, address: str, cycle: int) -> BakerResult:
+        """
+        Get the result of a single baker for a cycle.
+        
+        A settled result from the baker store is reused; otherwise the baker is
+        queried like in a full calculation and a settled outcome is stored.
+        
+        Args:
+            address: Baker address
+            cycle: Completed cycle
             
         Returns:
-            Tuple of (delegate info, stake, DAL status)
+            The baker's result for the cycle
         """
-        stake = self.get_delegate_stake(delegate, cycle)
-        dal_status = self.check_dal_activation(delegate, cycle)
-        return delegate, stake, dal_status
+        if self._baker_store is not None:
+            stored = self._baker_store.get_result(self.network, cycle, address)
+            if stored is not None and stored.settled:
+                return stored
+        result = self.process_delegate({'address': address}, cycle)
+        if result.settled and self._baker_store is not None:
+            self._baker_store.put_results(self.network, cycle, [result])
+        return result
 
     def calculate_stats(self, verbose: bool = False, cycle: Optional[int] = None) -> DALStats:
         """
         Calculate DAL statistics for a specific cycle or the current cycle.
         
+        Runs calculate_stats_async in a new event loop, so it must not be called
+        from a running loop (await calculate_stats_async there instead).
+        
+        Args:
+            verbose: Whether to log verbose progress information
+            cycle: Specific cycle to analyze (default: current cycle)
+            
+        Returns:
+            DALStats object containing current statistics
+        """
+        return asyncio.run(self.calculate_stats_async(verbose=verbose, cycle=cycle))
+
+    async def calculate_stats_async(self, verbose: bool = False, cycle: Optional[int] = None) -> DALStats:
+        """
+        Calculate DAL statistics, processing delegates concurrently on the fetch engine.
+        
         Args:
             verbose: Whether to log verbose progress information
             cycle: Specific cycle to analyze (default: current cycle)
@@ -248,8 +675,10 @@ class DALCalculator:
         Returns:
             DALStats object containing current statistics
         """
+        # Always look at head: it tells the response cache which cycles are final
+        current_cycle = await self._engine.run(self.get_current_cycle)
         if cycle is None:
-            cycle = self.get_current_cycle()
+            cycle = current_cycle
         
         cache_key = f"stats_{self.network}_{cycle}"
         if cache_key in self.cache:
@@ -258,106 +687,256 @@ class DALCalculator:
                 return cached_stats
         if verbose:
             logger.info(f"Processing cycle {cycle}")
+        started = time.perf_counter()
             
-        delegates = self._fetch_json(f"{self.api_url}/delegates?active=true&limit=10000")
-        if not delegates:
-            logger.error("Could not fetch delegates")
-            raise RuntimeError("Failed to fetch delegates data")
-
-        dal_active = 0
-        dal_inactive = 0
-        unclassified = 0
-        non_attesting = 0
-        total_stake = 0
-        dal_stake = 0
-
-        total_delegates = len(delegates)
-        
-        # Use ThreadPoolExecutor for parallel processing if not verbose
-        if not verbose:
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                futures = {
-                    executor.submit(self.process_delegate, delegate, cycle): delegate
-                    for delegate in delegates
-                }
+        # Bakers settled by a previous run are not queried again
+        stored = {}
+        if self._baker_store is not None:
+            stored = self._baker_store.get_cycle(self.network, cycle)
+        results = {}
 
-                for future in as_completed(futures):
-                    delegate, stake, dal_status = future.result()
-                    total_stake += stake
-
-                    if dal_status is None and stake == 0:
-                        non_attesting += 1
-                    elif dal_status is None:
-                        unclassified += 1
-                    elif dal_status:
-                        dal_active += 1
-                        dal_stake += stake
-                    else:
-                        dal_inactive += 1
-        else:
-            # Process sequentially with verbose logging
-            for i, delegate in enumerate(delegates, 1):
-                logger.info(f"Processing delegate {i}/{total_delegates}: {delegate['address']}")
-                delegate_info, stake, dal_status = self.process_delegate(delegate, cycle)
-                total_stake += stake
-
-                if dal_status is None and stake == 0:
-                    non_attesting += 1
-                elif dal_status is None:
-                    unclassified += 1
-                elif dal_status:
-                    dal_active += 1
-                    dal_stake += stake
+        async def pending_delegates():
+            async for delegate in self.iter_delegates():
+                known = stored.get(delegate['address'])
+                if known is not None and known.settled:
+                    results[delegate['address']] = known
                 else:
-                    dal_inactive += 1
+                    yield delegate
 
-        # Calculate DAL participation percentage
-        non_attesting_count = total_delegates - non_attesting
-        dal_participation = (dal_active / non_attesting_count * 100) if non_attesting_count > 0 else 0
-        
-        # Calculate DAL adoption percentage
-        dal_adoption = ((total_delegates - dal_inactive - unclassified - non_attesting) / total_delegates * 100) if total_delegates > 0 else 0
+        # Resolve cycle bounds once so concurrent workers don't all fetch /cycles/N
+        cycle_info = await self._engine.run(self.get_cycle_info, cycle)
+        bounds = self.get_cycle_bounds(cycle)
+        baking_powers = self._prefetched_baking_powers.pop(cycle, None)
+        if baking_powers is None:
+            baking_powers = await self._engine.run(self.get_cycle_baking_powers, cycle)
+        if verbose:
+            logger.info(f"Resolved baking power of {len(baking_powers)} bakers in bulk")
+
+        # DAL participation of the whole delegate set at the before-last level
+        # (counters reset at the last block), instead of one lookup per worker
+        delegates = [delegate async for delegate in pending_delegates()]
+        dal_slots = {}
+        if bounds and delegates:
+            dal_slots = await self.dal_resolver.resolve([delegate['address'] for delegate in delegates], bounds[1] - 1)
+            if verbose:
+                logger.info(f"Resolved DAL participation of {len(dal_slots)} bakers in bulk")
+
+        processed = 0
+        unsaved = []
+
+        try:
+            async for result in self._engine.map_unordered(
+                    partial(self.process_delegate, cycle=cycle, baking_powers=baking_powers, dal_slots=dal_slots),
+                    delegates):
+                processed += 1
+                if verbose:
+                    logger.info(f"Cycle {cycle}: processed delegate {processed}: {result.address}")
+                results[result.address] = result
+                if self._baker_store is not None:
+                    unsaved.append(result)
+                    if len(unsaved) >= BAKER_STORE_BATCH:
+                        self._baker_store.put_results(self.network, cycle, unsaved)
+                        unsaved = []
+        finally:
+            # Keep what was fetched even if processing failed half-way
+            if unsaved:
+                self._baker_store.put_results(self.network, cycle, unsaved)
+
+        if not results:
+            logger.error("Could not fetch delegates")
+            raise RuntimeError("Failed to fetch delegates data")
+
+        # Last chance for bakers left unclassified by errors that outlasted the retries,
+        # trying earlier levels of the cycle when dal_samples > 1
+        unclassified = [result for result in results.values() if result.dal_status is None]
+        if unclassified and bounds:
+            if verbose:
+                logger.info(f"Retrying DAL status of {len(unclassified)} unclassified bakers")
+            slots = await self.dal_resolver.resolve_sampled(
+                [result.address for result in unclassified], sample_levels(*bounds, self.dal_samples))
+            recovered = [
+                BakerResult(result.address, result.stake, slots[result.address] > 0, slots[result.address], time.time())
+                for result in unclassified if slots[result.address] is not None
+            ]
+            for result in recovered:
+                results[result.address] = result
+            if recovered and self._baker_store is not None:
+                self._baker_store.put_results(self.network, cycle, recovered)
+            self.metrics.inc("bakers_recovered_total", len(recovered), network=self.network)
+        if verbose and processed < len(results):
+            logger.info(f"Reused stored results of {len(results) - processed} bakers, queried {processed}")
 
         # Get the actual cycle timestamp from TzKT API
-        cycle_info = self.get_cycle_info(cycle)
         if cycle_info and 'startTime' in cycle_info:
             cycle_timestamp = datetime.fromisoformat(cycle_info['startTime'].replace('Z', '+00:00'))
+            if self._baker_store is not None:
+                self._baker_store.put_cycle_start(self.network, cycle, cycle_timestamp)
         else:
             cycle_timestamp = datetime.now()
             logger.warning(f"Could not get cycle {cycle} start time, using current time")
 
-        stats = DALStats(
-            cycle=cycle,
-            timestamp=cycle_timestamp,
-            total_bakers=total_delegates,
-            dal_active_bakers=dal_active,
-            dal_inactive_bakers=dal_inactive,
-            unclassified_bakers=unclassified,
-            non_attesting_bakers=non_attesting,
-            dal_baking_power_percentage=(dal_stake / total_stake * 100) if total_stake > 0 else 0,
-            total_baking_power=total_stake,
-            dal_baking_power=dal_stake,
-            dal_participation_percentage=dal_participation,
-            dal_adoption_percentage=dal_adoption
-        )
+        stats = aggregate_results(cycle, cycle_timestamp, results.values())
+        if self._archive is not None:
+            await self._engine.run(self._archive.write_cycle, cycle, list(results.values()))
+        self.metrics.inc("bakers_total", processed, network=self.network, source="queried")
+        self.metrics.inc("bakers_total", len(results) - processed, network=self.network, source="stored")
+        self.metrics.observe("cycle_duration_seconds", time.perf_counter() - started, network=self.network)
 
         self.cache[cache_key] = (stats, datetime.now())
         
         if verbose:
-            # Log results
-            logger.info("=== Final Results ===")
-            logger.info(f"{dal_active} bakers have activated their DAL node.")
-            logger.info(f"{dal_inactive} bakers have NOT activated their DAL node.")
-            logger.info(f"{unclassified} bakers cannot be classified.")
-            logger.info(f"{non_attesting} bakers sent no attestations.")
-            logger.info(f"DAL users represent {100 * dal_active/(dal_active + dal_inactive + unclassified + non_attesting):.2f}% of the total bakers.")
-            logger.info(f"DAL users represent {dal_stake/1e6:.1f}M ꜩ / {total_stake/1e6:.1f}M = {100 * dal_stake/total_stake:.2f}% of the baking power.")
+            log_stats(stats)
         
         return stats
 
-def save_results_and_update_history(stats, results_file, history_file):
-    """Save the results and update the history file"""
-    # Convert DALStats object to dictionary
+    async def _start_live_cycle(self, cycle: int) -> LiveCycle:
+        """Enumerate the bakers of a newly started cycle with their stake, none queried yet"""
+        cycle_info = await self._engine.run(self.get_cycle_info, cycle)
+        bounds = self.get_cycle_bounds(cycle)
+        if not bounds:
+            raise RuntimeError(f"Could not get bounds of cycle {cycle}")
+        # Left in place for the final calculation of the cycle
+        baking_powers = self._prefetched_baking_powers.get(cycle)
+        if baking_powers is None:
+            baking_powers = await self._engine.run(self.get_cycle_baking_powers, cycle)
+        self.reset_delegates()
+        results = {}
+        async for address, stake in self._engine.map_unordered(
+                lambda delegate: (delegate['address'], self.get_delegate_stake(delegate, cycle, baking_powers)),
+                self.iter_delegates()):
+            results[address] = BakerResult(address, stake, None)
+        if not results:
+            raise RuntimeError("Failed to fetch delegates data")
+        if cycle_info and 'startTime' in cycle_info:
+            cycle_timestamp = datetime.fromisoformat(cycle_info['startTime'].replace('Z', '+00:00'))
+        else:
+            cycle_timestamp = datetime.now()
+        logger.info(f"Live mode: tracking {len(results)} bakers of {self.network} cycle {cycle}")
+        return LiveCycle(cycle=cycle, timestamp=cycle_timestamp, last_level=bounds[1], results=results)
+
+    async def refresh_live(self, every_blocks: int = DEFAULT_LIVE_BLOCKS, head: Optional[Dict] = None) -> DALStats:
+        """
+        Update the provisional statistics of the running cycle.
+        
+        dal_participation counters accumulate over the cycle, so a baker seen
+        attesting DAL slots stays active until the cycle ends. Only the bakers
+        not confirmed active yet are queried again, which makes every refresh
+        cheaper than the previous one as the cycle progresses. Stakes and the
+        baker list are fetched once, when the cycle starts.
+        
+        Args:
+            every_blocks: Blocks since the previous refresh below which it is returned unchanged
+            head: Chain head already fetched by the caller (default: fetched here)
+            
+        Returns:
+            Provisional DALStats of the running cycle
+        """
+        if head is None:
+            head = await self._engine.run(self.get_head)
+        cycle, level = int(head["cycle"]), int(head["level"])
+        live = self._live
+        if live is None or live.cycle != cycle:
+            live = self._live = await self._start_live_cycle(cycle)
+        elif live.stats is not None and level - live.level < every_blocks:
+            return live.stats
+
+        # dal_participation resets at the last block of the cycle
+        query_level = min(level, live.last_level - 1)
+        pending = [address for address, result in live.results.items() if result.dal_status is not True]
+        slots = await self.dal_resolver.resolve(pending, query_level)
+        for address, count in slots.items():
+            if count is not None:
+                live.results[address] = BakerResult(address, live.results[address].stake, count > 0, count,
+                                                    time.time())
+        self.metrics.inc("live_refresh_queries_total", len(pending), network=self.network)
+
+        live.level = level
+        live.stats = replace(aggregate_results(cycle, live.timestamp, live.results.values()),
+                             provisional=True, level=query_level)
+        logger.info(f"Live estimate of {self.network} cycle {cycle} at level {query_level}: "
+                    f"{live.stats.dal_active_bakers}/{live.stats.total_bakers} bakers active, "
+                    f"{len(pending)} queried")
+        return live.stats
+
+    def stats_from_store(self, cycle: int) -> DALStats:
+        """
+        Rebuild the statistics of a cycle from the baker store, without network access.
+        
+        Args:
+            cycle: Cycle number
+            
+        Returns:
+            DALStats object built from the stored per-baker results
+        """
+        if self._baker_store is None:
+            raise RuntimeError("No baker store configured")
+        results = self._baker_store.get_cycle(self.network, cycle)
+        if not results:
+            raise RuntimeError(f"No stored results for cycle {cycle}")
+        cycle_timestamp = self._baker_store.get_cycle_start(self.network, cycle)
+        if cycle_timestamp is None:
+            cycle_timestamp = datetime.now()
+            logger.warning(f"No start time stored for cycle {cycle}, using current time")
+        if self._archive is not None:
+            self._archive.write_cycle(cycle, results.values())
+        return aggregate_results(cycle, cycle_timestamp, results.values())
+
+    def stats_from_store_range(self, from_cycle: int, to_cycle: int) -> List[DALStats]:
+        """
+        Rebuild the statistics of many cycles from the baker store in one pass.
+        
+        Args:
+            from_cycle: First cycle (inclusive)
+            to_cycle: Last cycle (inclusive)
+            
+        Returns:
+            DALStats of every stored cycle of the range, in ascending order
+        """
+        if self._baker_store is None:
+            raise RuntimeError("No baker store configured")
+        cycles, stake, status = self._baker_store.get_columns(self.network, from_cycle, to_cycle)
+        if not len(cycles):
+            raise RuntimeError(f"No stored results for cycles {from_cycle}-{to_cycle}")
+        stored_cycles, groups = np.unique(cycles, return_inverse=True)
+        aggregates = aggregate_cycles(groups, stake, status, len(stored_cycles))
+        stats = []
+        for cycle, aggregate in zip(stored_cycles.tolist(), aggregates):
+            cycle_timestamp = self._baker_store.get_cycle_start(self.network, cycle)
+            if cycle_timestamp is None:
+                cycle_timestamp = datetime.now()
+                logger.warning(f"No start time stored for cycle {cycle}, using current time")
+            stats.append(DALStats(cycle=cycle, timestamp=cycle_timestamp, **aggregate))
+        return stats
+
+def aggregate_results(cycle: int, timestamp: datetime, results: Iterable[BakerResult]) -> DALStats:
+    """
+    Reduce per-baker results to the statistics of a cycle.
+    
+    Args:
+        cycle: Cycle number
+        timestamp: Cycle start time
+        results: One result per baker
+        
+    Returns:
+        DALStats object for the cycle
+    """
+    stake, status = results_to_columns(results)
+    return DALStats(cycle=cycle, timestamp=timestamp, **aggregate_columns(stake, status))
+
+def log_stats(stats: DALStats):
+    """Log the final results of a cycle"""
+    logger.info("=== Final Results ===")
+    logger.info(f"{stats.dal_active_bakers} bakers have activated their DAL node.")
+    logger.info(f"{stats.dal_inactive_bakers} bakers have NOT activated their DAL node.")
+    logger.info(f"{stats.unclassified_bakers} bakers cannot be classified.")
+    logger.info(f"{stats.non_attesting_bakers} bakers sent no attestations.")
+    if stats.total_bakers:
+        logger.info(f"DAL users represent {100 * stats.dal_active_bakers / stats.total_bakers:.2f}% of the total bakers.")
+    if stats.total_baking_power:
+        logger.info(f"DAL users represent {stats.dal_baking_power/1e6:.1f}M ꜩ / {stats.total_baking_power/1e6:.1f}M = {stats.dal_baking_power_percentage:.2f}% of the baking power.")
+
+def stats_to_dict(stats: DALStats) -> Dict:
+    """Convert a DALStats object to the dal_stats.json representation"""
     results = {
         "timestamp": stats.timestamp.isoformat(),
         "cycle": stats.cycle,
@@ -370,63 +949,196 @@ def save_results_and_update_history(stats, results_file, history_file):
         "total_baking_power": stats.total_baking_power,
         "dal_baking_power": stats.dal_baking_power,
         "dal_participation_percentage": stats.dal_participation_percentage,
-        "dal_adoption_percentage": stats.dal_adoption_percentage
+        "dal_adoption_percentage": stats.dal_adoption_percentage,
+        "stake_gini": stats.stake_gini,
+        "top_stake_percentage": stats.top_stake_percentage,
+        "top_dal_active_bakers": stats.top_dal_active_bakers,
+        "stake_buckets": stats.stake_buckets
     }
+    if stats.provisional:
+        results["provisional"] = True
+        results["level"] = stats.level
+    return results
+
+# One history store per file, kept for the whole process so the log is replayed once
+_history_stores: Dict[Path, HistoryStore] = {}
+
+def get_history_store(history_file: Path) -> HistoryStore:
+    """History store of a file, opened on first use"""
+    key = Path(history_file).resolve()
+    store = _history_stores.get(key)
+    if store is None:
+        store = _history_stores[key] = HistoryStore(key)
+    else:
+        store.sync()
+    return store
+
+def load_history(history_file: Path) -> List[Dict]:
+    """Load the history, returning an empty history if it is missing or corrupt"""
+    return get_history_store(history_file).entries()
+
+def update_history(history_file: Path, results_list: List[Dict]):
+    """
+    Merge one or more cycle results into the history log.
+    
+    The JSON history is only written by export_histories, once per run.
+    
+    Args:
+        history_file: Path of dal_stats_history.json
+        results_list: Cycle results as produced by stats_to_dict
+    """
+    get_history_store(history_file).update(results_list)
+
+def export_histories():
+    """Write the JSON history of every store updated since its last export"""
+    for store in _history_stores.values():
+        store.export()
+
+def save_results_and_update_history(stats, results_file, history_file):
+    """Save the results and update the history file"""
+    results = stats_to_dict(stats)
     
     # Save results to data directory
-    results_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    write_json_atomic(results_file, results)
         
-    # Update history file - first load existing history
-    history = []
-    if history_file.exists():
-        try:
-            with open(history_file, 'r') as f:
-                history = json.load(f)
-        except json.JSONDecodeError:
-            logger.error("Error reading history file. Creating new one.")
-            history = []
+    update_history(history_file, [results])
+
+    logger.info(f"Results saved to {results_file}")
+    logger.info(f"History updated in {history_file}")
+
+def network_files(data_dir: Path, network: str) -> Tuple[Path, Path]:
+    """
+    Get the results and history files of a network.
     
-    # Check if this cycle is already in history
-    cycle_exists = False
-    for entry in history:
-        if entry.get("cycle") == stats.cycle:
-            # Update existing entry
-            entry.update({
-                "timestamp": results["timestamp"],
-                "dal_active_bakers": stats.dal_active_bakers,
-                "dal_baking_power_percentage": stats.dal_baking_power_percentage,
-                "dal_participation_percentage": stats.dal_participation_percentage,
-                "dal_adoption_percentage": stats.dal_adoption_percentage
-            })
-            cycle_exists = True
-            break
+    Mainnet keeps the historical names published on GitHub Pages, other
+    networks get a suffix (dal_stats_ghostnet.json, ...).
     
-    # If cycle doesn't exist, add new entry
-    if not cycle_exists:
-        history.append({
-            "timestamp": results["timestamp"],
-            "cycle": stats.cycle,
-            "dal_active_bakers": stats.dal_active_bakers,
-            "dal_baking_power_percentage": stats.dal_baking_power_percentage,
-            "dal_participation_percentage": stats.dal_participation_percentage,
-            "dal_adoption_percentage": stats.dal_adoption_percentage
-        })
+    Returns:
+        (results file, history file)
+    """
+    suffix = "" if network == "mainnet" else f"_{network}"
+    return data_dir / f"dal_stats{suffix}.json", data_dir / f"dal_stats_history{suffix}.json"
+
+def live_results_file(data_dir: Path, network: str) -> Path:
+    """Provisional results of the running cycle (dal_stats_live.json, with the network suffix)"""
+    suffix = "" if network == "mainnet" else f"_{network}"
+    return data_dir / f"dal_stats_live{suffix}.json"
+
+def load_network_config(config_file: Path) -> Dict[str, Dict]:
+    """
+    Load per-network settings (api_url, rpc_url, api_rate, rpc_rate).
     
-    # Sort history by cycle (descending)
-    history.sort(key=lambda x: x["cycle"], reverse=True)
+    Falls back to config.example.json when config_file does not exist.
     
-    # Save updated history
-    with open(history_file, 'w') as f:
-        json.dump(history, f, indent=2)
+    Returns:
+        Settings keyed by network name, empty when no configuration is found
+    """
+    for candidate in (config_file, CONFIG_DIR / "config.example.json"):
+        if candidate.exists():
+            try:
+                with open(candidate, 'r') as f:
+                    return json.load(f).get("networks", {})
+            except json.JSONDecodeError:
+                logger.error(f"Error reading configuration file {candidate}")
+    return {}
 
-    logger.info(f"Results saved to {results_file}")
-    logger.info(f"History updated in {history_file}")
+async def calculate_networks(calculators: Dict[str, DALCalculator], cycle: Optional[int],
+                             last_completed: bool) -> Dict[str, object]:
+    """
+    Compute the statistics of several networks concurrently.
+    
+    Returns:
+        DALStats, or the exception that stopped the calculation, keyed by network
+    """
+    async def run(calculator: DALCalculator) -> DALStats:
+        target = cycle
+        if target is None and last_completed:
+            target = await calculator._engine.run(calculator.get_current_cycle) - 1
+        return await calculator.calculate_stats_async(verbose=True, cycle=target)
+
+    outcomes = await asyncio.gather(*(run(calculator) for calculator in calculators.values()),
+                                    return_exceptions=True)
+    return dict(zip(calculators, outcomes))
+
+async def refresh_live_networks(calculators: Dict[str, DALCalculator], data_dir: Path) -> Dict[str, object]:
+    """
+    Refresh and save the live estimate of every network.
+    
+    Returns:
+        Provisional DALStats, or the exception that stopped the refresh, keyed by network
+    """
+    async def run(network: str, calculator: DALCalculator) -> DALStats:
+        stats = await calculator.refresh_live()
+        await asyncio.to_thread(write_json_atomic, live_results_file(data_dir, network), stats_to_dict(stats))
+        return stats
+
+    outcomes = await asyncio.gather(*(run(network, calculator) for network, calculator in calculators.items()),
+                                    return_exceptions=True)
+    return dict(zip(calculators, outcomes))
+
+def write_run_report(report_file: Path, report: Dict):
+    """Write the JSON run report, never failing the run because of it"""
+    try:
+        write_json_atomic(report_file, report)
+        logger.info(f"Run report written to {report_file}")
+    except OSError as e:
+        logger.warning(f"Could not write run report {report_file}: {e}")
+
+def build_calculators(args: argparse.Namespace) -> Tuple[Dict[str, DALCalculator], MetricsRegistry]:
+    """
+    Build one calculator per requested network from the options of add_calculator_arguments.
+    
+    The calculators share the response cache, the baker store and a single
+    fetch engine, so their requests go through one worker and connection pool.
+    
+    Returns:
+        (calculators keyed by network, shared metrics registry)
+    """
+    networks = [network.strip() for network in args.networks.split(",")] if args.networks else [args.network]
+    network_config = load_network_config(Path(args.config))
+    
+    response_cache = None
+    if not args.no_cache:
+        response_cache = ResponseCache(Path(args.cache_file), max_bytes=args.cache_max_mb * 1024 * 1024)
+    
+    baker_store = None
+    if not args.no_baker_store:
+        baker_store = BakerStore(Path(args.baker_store))
+    
+    # One worker pool and connection pool for every network, rate limited per host
+    metrics = MetricsRegistry()
+    engine = FetchEngine(
+        max_concurrency=args.concurrency,
+        metrics=metrics,
+        retry=RetryPolicy(max_attempts=args.max_attempts),
+    )
+    calculators = {}
+    for network in networks:
+        settings = network_config.get(network, {})
+        calculators[network] = DALCalculator(
+            network=network,
+            dal_samples=args.dal_samples,
+            api_url=settings.get("api_url"),
+            rpc_url=settings.get("rpc_url"),
+            api_rate=settings.get("api_rate", args.api_rate),
+            rpc_rate=settings.get("rpc_rate", args.rpc_rate),
+            response_cache=response_cache,
+            baker_store=baker_store,
+            engine=engine,
+            metrics=metrics,
+            archive=None if args.no_archive else BakerArchive(Path(args.archive_dir) / network),
+        )
+    return calculators, metrics
+
+def close_calculators(calculators: Dict[str, DALCalculator]):
+    """Release the fetch engines of calculators built by build_calculators"""
+    for calculator in calculators.values():
+        calculator.close()
 
 def main():
     # Parse command line arguments
     args = parse_args()
+    configure_logging()
     
     # Initialize paths
     if args.output_dir:
@@ -434,20 +1146,73 @@ def main():
     else:
         data_dir = DATA_DIR
     
-    results_file = data_dir / "dal_stats.json"
-    history_file = data_dir / "dal_stats_history.json"
+    calculators, metrics = build_calculators(args)
+    networks = list(calculators)
     
-    # Initialize the calculator
-    calculator = DALCalculator(network=args.network)
+    run_report_file = Path(args.run_report) if args.run_report else data_dir / "dal_run_report.json"
+    started_at = datetime.now()
+    started = time.perf_counter()
+    outcomes: Dict[str, object] = {}
     
     try:
-        # Calculate stats with verbose output
-        stats = calculator.calculate_stats(verbose=True, cycle=args.cycle)
+        if args.from_store:
+            if args.cycle is None:
+                raise ValueError("--from-store requires --cycle")
+            for network, calculator in calculators.items():
+                try:
+                    if args.to_cycle is None:
+                        outcomes[network] = calculator.stats_from_store(args.cycle)
+                    else:
+                        # Earlier cycles only go to the history, the last one is saved as the results
+                        rebuilt = calculator.stats_from_store_range(args.cycle, args.to_cycle)
+                        update_history(network_files(data_dir, network)[1],
+                                       [stats_to_dict(stats) for stats in rebuilt[:-1]])
+                        outcomes[network] = rebuilt[-1]
+                    log_stats(outcomes[network])
+                except Exception as e:
+                    outcomes[network] = e
+        elif args.live:
+            outcomes = asyncio.run(refresh_live_networks(calculators, data_dir))
+        else:
+            # Calculate stats with verbose output
+            outcomes = asyncio.run(calculate_networks(calculators, args.cycle, args.last_completed))
         
-        # Save results and update history
-        save_results_and_update_history(stats, results_file, history_file)
+        # Save results and update history (a live estimate is saved on its own)
+        for network, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                logger.error(f"Error calculating DAL stats for {network}: {outcome}")
+                continue
+            if args.live:
+                continue
+            results_file, history_file = network_files(data_dir, network)
+            try:
+                save_results_and_update_history(outcome, results_file, history_file)
+            except Exception as e:
+                logger.error(f"Error saving DAL stats for {network}: {e}")
+                outcomes[network] = e
+        export_histories()
     except Exception as e:
         logger.error(f"Error calculating DAL stats: {e}")
+        outcomes = {network: e for network in networks}
+    finally:
+        errors = {network: str(outcome) for network, outcome in outcomes.items() if isinstance(outcome, Exception)}
+        write_run_report(run_report_file, {
+            "networks": {
+                network: {
+                    "cycle": outcome.cycle if isinstance(outcome, DALStats) else args.cycle,
+                    "status": "error" if network in errors else "ok",
+                    "error": errors.get(network),
+                }
+                for network, outcome in outcomes.items()
+            },
+            "status": "error" if errors or not outcomes else "ok",
+            "error": "; ".join(f"{network}: {error}" for network, error in errors.items()) or None,
+            "started_at": started_at.isoformat(),
+            "wall_time_s": round(time.perf_counter() - started, 3),
+            "metrics": metrics.snapshot(),
+        })
+        close_calculators(calculators)
+    if errors or not outcomes:
         sys.exit(1)
 
 if __name__ == "__main__":
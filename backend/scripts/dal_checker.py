@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+# Add the scripts directory to the path to import dal_calculation
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dal_calculation import DALCalculator, DEFAULT_CONFIG_PATH, CONFIG_DIR
+from history_store import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPDATE_INTERVAL = 3600
+DEFAULT_CONCURRENCY = 64
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_RETENTION_DAYS = 7
+DEFAULT_FULL_BACKUP_EVERY = 24
+
+# Share of update_interval a sweep may take, and most probes run at once to fit in it
+SWEEP_BUDGET_RATIO = 0.8
+MAX_WORKERS = 1024
+
+# DAL node RPCs of the bootstrap node: peers subscribed to each attester's topics, and what it knows of each peer
+PKH_PEERS_PATH = "/p2p/gossipsub/pkhs/peers?all"
+PEERS_INFO_PATH = "/p2p/peers/info"
+
+BACKUP_PREFIX = "dal_status_"
+BACKUP_TIME_FORMAT = "%Y%m%d_%H%M%S"
+# Suffixes of the full and diff backups; older dal_status_<time>.json backups are left alone
+FULL_SUFFIX = ".full.json"
+DIFF_SUFFIX = ".diff.json"
+
+Point = Tuple[str, int]
+
+
+def parse_pkh_peers(data) -> Dict[str, List[str]]:
+    """
+    Map each attester to the DAL peers subscribed to its topics.
+
+    Accepts both {"pkh": ..., "peers": [...]} objects and [pkh, peers] pairs.
+    """
+    peers_by_pkh: Dict[str, List[str]] = {}
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict):
+            pkh, peers = item.get("pkh"), item.get("peers")
+        elif isinstance(item, list) and len(item) == 2:
+            pkh, peers = item
+        else:
+            continue
+        if isinstance(pkh, str):
+            peers_by_pkh.setdefault(pkh, []).extend(peer for peer in peers or [] if isinstance(peer, str))
+    return peers_by_pkh
+
+
+def parse_peers_info(data) -> Dict[str, Tuple[Optional[Point], bool]]:
+    """
+    Get the advertised point of every peer, and whether it is connected to the bootstrap node.
+
+    Accepts both {"peer": ..., "info": {...}} objects and [peer, info] pairs.
+    """
+    peers: Dict[str, Tuple[Optional[Point], bool]] = {}
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict):
+            peer, info = item.get("peer"), item.get("info")
+        elif isinstance(item, list) and len(item) == 2:
+            peer, info = item
+        else:
+            continue
+        if not isinstance(peer, str) or not isinstance(info, dict):
+            continue
+        point = None
+        reachable_at = info.get("reachable_at")
+        if isinstance(reachable_at, dict) and reachable_at.get("addr") and reachable_at.get("port"):
+            addr = str(reachable_at["addr"])
+            # IPv4 peers are reported as IPv4-mapped IPv6 addresses
+            if addr.startswith("::ffff:"):
+                addr = addr[len("::ffff:"):]
+            point = (addr, int(reachable_at["port"]))
+        peers[peer] = (point, info.get("state") == "running")
+    return peers
+
+
+async def probe_point(point: Point, timeout: float) -> bool:
+    """Whether a DAL node accepts a TCP connection on its P2P point within timeout seconds"""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(*point), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await asyncio.wait_for(writer.wait_closed(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        pass
+    return True
+
+
+class DALNodeChecker:
+    """
+    Reachability of every baker's DAL node.
+
+    The bootstrap node tells which peers subscribe to each attester's
+    topics and where they can be reached. Every advertised point is then
+    probed concurrently by a bounded pool of workers with a per-probe
+    timeout; a baker is online when one of its peers is connected to the
+    bootstrap node or answers the probe. The pool grows when needed so that
+    a sweep fits in its time budget even when every probe times out.
+    """
+
+    def __init__(self, bootstrap_url: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+                 sweep_budget: float = DEFAULT_UPDATE_INTERVAL * SWEEP_BUDGET_RATIO):
+        """
+        Initialize the checker.
+
+        Args:
+            bootstrap_url: RPC base URL of the bootstrap DAL node
+            concurrency: Minimum number of probes running at once
+            probe_timeout: Seconds before a probe counts as failed
+            sweep_budget: Seconds a whole sweep may take
+        """
+        self.bootstrap_url = bootstrap_url.rstrip("/")
+        self.concurrency = concurrency
+        self.probe_timeout = probe_timeout
+        self.sweep_budget = sweep_budget
+
+    async def _get(self, client: httpx.AsyncClient, path: str):
+        response = await client.get(f"{self.bootstrap_url}{path}")
+        response.raise_for_status()
+        return response.json()
+
+    def workers_for(self, probes: int, budget: float) -> int:
+        """Workers needed for a number of probes to finish within budget seconds, even if all of them time out"""
+        # One round of probes is kept as a margin for the slowest worker
+        rounds = max(1, math.floor(budget / self.probe_timeout) - 1)
+        return max(1, min(max(self.concurrency, math.ceil(probes / rounds)), MAX_WORKERS, probes))
+
+    async def probe_all(self, points: Iterable[Point], deadline: float) -> Set[Point]:
+        """
+        Probe points on a bounded worker pool until the deadline.
+
+        Returns:
+            Points that accepted a connection; points left unprobed at the deadline count as unreachable
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for point in points:
+            queue.put_nowait(point)
+        reachable: Set[Point] = set()
+        if queue.empty():
+            return reachable
+
+        async def work():
+            while not queue.empty():
+                point = queue.get_nowait()
+                if await probe_point(point, self.probe_timeout):
+                    reachable.add(point)
+
+        budget = max(0.0, deadline - time.monotonic())
+        workers = [asyncio.create_task(work()) for _ in range(self.workers_for(queue.qsize(), budget))]
+        _, pending = await asyncio.wait(workers, timeout=budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Sweep budget exhausted, {queue.qsize()} point(s) left unprobed")
+        await asyncio.gather(*pending, return_exceptions=True)
+        return reachable
+
+    async def sweep(self, bakers: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Check the DAL node of every baker.
+
+        Args:
+            bakers: Addresses of the active bakers
+
+        Returns:
+            Status record (online, peers, last_checked) keyed by baker address
+        """
+        deadline = time.monotonic() + self.sweep_budget
+        async with httpx.AsyncClient(timeout=max(self.probe_timeout, 10.0)) as client:
+            pkh_peers, peers_info = await asyncio.gather(self._get(client, PKH_PEERS_PATH),
+                                                         self._get(client, PEERS_INFO_PATH))
+        peers_by_baker = parse_pkh_peers(pkh_peers)
+        peers = parse_peers_info(peers_info)
+
+        bakers = list(dict.fromkeys(bakers))
+        points = {peers[peer][0] for baker in bakers for peer in peers_by_baker.get(baker, [])
+                  if peer in peers and peers[peer][0] is not None}
+        logger.info(f"Probing {len(points)} DAL node point(s) of {len(bakers)} bakers")
+        reachable = await self.probe_all(points, deadline)
+
+        checked_at = datetime.now().isoformat()
+        status = {}
+        for baker in bakers:
+            baker_peers = [peers.get(peer, (None, False)) for peer in peers_by_baker.get(baker, [])]
+            status[baker] = {
+                "online": any(connected or point in reachable for point, connected in baker_peers),
+                "peers": len(baker_peers),
+                "last_checked": checked_at,
+            }
+        return status
+
+
+def record_changed(previous: Dict, current: Dict) -> bool:
+    """Whether a baker's record changed in anything but last_checked, which restore rebuilds"""
+    return {**previous, "last_checked": None} != {**current, "last_checked": None}
+
+
+class StatusBackups:
+    """
+    Diff-based backups of dal_status.json.
+
+    A full copy (dal_status_<time>.full.json) is written every full_every
+    backups; the ones in between only hold the bakers whose record changed
+    since the previous backup (dal_status_<time>.diff.json). Backups older
+    than the retention period are deleted, except the full copy the
+    remaining diffs build on. Files not following this naming, such as
+    backups from earlier versions, are never read nor deleted.
+    """
+
+    def __init__(self, backup_dir: Path, retention_days: float = DEFAULT_RETENTION_DAYS,
+                 full_every: int = DEFAULT_FULL_BACKUP_EVERY):
+        self.backup_dir = Path(backup_dir)
+        self.retention = timedelta(days=retention_days)
+        self.full_every = full_every
+
+    def entries(self) -> List[Tuple[datetime, Path, bool]]:
+        """Backups as (time, path, is_full), oldest first"""
+        entries = []
+        for path in self.backup_dir.glob(f"{BACKUP_PREFIX}*.json"):
+            stem = path.name[len(BACKUP_PREFIX):]
+            is_full = stem.endswith(FULL_SUFFIX)
+            if not is_full and not stem.endswith(DIFF_SUFFIX):
+                continue
+            stem = stem[:-len(FULL_SUFFIX if is_full else DIFF_SUFFIX)]
+            try:
+                entries.append((datetime.strptime(stem, BACKUP_TIME_FORMAT), path, is_full))
+            except ValueError:
+                continue
+        return sorted(entries)
+
+    def restore(self, until: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Rebuild the status as of a backup.
+
+        Args:
+            until: Time of the last backup to apply (default: latest)
+
+        Returns:
+            dal_status.json content, None without a full backup to start from
+        """
+        entries = [entry for entry in self.entries() if until is None or entry[0] <= until]
+        fulls = [i for i, (_, _, is_full) in enumerate(entries) if is_full]
+        if not fulls:
+            return None
+        with open(entries[fulls[-1]][1], 'r') as f:
+            state = json.load(f)
+        for _, path, _ in entries[fulls[-1] + 1:]:
+            with open(path, 'r') as f:
+                diff = json.load(f)
+            # Every sweep checks every baker, so unchanged bakers were checked at the diff's time
+            data = {address: {**record, "last_checked": diff["timestamp"]}
+                    for address, record in state["data"].items() if address not in diff["removed"]}
+            data.update(diff["changed"])
+            state = {"timestamp": diff["timestamp"], "data": data}
+        return state
+
+    def save(self, status: Dict, now: Optional[datetime] = None) -> Path:
+        """
+        Back up a new status, as a diff of the previous backup when possible, then rotate.
+
+        Returns:
+            Path of the written backup
+        """
+        now = now or datetime.now()
+        entries = self.entries()
+        fulls = [i for i, (_, _, is_full) in enumerate(entries) if is_full]
+        diffs_since_full = len(entries) - 1 - fulls[-1] if fulls else None
+        base = self.restore() if diffs_since_full is not None and diffs_since_full + 1 < self.full_every else None
+        name = f"{BACKUP_PREFIX}{now.strftime(BACKUP_TIME_FORMAT)}"
+        if base is None:
+            path = self.backup_dir / f"{name}{FULL_SUFFIX}"
+            write_json_atomic(path, status)
+        else:
+            previous = base["data"]
+            path = self.backup_dir / f"{name}{DIFF_SUFFIX}"
+            write_json_atomic(path, {
+                "timestamp": status["timestamp"],
+                "changed": {address: record for address, record in status["data"].items()
+                            if address not in previous or record_changed(previous[address], record)},
+                "removed": [address for address in previous if address not in status["data"]],
+            })
+        self.rotate(now)
+        return path
+
+    def rotate(self, now: Optional[datetime] = None) -> List[Path]:
+        """
+        Delete the backups older than the retention period.
+
+        Returns:
+            Deleted backups
+        """
+        cutoff = (now or datetime.now()) - self.retention
+        entries = self.entries()
+        first_kept = next((i for i, entry in enumerate(entries) if entry[0] >= cutoff), len(entries))
+        # Keep the chain the first kept diff depends on
+        while 0 < first_kept < len(entries) and not entries[first_kept][2]:
+            first_kept -= 1
+        removed = [path for _, path, _ in entries[:first_kept]]
+        for path in removed:
+            path.unlink(missing_ok=True)
+        if removed:
+            logger.info(f"Removed {len(removed)} backup(s) older than {cutoff.isoformat()}")
+        return removed
+
+
+async def active_bakers(calculator: DALCalculator) -> List[str]:
+    """Addresses of the active delegates"""
+    return [delegate['address'] async for delegate in calculator.iter_delegates()]
+
+
+async def run_check(checker: DALNodeChecker, calculator: DALCalculator, status_file: Path,
+                    backups: StatusBackups) -> Dict:
+    """Sweep every baker, then write dal_status.json and its backup"""
+    started = time.perf_counter()
+    calculator.reset_delegates()
+    bakers = await active_bakers(calculator)
+    if not bakers:
+        raise RuntimeError("Failed to fetch delegates data")
+    status = {"timestamp": datetime.now().isoformat(), "data": await checker.sweep(bakers)}
+    await asyncio.to_thread(write_json_atomic, status_file, status)
+    backup = await asyncio.to_thread(backups.save, status)
+    online = sum(record["online"] for record in status["data"].values())
+    logger.info(f"{online}/{len(bakers)} DAL nodes online, checked in {time.perf_counter() - started:.1f}s "
+                f"(backup: {backup.name})")
+    return status
+
+
+def load_checker_config(config_file: Path) -> Dict:
+    """
+    Load the dal and output sections of the configuration.
+
+    Falls back to config.example.json when config_file does not exist. Output
+    paths are relative to the configuration directory.
+    """
+    for candidate in (config_file, CONFIG_DIR / "config.example.json"):
+        if candidate.exists():
+            with open(candidate, 'r') as f:
+                config = json.load(f)
+            break
+    else:
+        raise FileNotFoundError(f"No configuration file found at {config_file}")
+    output = config.get("output", {})
+    base_dir = candidate.resolve().parent
+    return {
+        "dal": config.get("dal", {}),
+        "network": config.get("tezos", {}).get("network", "mainnet"),
+        "networks": config.get("networks", {}),
+        "json_path": base_dir / output.get("json_path", "../data/dal_status.json"),
+        "backup_path": base_dir / output.get("backup_path", "../data/backups"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the reachability of every baker\'s DAL node')
+    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG_PATH),
+                        help='Configuration file with the dal and output sections')
+    parser.add_argument('--once', action='store_true', help='Run a single sweep and exit')
+    parser.add_argument('--restore', action='store_true',
+                        help='Rebuild dal_status.json from the backups instead of checking')
+    parser.add_argument('--until', type=str, help=f'With --restore, time of the last backup to apply '
+                                                  f'({BACKUP_TIME_FORMAT.replace("%", "")})')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    config = load_checker_config(Path(args.config))
+    dal = config["dal"]
+    update_interval = float(dal.get("update_interval", DEFAULT_UPDATE_INTERVAL))
+    backups = StatusBackups(config["backup_path"], dal.get("backup_retention_days", DEFAULT_RETENTION_DAYS),
+                            dal.get("full_backup_every", DEFAULT_FULL_BACKUP_EVERY))
+
+    if args.restore:
+        status = backups.restore(datetime.strptime(args.until, BACKUP_TIME_FORMAT) if args.until else None)
+        if status is None:
+            logger.error(f"No full backup in {config['backup_path']}")
+            sys.exit(1)
+        write_json_atomic(config["json_path"], status)
+        logger.info(f"Restored the status of {status['timestamp']} to {config['json_path']}")
+        return
+
+    if not dal.get("bootstrap_url"):
+        logger.error("No dal.bootstrap_url in the configuration")
+        sys.exit(1)
+    network = config["network"]
+    settings = config["networks"].get(network, {})
+    calculator = DALCalculator(network=network, api_url=settings.get("api_url"), rpc_url=settings.get("rpc_url"))
+    checker = DALNodeChecker(
+        dal["bootstrap_url"],
+        concurrency=int(dal.get("concurrency", DEFAULT_CONCURRENCY)),
+        probe_timeout=float(dal.get("probe_timeout", DEFAULT_PROBE_TIMEOUT)),
+        sweep_budget=update_interval * SWEEP_BUDGET_RATIO,
+    )
+
+    async def run_forever() -> bool:
+        while True:
+            started = time.monotonic()
+            try:
+                await run_check(checker, calculator, config["json_path"], backups)
+                succeeded = True
+            except Exception as e:
+                logger.error(f"DAL node check failed: {e}")
+                succeeded = False
+            if args.once:
+                return succeeded
+            await asyncio.sleep(max(0.0, update_interval - (time.monotonic() - started)))
+
+    try:
+        if not asyncio.run(run_forever()):
+            sys.exit(1)
+    except KeyboardInterrupt:
+        logger.info("DAL node checker stopped")
+    finally:
+        calculator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fetch_engine import FetchEngine
+
+logger = logging.getLogger(__name__)
+
+
+def sample_levels(first_level: int, last_level: int, samples: int = 1) -> List[int]:
+    """
+    Pick the levels at which dal_participation is read for a cycle.
+
+    The counters accumulate over the cycle and reset at its last block, so
+    the before-last level comes first. Further samples are spread evenly
+    towards the start of the cycle.
+
+    Args:
+        first_level: First level of the cycle
+        last_level: Last level of the cycle
+        samples: Number of levels to return
+
+    Returns:
+        Distinct levels, latest first
+    """
+    check_level = last_level - 1
+    if samples <= 1 or check_level <= first_level:
+        return [check_level]
+    step = (check_level - first_level) / samples
+    levels = []
+    for i in range(samples):
+        level = check_level - round(i * step)
+        if level not in levels:
+            levels.append(level)
+    return levels
+
+
+class DALParticipationResolver:
+    """
+    Resolves delegate_attested_dal_slots for many bakers at once.
+
+    Lookups run on the fetch engine's worker pool and keep-alive session.
+    Concurrent lookups of the same (level, baker) share a single request.
+    """
+
+    def __init__(self, rpc_url: str, fetch_json: Callable[[str], Optional[dict]], engine: FetchEngine):
+        """
+        Initialize the resolver.
+
+        Args:
+            rpc_url: Tezos RPC base URL
+            fetch_json: Cached, rate-limited fetch returning None on any failure
+            engine: Fetch engine whose worker pool runs the lookups
+        """
+        self.rpc_url = rpc_url
+        self._fetch_json = fetch_json
+        self._engine = engine
+        self._in_flight: Dict[Tuple[int, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def url(self, address: str, level: int) -> str:
+        return f"{self.rpc_url}/chains/main/blocks/{level}/context/delegates/{address}/dal_participation"
+
+    def lookup(self, address: str, level: int) -> Optional[int]:
+        """
+        Get the number of DAL slots a baker attested up to a level (blocking).
+
+        Returns:
+            Number of attested slots, None if it cannot be determined
+        """
+        key = (level, address)
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        if not owner:
+            return future.result()
+
+        slots = None
+        try:
+            data = self._fetch_json(self.url(address, level))
+            if data is not None:
+                slots = int(data.get('delegate_attested_dal_slots', 0))
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.debug(f"Unexpected dal_participation for {address} at level {level}: {e}")
+        finally:
+            future.set_result(slots)
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return slots
+
+    async def resolve(self, addresses: Iterable[str], level: int) -> Dict[str, Optional[int]]:
+        """
+        Look up many bakers at one level.
+
+        Returns:
+            Attested slot count keyed by address, None where it cannot be determined
+        """
+        results = {}
+        async for address, slots in self._engine.map_unordered(
+                lambda address: (address, self.lookup(address, level)), addresses):
+            results[address] = slots
+        return results
+
+    async def resolve_sampled(self, addresses: Iterable[str], levels: List[int]) -> Dict[str, Optional[int]]:
+        """
+        Look up many bakers, falling back to earlier levels for the unresolved ones.
+
+        Each level is only queried for the bakers still unresolved after the
+        previous ones, so extra samples cost nothing for bakers answered at
+        the first level.
+
+        Args:
+            addresses: Bakers to resolve
+            levels: Levels to try, latest first (see sample_levels)
+
+        Returns:
+            Attested slot count keyed by address, None where no level answered
+        """
+        results: Dict[str, Optional[int]] = {address: None for address in addresses}
+        remaining = list(results)
+        for level in levels:
+            if not remaining:
+                break
+            found = await self.resolve(remaining, level)
+            for address, slots in found.items():
+                if slots is not None:
+                    results[address] = slots
+            remaining = [address for address in remaining if results[address] is None]
+        return results
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+
+import time
+import random
+import asyncio
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Union
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Requests per second allowed per host when nothing else is configured
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MAX_ATTEMPTS = 4
+
+# Statuses meaning "slow down / try again later". A plain 500 is not retried:
+# the RPC answers it for delegates it cannot report on.
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """Wrap a plain iterable into an asynchronous one"""
+    for item in items:
+        yield item
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the request rate to a single host"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: one second worth of tokens)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        """Hand out no token for the next seconds (e.g. on a Retry-After header)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until one is available.
+
+        Returns:
+            Number of seconds spent waiting for the token
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._tokens = 0
+                    self._updated = self._paused_until
+                    delay = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """One token bucket per upstream host (e.g. api.tzkt.io vs rpc.tzkt.io)"""
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None,
+                 default_rate: float = DEFAULT_RATE_LIMIT):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate_limits: Requests per second keyed by host name
+            default_rate: Rate used for hosts missing from rate_limits
+        """
+        self.default_rate = default_rate
+        self._buckets = {host: TokenBucket(rate) for host, rate in (rate_limits or {}).items()}
+        self._lock = threading.Lock()
+
+    def ensure_rate(self, host: str, rate: float):
+        """Give host its own bucket unless it already has one (the first configured rate wins)"""
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(rate)
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the bucket of the host serving url, creating it if needed"""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.default_rate)
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """
+        Wait until a request to url is allowed.
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        return self.bucket_for(url).acquire()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After"""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = 0.5,
+                 max_delay: float = 30.0):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total number of attempts per request, including the first one
+            base_delay: Backoff ceiling of the first retry, doubled on each attempt
+            max_delay: Upper bound on any delay
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retrying after the given (1-based) failed attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def retry_after(self, response: Optional[requests.Response]) -> Optional[float]:
+        """Delay requested by the server through Retry-After, if any"""
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(self.max_delay, max(0.0, delay))
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of requests in flight.
+
+    Every healthy response widens the limit by 1/limit (about one slot per
+    round of requests), every 429/5xx or timeout halves it, at most once per
+    cooldown so a burst of failures counts as one overload signal.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_factor: float = 0.5,
+                 cooldown: float = 1.0):
+        """
+        Initialize the controller.
+
+        Args:
+            max_limit: Upper bound on the limit (the worker pool size)
+            min_limit: Lower bound on the limit
+            decrease_factor: Factor applied to the limit on overload
+            cooldown: Minimum number of seconds between two decreases
+        """
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(max(self.min_limit, max_limit // 2))
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one in-flight slot, blocking while the limit is reached"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def on_overload(self) -> bool:
+        """
+        Shrink the limit after a throttled or failed request.
+
+        Returns:
+            True if the limit was decreased
+        """
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return False
+            self._last_decrease = now
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+            return True
+
+
+class FetchEngine:
+    """
+    Bounded-concurrency fetch engine shared by DALCalculator.
+
+    Blocking HTTP calls run on a fixed-size worker pool driven from asyncio,
+    so the pool size is a global cap on in-flight requests no matter how many
+    event loops or cycles are using the engine. Every request first takes a
+    token from the bucket of its host, then a slot from the adaptive
+    concurrency limit. Throttled, unavailable and timed-out requests are
+    retried with backoff.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 default_rate: float = DEFAULT_RATE_LIMIT,
+                 metrics: Optional[MetricsRegistry] = None,
+                 retry: Optional[RetryPolicy] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            rate_limits: Requests per second keyed by host name
+            default_rate: Rate used for hosts missing from rate_limits
+            metrics: Registry receiving rate-limit waits, retries and concurrency changes
+            retry: Retry policy (default: RetryPolicy())
+        """
+        self.max_concurrency = max_concurrency
+        self.metrics = metrics
+        self.retry = retry or RetryPolicy()
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.limiter = HostRateLimiter(rate_limits, default_rate)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="dal-fetch")
+
+    def get(self, url: str, timeout: float = 10) -> requests.Response:
+        """
+        Rate-limited GET on the shared session, retried on 429/5xx and timeouts.
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+
+        Returns:
+            The HTTP response, possibly a failed one once attempts are exhausted
+
+        Raises:
+            requests.RequestException: The last connection error or timeout
+        """
+        host = urlparse(url).netloc
+        for attempt in range(1, self.retry.max_attempts + 1):
+            waited = self.limiter.acquire(url)
+            if self.metrics is not None:
+                self.metrics.inc("rate_limit_wait_seconds_total", waited, host=host)
+
+            response, error = None, None
+            with self.concurrency.slot():
+                try:
+                    response = self.session.get(url, timeout=timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                self.concurrency.on_success()
+                return response
+
+            if self.concurrency.on_overload() and self.metrics is not None:
+                self.metrics.inc("concurrency_decreases_total", host=host)
+            if attempt == self.retry.max_attempts:
+                if error is not None:
+                    raise error
+                return response
+
+            reason = type(error).__name__ if error is not None else str(response.status_code)
+            if self.metrics is not None:
+                self.metrics.inc("upstream_retries_total", host=host, reason=reason)
+            delay = self.retry.retry_after(response)
+            if delay is not None:
+                # Pause the whole host, the next acquire() waits it out
+                logger.debug(f"Retrying {url} after {reason}, host paused for {delay:.2f}s (attempt {attempt})")
+                self.limiter.bucket_for(url).pause(delay)
+            else:
+                delay = self.retry.backoff(attempt)
+                logger.debug(f"Retrying {url} in {delay:.2f}s after {reason} (attempt {attempt})")
+                time.sleep(delay)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on the worker pool and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def map_unordered(self, func: Callable[[Any], Any],
+                            items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Apply func to every item on the worker pool.
+
+        Items are submitted as they are produced, with at most twice the pool
+        size waiting at once, so a slow (e.g. paginated) source is consumed
+        while earlier items are still being processed.
+
+        Args:
+            func: Blocking function taking one item
+            items: Items to process, synchronous or asynchronous iterable
+
+        Yields:
+            Results in completion order
+        """
+        loop = asyncio.get_running_loop()
+        window = 2 * self.max_concurrency
+        pending = set()
+
+        if not hasattr(items, "__aiter__"):
+            items = _aiter(items)
+        async for item in items:
+            pending.add(loop.run_in_executor(self._executor, func, item))
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def close(self):
+        """Release the worker pool and pooled connections"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
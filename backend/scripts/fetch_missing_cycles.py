@@ -1,68 +1,199 @@
 #!/usr/bin/env python3
 
 import sys
-import subprocess
+import json
+import asyncio
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Add the scripts directory to the path to import dal_calculation
 sys.path.insert(0, str(Path(__file__).parent))
 
-from dal_calculation import DALCalculator, save_results_and_update_history
+from dal_calculation import (DALCalculator, DEFAULT_CONFIG_PATH, configure_logging, export_histories,
+                             load_network_config, network_files, stats_to_dict, load_history, update_history)
+from fetch_engine import DEFAULT_RATE_LIMIT
+from history_store import write_json_atomic
+from response_cache import ResponseCache
+from baker_store import BakerStore
+from baker_archive import BakerArchive, DEFAULT_ARCHIVE_DIR
 
-def fetch_missing_cycles(start_cycle: int, end_cycle: int, output_dir: str = None):
+CHECKPOINT_NAME = ".backfill_checkpoint.json"
+
+def checkpoint_path(data_dir: Path, network: str) -> Path:
+    """Checkpoint of a network's backfill, suffixed like network_files for networks other than mainnet"""
+    if network == "mainnet":
+        return data_dir / CHECKPOINT_NAME
+    return data_dir / f".backfill_checkpoint_{network}.json"
+
+def load_checkpoint(checkpoint_file: Path) -> Dict[int, Dict]:
+    """Load results computed by a previous, interrupted backfill"""
+    if not checkpoint_file.exists():
+        return {}
+    try:
+        with open(checkpoint_file, 'r') as f:
+            return {int(cycle): results for cycle, results in json.load(f).items()}
+    except (json.JSONDecodeError, ValueError):
+        print(f"⚠️  Checkpoint {checkpoint_file} illisible, ignoré")
+        return {}
+
+def write_checkpoint(checkpoint_file: Path, pending: Dict[int, Dict]):
+    """Atomically persist results that are not yet in the history file"""
+    write_json_atomic(checkpoint_file, {str(cycle): results for cycle, results in pending.items()}, indent=None)
+
+def flush_results(pending: Dict[int, Dict], results_file: Path, history_file: Path, checkpoint_file: Path):
+    """
+    Append pending cycle results to the history log.
+
+    dal_stats.json is only replaced when the newest pending cycle is more
+    recent than the one it already holds.
+    """
+    if not pending:
+        return
+    update_history(history_file, list(pending.values()))
+
+    latest = pending[max(pending)]
+    current_cycle = -1
+    if results_file.exists():
+        try:
+            with open(results_file, 'r') as f:
+                current_cycle = json.load(f).get("cycle", -1)
+        except json.JSONDecodeError:
+            pass
+    if latest["cycle"] >= current_cycle:
+        write_json_atomic(results_file, latest)
+
+    print(f"💾 Historique mis à jour avec {len(pending)} cycle(s)")
+    pending.clear()
+    checkpoint_file.unlink(missing_ok=True)
+
+async def backfill(calculator: DALCalculator, cycles: List[int], parallel: int, on_done):
+    """
+    Compute several cycles at once on the calculator's shared fetch engine.
+
+    Args:
+        calculator: Calculator whose connection pool and rate limiter are shared by all cycles
+        cycles: Cycles to compute
+        parallel: Maximum number of cycles in progress at the same time
+        on_done: Callback receiving each finished DALStats
+    """
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def run_cycle(cycle: int):
+        async with semaphore:
+            try:
+                print(f"Traitement du cycle {cycle}...")
+                stats = await calculator.calculate_stats_async(verbose=True, cycle=cycle)
+            except Exception as e:
+                print(f"❌ Erreur lors du calcul du cycle {cycle}: {e}")
+                return
+            on_done(stats)
+            print(f"✅ Cycle {cycle} terminé")
+
+    await asyncio.gather(*(run_cycle(cycle) for cycle in cycles))
+
+def fetch_missing_cycles(start_cycle: int, end_cycle: int, output_dir: str = None,
+                         parallel: int = 4, batch_size: int = 10, force: bool = False,
+                         calculator: Optional[DALCalculator] = None, network: str = "mainnet",
+                         config_file: Path = DEFAULT_CONFIG_PATH):
     """
     Fetch statistics for multiple cycles.
-    
+
     Args:
         start_cycle: First cycle to fetch (inclusive)
         end_cycle: Last cycle to fetch (inclusive)
         output_dir: Output directory for data files
+        parallel: Number of cycles computed concurrently
+        batch_size: Number of finished cycles written to the history at once
+        force: Recompute cycles already present in the history
+        calculator: Calculator to use (default: one for the network with the persistent cache and baker store)
+        network: Network whose results and history files are updated
+        config_file: Configuration with the network's endpoints and rate limits
     """
     # Initialize paths
     if output_dir:
         data_dir = Path(output_dir)
     else:
         data_dir = Path("/opt/dal_dashboard/backend/data")
-    
-    results_file = data_dir / "dal_stats.json"
-    history_file = data_dir / "dal_stats_history.json"
-    
-    # Initialize the calculator
-    calculator = DALCalculator(network="mainnet")
-    
-    print(f"Récupération des cycles {start_cycle} à {end_cycle}...")
-    
-    for cycle in range(start_cycle, end_cycle + 1):
-        try:
-            print(f"\n{'='*60}")
-            print(f"Traitement du cycle {cycle}...")
-            print(f"{'='*60}")
-            
-            # Calculate stats for this cycle
-            stats = calculator.calculate_stats(verbose=True, cycle=cycle)
-            
-            # Save results and update history
-            save_results_and_update_history(stats, results_file, history_file)
-            
-            print(f"✅ Cycle {cycle} terminé et sauvegardé")
-            
-        except Exception as e:
-            print(f"❌ Erreur lors du calcul du cycle {cycle}: {e}")
-            continue
-    
+
+    results_file, history_file = network_files(data_dir, network)
+    checkpoint_file = checkpoint_path(data_dir, network)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    # Results of an interrupted run are flushed before anything else
+    pending = load_checkpoint(checkpoint_file)
+    if pending:
+        print(f"Reprise : {len(pending)} cycle(s) de {network} récupéré(s) depuis le checkpoint")
+        flush_results(pending, results_file, history_file, checkpoint_file)
+
+    cycles = list(range(start_cycle, end_cycle + 1))
+    if not force:
+        known = {entry.get("cycle") for entry in load_history(history_file)}
+        skipped = [cycle for cycle in cycles if cycle in known]
+        cycles = [cycle for cycle in cycles if cycle not in known]
+        if skipped:
+            print(f"{len(skipped)} cycle(s) déjà présent(s) dans l'historique, ignoré(s)")
+
+    print(f"Récupération des cycles {start_cycle} à {end_cycle} de {network} "
+          f"({len(cycles)} à calculer, {parallel} en parallèle)...")
+    if not cycles:
+        return
+
+    # Initialize the calculator; finalized cycles are served from the persistent cache on re-runs
+    # and bakers already classified by an earlier run are not queried again
+    owned = calculator is None
+    if owned:
+        settings = load_network_config(Path(config_file)).get(network, {})
+        calculator = DALCalculator(network=network, api_url=settings.get("api_url"), rpc_url=settings.get("rpc_url"),
+                                   api_rate=settings.get("api_rate", DEFAULT_RATE_LIMIT),
+                                   rpc_rate=settings.get("rpc_rate", DEFAULT_RATE_LIMIT),
+                                   response_cache=ResponseCache(), baker_store=BakerStore(),
+                                   archive=BakerArchive(DEFAULT_ARCHIVE_DIR / network))
+
+    def on_done(stats):
+        pending[stats.cycle] = stats_to_dict(stats)
+        write_checkpoint(checkpoint_file, pending)
+        if len(pending) >= batch_size:
+            flush_results(pending, results_file, history_file, checkpoint_file)
+
+    try:
+        asyncio.run(backfill(calculator, cycles, parallel, on_done))
+    finally:
+        flush_results(pending, results_file, history_file, checkpoint_file)
+        export_histories()
+        if owned:
+            calculator.close()
+
     print(f"\n{'='*60}")
-    print(f"Récupération terminée ! Cycles {start_cycle} à {end_cycle} traités.")
+    print(f"Récupération terminée ! Cycles {start_cycle} à {end_cycle} de {network} traités.")
     print(f"{'='*60}")
 
 if __name__ == "__main__":
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Récupérer les cycles manquants')
     parser.add_argument('--start', type=int, required=True, help='Premier cycle à récupérer')
     parser.add_argument('--end', type=int, required=True, help='Dernier cycle à récupérer')
     parser.add_argument('--output-dir', type=str, help='Répertoire de sortie pour les fichiers de données')
-    
+    parser.add_argument('--parallel', type=int, default=4, help='Nombre de cycles calculés en parallèle (défaut : 4)')
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help="Nombre de cycles écrits dans l'historique à la fois (défaut : 10)")
+    parser.add_argument('--force', action='store_true', help="Recalculer les cycles déjà présents dans l'historique")
+    parser.add_argument('--networks', type=str,
+                        help='Réseaux à compléter, séparés par des virgules (défaut : ceux de la configuration)')
+    parser.add_argument('--config', type=str, default=str(DEFAULT_CONFIG_PATH),
+                        help='Fichier de configuration avec les points d\'accès et limites de débit par réseau')
+
     args = parser.parse_args()
-    
-    fetch_missing_cycles(args.start, args.end, args.output_dir)
+    configure_logging()
+
+    if args.networks:
+        networks = [network.strip() for network in args.networks.split(",") if network.strip()]
+    else:
+        networks = list(load_network_config(Path(args.config))) or ["mainnet"]
+
+    # The same cycle range is fetched for each network, one network after the other
+    for network in networks:
+        fetch_missing_cycles(args.start, args.end, args.output_dir,
+                             parallel=args.parallel, batch_size=args.batch_size, force=args.force,
+                             network=network, config_file=Path(args.config))
 
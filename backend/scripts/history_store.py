@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields of a dal_stats.json result kept in the history
+HISTORY_FIELDS = (
+    "timestamp",
+    "cycle",
+    "dal_active_bakers",
+    "dal_baking_power_percentage",
+    "dal_participation_percentage",
+    "dal_adoption_percentage",
+)
+
+# The log is compacted once it holds this many times more lines than cycles
+COMPACTION_RATIO = 2
+
+
+def write_json_atomic(path: Path, data, indent: Optional[int] = 2):
+    """
+    Write a JSON file through a temporary file and a rename, so readers never
+    see a partially written file.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable content
+        indent: Indentation passed to json.dump
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f".{path.name}.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class HistoryStore:
+    """
+    Per-cycle DAL history backed by an append-only JSONL log.
+
+    An update only appends the changed cycles to dal_stats_history.jsonl, so
+    its cost does not depend on the size of the history. export() writes
+    dal_stats_history.json (one entry per cycle, newest first) for GitHub
+    Pages and is meant to run once per run, after every update. A marker
+    file is created before appending and removed by the export, so cycles
+    appended by a run that crashed before exporting are exported by the next
+    one. When the exported JSON is newer than the log, e.g. after a git pull,
+    it is folded back into the log first.
+    """
+
+    def __init__(self, history_file: Path):
+        """
+        Open the store, creating the log from the JSON history if needed.
+
+        Args:
+            history_file: Path of dal_stats_history.json
+        """
+        self.history_file = Path(history_file)
+        self.log_file = self.history_file.with_suffix(".jsonl")
+        # Present while the log holds cycles that are not exported yet
+        self.unexported_marker = self.log_file.with_name(f".{self.log_file.name}.unexported")
+        self._log_lines = 0
+        self.records: Dict[int, Dict] = self._replay_log()
+        self.sync()
+
+    def sync(self):
+        """Fold the exported JSON back into the log if it was replaced since the last export"""
+        if not self._json_is_newer():
+            return
+        published = self._read_json()
+        if published:
+            for entry in published:
+                self.records[entry["cycle"]] = entry
+            self.compact()
+
+    def _json_is_newer(self) -> bool:
+        if not self.history_file.exists():
+            return False
+        if not self.log_file.exists():
+            return True
+        return self.history_file.stat().st_mtime > self.log_file.stat().st_mtime
+
+    def _read_json(self) -> List[Dict]:
+        try:
+            with open(self.history_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.error(f"Error reading history file {self.history_file}, ignoring it.")
+            return []
+
+    def _replay_log(self) -> Dict[int, Dict]:
+        records = {}
+        if not self.log_file.exists():
+            return records
+        with open(self.log_file, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last line can be torn by a crash during an append
+                    logger.warning(f"Skipping truncated line in {self.log_file}")
+                    continue
+                records[record["cycle"]] = record
+                self._log_lines += 1
+        return records
+
+    def _append(self, records: Iterable[Dict]):
+        lines = [json.dumps(record, separators=(",", ":")) + "\n" for record in records]
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, 'a') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_lines += len(lines)
+
+    def compact(self):
+        """Rewrite the log with a single line per cycle"""
+        tmp_file = self.log_file.with_name(f".{self.log_file.name}.tmp")
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            for cycle in sorted(self.records):
+                f.write(json.dumps(self.records[cycle], separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.log_file)
+        self._log_lines = len(self.records)
+
+    def cycles(self) -> List[int]:
+        """Cycles present in the history, in ascending order"""
+        return sorted(self.records)
+
+    def entries(self) -> List[Dict]:
+        """History entries sorted by cycle (descending)"""
+        return [self.records[cycle] for cycle in sorted(self.records, reverse=True)]
+
+    def update(self, results_list: List[Dict]) -> List[Dict]:
+        """
+        Merge cycle results into the history, appending the changed cycles to the log.
+
+        Args:
+            results_list: Cycle results as produced by stats_to_dict
+
+        Returns:
+            The history records that changed
+        """
+        changed = []
+        for results in results_list:
+            cycle = results["cycle"]
+            record = {**self.records.get(cycle, {}), **{field: results[field] for field in HISTORY_FIELDS}}
+            if record != self.records.get(cycle):
+                self.records[cycle] = record
+                changed.append(record)
+
+        if changed:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            self.unexported_marker.touch()
+            self._append(changed)
+        return changed
+
+    def export(self):
+        """Compact the log if needed and atomically write dal_stats_history.json, if it changed"""
+        if not self.unexported_marker.exists() and self.history_file.exists():
+            return
+        if self._log_lines > COMPACTION_RATIO * len(self.records):
+            self.compact()
+        write_json_atomic(self.history_file, self.entries(), indent=None)
+        # Keep the log at least as recent as the export it produced
+        if self.log_file.exists():
+            os.utime(self.log_file)
+        self.unexported_marker.unlink(missing_ok=True)
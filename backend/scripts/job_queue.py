@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for the status endpoint
+DEFAULT_MAX_FINISHED = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """One background job and its outcome"""
+    id: str
+    key: str
+    status: str = QUEUED
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Any = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self) -> Dict:
+        """JSON view of the job"""
+        return {
+            "id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobQueue:
+    """
+    Single-flight background job queue running on the event loop.
+
+    Jobs run one at a time on a worker task. Submitting a key that already
+    has a queued or running job returns that job instead of a new one, so
+    concurrent callers asking for the same work share it.
+    """
+
+    def __init__(self, max_finished: int = DEFAULT_MAX_FINISHED):
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+        self._runners: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, key: str, run: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Queue a job unless one with the same key is queued or running.
+
+        Args:
+            key: Identity of the work (e.g. "calculation:mainnet")
+            run: Coroutine function doing the work; its (JSON-serializable) return value becomes the job result
+
+        Returns:
+            The new job, or the active job sharing the key
+        """
+        job = self._active.get(key)
+        if job is not None:
+            return job
+        job = Job(id=uuid.uuid4().hex[:12], key=key, submitted_at=time.time())
+        self.jobs[job.id] = job
+        self._active[key] = job
+        self._runners[job.id] = run
+        self._ensure_worker()
+        self._queue.put_nowait(job)
+        logger.info(f"Queued job {job.id} ({key})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def active(self, key: str) -> Optional[Job]:
+        """Queued or running job of a key, if any"""
+        return self._active.get(key)
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            for job in self._active.values():
+                if job.status == QUEUED:
+                    self._queue.put_nowait(job)
+            self._worker = asyncio.create_task(self._work())
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            run = self._runners.pop(job.id, None)
+            if run is None:
+                continue
+            job.status = RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await run()
+                job.status = DONE
+            except asyncio.CancelledError:
+                job.status = FAILED
+                job.error = "Cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} ({job.key}) failed: {e}")
+                job.status = FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                self._active.pop(job.key, None)
+                self._prune()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    async def aclose(self):
+        """Stop the worker; a running job is cancelled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
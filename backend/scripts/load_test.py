@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+
+"""
+Load-test the API under uvicorn against local stand-ins for GitHub Pages and TzKT.
+
+The Pages stand-in serves dal_stats.json and a synthetic dal_stats_history.json
+of the requested size, with a configurable latency and share of 500 errors.
+The TzKT API and RPC stand-in of benchmark.py answers the calculators behind
+the baker endpoints and calculation jobs. The API is started with
+GITHUB_PAGES_BASE_URL and NETWORK_CONFIG_FILE pointed at them, then concurrent
+clients drive each endpoint in turn. Every scenario reports requests/s,
+p50/p95/p99 latency and upstream amplification (stand-in requests per API
+request) as JSON, and the run exits with status 1 when a threshold or the
+baseline is missed.
+
+    python backend/scripts/load_test.py --history-cycles 1000 10000 100000 --clients 50 --duration 10 \\
+        --thresholds backend/config/load_test_thresholds.json --output load.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from history_store import HISTORY_FIELDS
+from benchmark import MockServer, synthetic_bakers
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_HISTORY_CYCLES = [1000, 10000, 100000]
+DEFAULT_CLIENTS = 50
+DEFAULT_DURATION = 10.0
+GENESIS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Cycles covered by a /api/history?from=&to= request
+RANGE_CYCLES = 30
+
+# Seconds a single API request may take before it counts as an error
+# (50 clients sharing the ~16MB full history of 100k cycles take about 10s each)
+REQUEST_TIMEOUT = 30.0
+
+# Seconds the API is given to start
+STARTUP_TIMEOUT = 60.0
+
+# Seconds uvicorn keeps an idle connection open: longer than the gaps between
+# scenarios, so it never closes a pooled client connection as it is reused
+KEEP_ALIVE_TIMEOUT = 60
+
+# Bakers of the TzKT stand-in, and addresses sent by each POST /api/bakers
+CHAIN_BAKERS = 300
+BAKERS_PER_REQUEST = 50
+
+# Requests per second the API's calculators may send to the TzKT stand-in
+CHAIN_RATE = 10000
+
+# Network the TzKT stand-in does not serve: its statistics never become
+# available, so each request for them queues a calculation job that fails
+# quickly, and /api/jobs/{id} always has a job to report
+JOB_NETWORK = "loadtestnet"
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def stats_filename(network: str) -> str:
+    """Name of a network's results file on GitHub Pages"""
+    return "dal_stats.json" if network == "mainnet" else f"dal_stats_{network}.json"
+
+
+def chain_bakers(count: int) -> List[Dict]:
+    """
+    Bakers of benchmark.synthetic_bakers with addresses the API accepts (tz1 and 33 base58 characters).
+    """
+    bakers = synthetic_bakers(count)
+    for index, baker in enumerate(bakers):
+        digits = ""
+        while True:
+            index, remainder = divmod(index, len(BASE58_ALPHABET))
+            digits = BASE58_ALPHABET[remainder] + digits
+            if not index:
+                break
+        baker["address"] = "tz1" + digits.rjust(33, "1")
+    return bakers
+
+
+def synthetic_history(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Build a deterministic history of cycles 1 to count.
+
+    Returns:
+        Entries sorted by cycle (descending), like dal_stats_history.json
+    """
+    rng = random.Random(seed)
+    history = []
+    for cycle in range(count, 0, -1):
+        participation = rng.uniform(40, 95)
+        history.append({
+            "timestamp": (GENESIS + timedelta(hours=cycle)).isoformat(),
+            "cycle": cycle,
+            "dal_active_bakers": rng.randint(50, 250),
+            "dal_baking_power_percentage": rng.uniform(40, 95),
+            "dal_participation_percentage": participation,
+            "dal_adoption_percentage": participation,
+        })
+    return history
+
+
+def latest_stats(entry: Dict) -> Dict:
+    """Full dal_stats.json result extending the latest history entry"""
+    total_bakers = 200
+    return {
+        **{field: entry[field] for field in HISTORY_FIELDS},
+        "total_bakers": total_bakers,
+        "dal_inactive_bakers": total_bakers - entry["dal_active_bakers"],
+        "unclassified_bakers": 0,
+        "non_attesting_bakers": 0,
+        "total_baking_power": 4.4e14,
+        "dal_baking_power": 4.4e14 * entry["dal_baking_power_percentage"] / 100,
+    }
+
+
+class PagesStandIn:
+    """Answers the GitHub Pages requests made by the API"""
+
+    def __init__(self, history_cycles: int, latency: float = 0.0, error_every: int = 0,
+                 networks: Tuple[str, ...] = ("mainnet",)):
+        """
+        Args:
+            history_cycles: Cycles in dal_stats_history.json
+            latency: Seconds added to every response
+            error_every: Answer every Nth request with 500 (0 disables errors)
+            networks: Networks whose results file is served
+        """
+        history = synthetic_history(history_cycles)
+        stats = json.dumps(latest_stats(history[0]), indent=2).encode()
+        self.files = {f"/{stats_filename(network)}": stats for network in networks}
+        self.files["/dal_stats_history.json"] = json.dumps(history).encode()
+        self.etags = {path: f'"{hashlib.sha1(body).hexdigest()}"' for path, body in self.files.items()}
+        self.last_modified = formatdate(usegmt=True)
+        self.latency = latency
+        self.error_every = error_every
+        self.counts = Counter()
+        self._served = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            self._served = 0
+
+    def handle(self, path: str, if_none_match: Optional[str]):
+        """
+        Serve one request, revalidating with the ETag like GitHub Pages does.
+
+        Returns:
+            (HTTP status, headers, body)
+        """
+        body = self.files.get(path)
+        with self._lock:
+            self._served += 1
+            failed = self.error_every and self._served % self.error_every == 0
+            self.counts[path.lstrip("/") if body is not None else "unknown"] += 1
+            if failed:
+                self.counts["errors"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 500, {}, b'{"error": "Injected failure"}'
+        if body is None:
+            return 404, {}, b"{}"
+        headers = {"ETag": self.etags[path], "Last-Modified": self.last_modified}
+        if if_none_match == self.etags[path]:
+            with self._lock:
+                self.counts["not_modified"] += 1
+            return 304, headers, b""
+        return 200, headers, body
+
+
+class PagesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        pages = self.server.pages
+        headers = {}
+        if self.path == "/__stats":
+            status, body = 200, json.dumps(pages.stats()).encode()
+        elif self.path == "/__reset":
+            pages.reset()
+            status, body = 200, b"{}"
+        else:
+            status, headers, body = pages.handle(self.path, self.headers.get("If-None-Match"))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(history_cycles: int, latency: float, error_every: int, networks: Tuple[str, ...], ports):
+    """Run the GitHub Pages stand-in (child process entry point)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PagesHandler)
+    server.daemon_threads = True
+    server.pages = PagesStandIn(history_cycles, latency, error_every, networks)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+class PagesServer:
+    """GitHub Pages stand-in running in a separate process, so it does not skew the measurements"""
+
+    def __init__(self, history_cycles: int, latency: float = 0.0, error_every: int = 0,
+                 networks: Tuple[str, ...] = ("mainnet",)):
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=serve,
+                                                args=(history_cycles, latency, error_every, networks, ports),
+                                                daemon=True)
+        self._process.start()
+        # Building a large history takes a while
+        self.base_url = f"http://127.0.0.1:{ports.get(timeout=120)}"
+
+    def stats(self) -> Dict[str, int]:
+        with urlopen(f"{self.base_url}/__stats") as response:
+            return json.load(response)
+
+    def reset(self):
+        urlopen(f"{self.base_url}/__reset").close()
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class APIServer:
+    """backend/main.py under uvicorn, reading GitHub Pages from the stand-in"""
+
+    def __init__(self, pages_url: str, work_dir: Path, fallback: Dict[str, bytes], workers: int = 1,
+                 cache_duration: int = 300, networks: Tuple[str, ...] = ("mainnet",),
+                 network_config: Optional[Dict[str, Dict]] = None):
+        """
+        Start the API and wait until it answers.
+
+        Args:
+            pages_url: Base URL of the GitHub Pages stand-in
+            work_dir: Scratch directory (working directory, local data, caches and log of the API)
+            fallback: Local results files written to the data directory, keyed by file name,
+                      so injected errors fall back to them as in production
+            workers: uvicorn worker processes
+            cache_duration: CACHE_DURATION of the API, in seconds
+            networks: NETWORKS of the API
+            network_config: "networks" section of the configuration read by the API's calculators
+        """
+        data_dir = work_dir / "data"
+        data_dir.mkdir()
+        for name, body in fallback.items():
+            (data_dir / name).write_bytes(body)
+        config_file = work_dir / "config.json"
+        config_file.write_text(json.dumps({"networks": network_config or {}}))
+        self.log_file = work_dir / "api.log"
+        env = dict(
+            os.environ,
+            GITHUB_PAGES_BASE_URL=pages_url,
+            NETWORK_CONFIG_FILE=str(config_file),
+            LOCAL_DATA_DIR=str(data_dir),
+            LOCAL_CACHE_DIR=str(work_dir / "cache"),
+            CACHE_DURATION=str(cache_duration),
+            NETWORKS=",".join(networks),
+        )
+        port = free_port()
+        self.url = f"http://127.0.0.1:{port}"
+        with open(self.log_file, "wb") as log:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(BACKEND_DIR),
+                 "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+                 "--timeout-keep-alive", str(KEEP_ALIVE_TIMEOUT), "--log-level", "warning", "--no-access-log"],
+                cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        try:
+            self._wait_ready()
+        except Exception:
+            self.stop()
+            raise
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"API exited with status {self._process.returncode}, see {self.log_file}:\n"
+                                   + self.log_file.read_text()[-2000:])
+            try:
+                httpx.get(f"{self.url}/api/health", timeout=REQUEST_TIMEOUT)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise RuntimeError(f"API did not start within {STARTUP_TIMEOUT}s")
+
+    def stop(self):
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+@dataclass
+class Scenario:
+    """One endpoint driven by the clients"""
+    name: str
+    path: Callable[[random.Random], str]
+    expected: Tuple[int, ...] = (200,)
+    # Send the ETag of a first response back, as a polling dashboard does
+    revalidate: bool = False
+    # Server-sent events: the latency is the time to the first event
+    stream: bool = False
+    # JSON body of a POST request, GET when None
+    body: Optional[Callable[[random.Random], Dict]] = None
+
+
+def build_scenarios(history_cycles: int, networks: Tuple[str, ...], bakers: List[str],
+                    job_id: str) -> List[Scenario]:
+    """
+    Scenarios of every endpoint.
+
+    The stats scenario comes first so the snapshot read by the others is
+    warm. The baker scenarios ask for bakers of the TzKT stand-in whose DAL
+    status is known, and the job scenario polls a calculation job.
+
+    Args:
+        history_cycles: Cycles in the history
+        networks: Networks served from the Pages stand-in
+        bakers: Addresses of the TzKT stand-in's classified bakers
+        job_id: Calculation job polled by the job scenario
+    """
+    def cycle(rng):
+        return rng.randint(1, history_cycles)
+
+    def history_range(rng):
+        first = rng.randint(1, max(1, history_cycles - RANGE_CYCLES + 1))
+        return f"/api/history?from={first}&to={first + RANGE_CYCLES - 1}"
+
+    return [
+        Scenario("stats", lambda rng: "/api/stats"),
+        Scenario("network_stats", lambda rng: f"/api/{rng.choice(networks)}/stats"),
+        Scenario("live_stats", lambda rng: "/api/stats?live=true", expected=(200, 404)),
+        Scenario("health", lambda rng: "/api/health"),
+        Scenario("history", lambda rng: "/api/history"),
+        Scenario("history_revalidate", lambda rng: "/api/history", expected=(304,), revalidate=True),
+        Scenario("history_range", history_range),
+        Scenario("cycle", lambda rng: f"/api/cycle/{cycle(rng)}"),
+        Scenario("distribution", lambda rng: "/api/distribution", expected=(200, 404)),
+        Scenario("baker", lambda rng: f"/api/baker/{rng.choice(bakers)}"),
+        Scenario("bakers", lambda rng: "/api/bakers",
+                 body=lambda rng: {"addresses": rng.sample(bakers, min(BAKERS_PER_REQUEST, len(bakers)))}),
+        Scenario("job", lambda rng: f"/api/jobs/{job_id}"),
+        Scenario("metrics", lambda rng: "/api/metrics"),
+        Scenario("stream", lambda rng: "/api/stream", stream=True),
+    ]
+
+
+async def first_event(client: httpx.AsyncClient, path: str) -> int:
+    """Connect to a server-sent events endpoint and return once the first event arrived"""
+    async with client.stream("GET", path) as response:
+        if response.status_code == 200:
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    break
+        return response.status_code
+
+
+async def send(client: httpx.AsyncClient, scenario: Scenario, rng: random.Random,
+               headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """Send one request of a (non-streaming) scenario"""
+    path = scenario.path(rng)
+    if scenario.body is not None:
+        return await client.post(path, json=scenario.body(rng), headers=headers)
+    return await client.get(path, headers=headers)
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, clients: int, duration: float,
+                headers: Dict[str, str], seed: int = 0) -> Tuple[List[float], Counter, float]:
+    """
+    Send requests of a scenario from concurrent clients, each waiting for its previous response.
+
+    Returns:
+        (latencies in seconds, responses by status, wall time)
+    """
+    latencies: List[float] = []
+    statuses = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def run_client(rng: random.Random):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if scenario.stream:
+                    status = await first_event(client, scenario.path(rng))
+                else:
+                    status = (await send(client, scenario, rng, headers)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[str(status)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(random.Random(seed + i)) for i in range(clients)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies: List[float], statuses: Counter, wall_time: float, expected: Tuple[int, ...],
+              upstream: Dict[str, int]) -> Dict:
+    """Throughput, latency percentiles, errors and upstream amplification of a scenario"""
+    requests = len(latencies)
+    errors = sum(count for status, count in statuses.items() if status not in {str(code) for code in expected})
+    upstream_requests = sum(count for name, count in upstream.items()
+                            if name not in ("errors", "not_modified", "throttled"))
+    percentiles = np.percentile(np.array(latencies) * 1000, [50, 95, 99]) if requests else [None] * 3
+    return {
+        "requests": requests,
+        "wall_time_s": round(wall_time, 3),
+        "requests_per_s": round(requests / wall_time, 1) if wall_time > 0 else None,
+        "p50_ms": None if percentiles[0] is None else round(float(percentiles[0]), 2),
+        "p95_ms": None if percentiles[1] is None else round(float(percentiles[1]), 2),
+        "p99_ms": None if percentiles[2] is None else round(float(percentiles[2]), 2),
+        "max_ms": round(max(latencies) * 1000, 2) if requests else None,
+        "statuses": dict(statuses),
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else None,
+        "upstream_requests": upstream_requests,
+        "upstream_by_file": upstream,
+        "amplification": round(upstream_requests / requests, 4) if requests else None,
+    }
+
+
+def upstream_stats(pages: PagesServer, chain: MockServer) -> Dict[str, int]:
+    """Requests received by both stand-ins since their last reset"""
+    return dict(Counter(pages.stats()) + Counter(chain.stats()))
+
+
+async def run_scenarios(api_url: str, pages: PagesServer, chain: MockServer, scenarios: List[Scenario],
+                        clients: int, duration: float) -> List[Dict]:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=REQUEST_TIMEOUT) as client:
+        results = []
+        for scenario in scenarios:
+            # Warm-up request, outside of the measurement
+            headers = {}
+            if scenario.stream:
+                await first_event(client, scenario.path(random.Random(0)))
+            else:
+                response = await send(client, scenario, random.Random(0))
+                if scenario.revalidate and "etag" in response.headers:
+                    headers["If-None-Match"] = response.headers["etag"]
+            await asyncio.gather(asyncio.to_thread(pages.reset), asyncio.to_thread(chain.reset))
+            latencies, statuses, wall_time = await drive(client, scenario, clients, duration, headers)
+            upstream = await asyncio.to_thread(upstream_stats, pages, chain)
+            results.append({"scenario": scenario.name,
+                            **summarize(latencies, statuses, wall_time, scenario.expected, upstream)})
+            print(f"  {scenario.name}: {results[-1]['requests_per_s']} req/s, p99 {results[-1]['p99_ms']} ms",
+                  file=sys.stderr)
+        return results
+
+
+def prepare_api(api_url: str, bakers: List[str]) -> str:
+    """
+    Warm the baker lookups of the API and get a calculation job to poll.
+
+    The bakers are looked up once, outside of the measurement, so the baker
+    scenarios measure the cached lookups like the other scenarios measure a
+    warm snapshot.
+
+    Returns:
+        Id of a calculation job of JOB_NETWORK
+    """
+    response = httpx.post(f"{api_url}/api/bakers", json={"addresses": bakers}, timeout=STARTUP_TIMEOUT)
+    response.raise_for_status()
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        response = httpx.get(f"{api_url}/api/{JOB_NETWORK}/stats", timeout=REQUEST_TIMEOUT)
+        if response.status_code == 202:
+            return response.json()["job_id"]
+        # 503 between a failed job and the next stats request queuing another one
+        time.sleep(0.1)
+    raise RuntimeError(f"No calculation job of {JOB_NETWORK} was queued within {STARTUP_TIMEOUT}s")
+
+
+def run_load_test(history_cycles: List[int], clients: int, duration: float, latency: float, error_every: int,
+                  workers: int, cache_duration: int, networks: Tuple[str, ...],
+                  only: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Load-test every scenario for each history size.
+
+    Returns:
+        One result per (history size, scenario)
+    """
+    bakers = chain_bakers(CHAIN_BAKERS)
+    classified = [baker["address"] for baker in bakers if baker["attestedSlots"] is not None]
+    results = []
+    chain = MockServer(bakers)
+    try:
+        # Every served network reads the TzKT stand-in, JOB_NETWORK a path it does not serve
+        network_config = {
+            network: {"api_url": chain.api_url, "rpc_url": chain.rpc_url, "api_rate": CHAIN_RATE,
+                      "rpc_rate": CHAIN_RATE}
+            for network in networks
+        }
+        network_config[JOB_NETWORK] = {**network_config["mainnet"], "api_url": f"{chain.api_url}/{JOB_NETWORK}"}
+        for count in history_cycles:
+            pages = PagesServer(count, latency, error_every, networks)
+            try:
+                latest = json.dumps(latest_stats(synthetic_history(count)[0])).encode()
+                fallback = {stats_filename(network): latest for network in networks}
+                with tempfile.TemporaryDirectory() as work_dir:
+                    api = APIServer(pages.base_url, Path(work_dir), fallback, workers, cache_duration,
+                                    networks + (JOB_NETWORK,), network_config)
+                    try:
+                        job_id = prepare_api(api.url, classified)
+                        scenarios = [scenario for scenario in build_scenarios(count, networks, classified, job_id)
+                                     if not only or scenario.name in only]
+                        print(f"{count} history cycles", file=sys.stderr)
+                        for result in asyncio.run(run_scenarios(api.url, pages, chain, scenarios, clients,
+                                                                duration)):
+                            results.append({"history_cycles": count, **result})
+                    finally:
+                        api.stop()
+            finally:
+                pages.stop()
+    finally:
+        chain.stop()
+    return results
+
+
+def scenario_thresholds(thresholds: Dict, scenario: str, history_cycles: int) -> Dict[str, float]:
+    """
+    Limits of a scenario: the defaults, overridden by "<scenario>" then "<scenario>@<history cycles>".
+    """
+    by_scenario = thresholds.get("scenarios", {})
+    return {
+        **thresholds.get("default", {}),
+        **by_scenario.get(scenario, {}),
+        **by_scenario.get(f"{scenario}@{history_cycles}", {}),
+    }
+
+
+def check_thresholds(results: List[Dict], thresholds: Dict) -> List[str]:
+    """
+    Check the results against absolute limits.
+
+    A limit is named after a result field with a min_ or max_ prefix, e.g.
+    min_requests_per_s, max_p99_ms, max_error_rate or max_amplification.
+
+    Returns:
+        One message per missed limit
+    """
+    failures = []
+    for result in results:
+        label = f"{result['scenario']}@{result['history_cycles']}"
+        for name, limit in scenario_thresholds(thresholds, result["scenario"], result["history_cycles"]).items():
+            bound, _, field = name.partition("_")
+            if bound not in ("min", "max") or field not in result:
+                raise ValueError(f"Unknown threshold: {name}")
+            value = result[field]
+            if value is None or (value < limit if bound == "min" else value > limit):
+                failures.append(f"{label}: {field} {value} {'<' if bound == 'min' else '>'} {limit}")
+    return failures
+
+
+def compare_baseline(results: List[Dict], baseline: List[Dict], tolerance: float, tolerance_ms: float) -> List[str]:
+    """
+    Compare the results with a previous report of the same scenarios.
+
+    Throughput may drop and p95/p99 latency may grow by the tolerance (the
+    latency also by tolerance_ms, so sub-millisecond noise is ignored);
+    amplification and error rate may not grow beyond it.
+
+    Returns:
+        One message per regression
+    """
+    previous = {(result["history_cycles"], result["scenario"]): result for result in baseline}
+    failures = []
+    for result in results:
+        before = previous.get((result["history_cycles"], result["scenario"]))
+        if before is None:
+            continue
+        label = f"{result['scenario']}@{result['history_cycles']}"
+        if before["requests_per_s"] and (result["requests_per_s"] or 0) < before["requests_per_s"] * (1 - tolerance):
+            failures.append(f"{label}: requests_per_s {result['requests_per_s']} (baseline {before['requests_per_s']})")
+        for field in ("p95_ms", "p99_ms"):
+            if before[field] is not None and result[field] is not None \
+                    and result[field] > before[field] * (1 + tolerance) + tolerance_ms:
+                failures.append(f"{label}: {field} {result[field]} (baseline {before[field]})")
+        for field in ("amplification", "error_rate"):
+            if before[field] is not None and result[field] is not None \
+                    and result[field] > before[field] * (1 + tolerance) + 0.001:
+                failures.append(f"{label}: {field} {result[field]} (baseline {before[field]})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the API against a local GitHub Pages stand-in')
+    parser.add_argument('--history-cycles', type=int, nargs='+', default=DEFAULT_HISTORY_CYCLES,
+                        help='History sizes to test, in cycles (default: 1000 10000 100000)')
+    parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS,
+                        help=f'Concurrent clients (default: {DEFAULT_CLIENTS})')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                        help=f'Seconds each scenario runs (default: {DEFAULT_DURATION:g})')
+    parser.add_argument('--scenarios', type=str, nargs='+', help='Only run these scenarios (default: all)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency added to every stand-in response')
+    parser.add_argument('--error-every', type=int, default=0,
+                        help='Answer every Nth stand-in request with 500 (default: never)')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes (default: 1)')
+    parser.add_argument('--cache-duration', type=int, default=300,
+                        help='CACHE_DURATION of the API in seconds (default: 300)')
+    parser.add_argument('--networks', type=str, default='mainnet', help='NETWORKS of the API (default: mainnet)')
+    parser.add_argument('--thresholds', type=str, help='JSON file of limits the results must meet')
+    parser.add_argument('--baseline', type=str, help='Previous JSON report the results must not regress from')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Share by which a result may be worse than the baseline (default: 0.25)')
+    parser.add_argument('--tolerance-ms', type=float, default=5.0,
+                        help='Latency added to the baseline tolerance, in ms (default: 5)')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    networks = tuple(dict.fromkeys(["mainnet"] + [network.strip() for network in args.networks.split(",")
+                                                  if network.strip()]))
+    results = run_load_test(args.history_cycles, args.clients, args.duration, args.latency_ms / 1000,
+                            args.error_every, args.workers, args.cache_duration, networks, args.scenarios)
+
+    failures = []
+    if args.thresholds:
+        with open(args.thresholds, 'r') as f:
+            failures += check_thresholds(results, json.load(f))
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            failures += compare_baseline(results, json.load(f)["results"], args.tolerance, args.tolerance_ms)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "latency_ms": args.latency_ms,
+            "error_every": args.error_every,
+            "workers": args.workers,
+            "cache_duration": args.cache_duration,
+            "networks": list(networks),
+            "thresholds": args.thresholds,
+            "baseline": args.baseline,
+        },
+        "results": results,
+        "failures": failures,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
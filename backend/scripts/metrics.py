@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Latency buckets in seconds, from a cached hit to a timed-out upstream call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms keyed by name and labels.
+
+    snapshot() gives a JSON-serializable view that render_prometheus turns
+    into the Prometheus text format, so a snapshot saved by one process (e.g.
+    a dal_calculation.py run report) can be exposed by another.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        """Set the HELP text of a metric"""
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Add amount to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the duration of a block in a histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict:
+        """
+        Get a JSON-serializable copy of every metric.
+
+        Returns:
+            dict: {"counters": [...], "histograms": [...], "help": {...}}
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(key), "value": value}
+                for name, series in self._counters.items()
+                for key, value in series.items()
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(key),
+                    "buckets": list(histogram.buckets),
+                    "counts": list(histogram.counts),
+                    "sum": histogram.sum,
+                    "count": histogram.count,
+                }
+                for name, series in self._histograms.items()
+                for key, histogram in series.items()
+            ]
+        return {"counters": counters, "histograms": histograms, "help": dict(self._help)}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items())) + "}"
+
+
+def render_prometheus(snapshot: Dict, prefix: str = "") -> str:
+    """
+    Render a registry snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Result of MetricsRegistry.snapshot
+        prefix: Prepended to every metric name
+
+    Returns:
+        str: Exposition text
+    """
+    lines: List[str] = []
+    help_texts = snapshot.get("help", {})
+    seen = set()
+
+    def header(name: str, kind: str):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in help_texts:
+            lines.append(f"# HELP {prefix}{name} {help_texts[name]}")
+        lines.append(f"# TYPE {prefix}{name} {kind}")
+
+    for counter in sorted(snapshot.get("counters", []), key=lambda c: c["name"]):
+        header(counter["name"], "counter")
+        lines.append(f"{prefix}{counter['name']}{_format_labels(counter['labels'])} {counter['value']}")
+
+    for histogram in sorted(snapshot.get("histograms", []), key=lambda h: h["name"]):
+        name = histogram["name"]
+        header(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(list(histogram["buckets"]) + ["+Inf"], histogram["counts"]):
+            cumulative += count
+            labels = {**histogram["labels"], "le": bound}
+            lines.append(f"{prefix}{name}_bucket{_format_labels(labels)} {cumulative}")
+        lines.append(f"{prefix}{name}_sum{_format_labels(histogram['labels'])} {histogram['sum']}")
+        lines.append(f"{prefix}{name}_count{_format_labels(histogram['labels'])} {histogram['count']}")
+
+    return "\n".join(lines) + "\n"
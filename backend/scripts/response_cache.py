@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+import re
+import time
+import json
+import zlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+# Default on-disk location, next to the data directory but outside of git
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "http_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# TTL value meaning "never expires"
+IMMUTABLE = None
+
+HEAD_TTL = 15
+RECENT_TTL = 300
+DEFAULT_TTL = 600
+# Levels this far behind head are considered final
+FINALITY_BLOCKS = 2
+
+_CYCLE_PATH = re.compile(r"/cycles/(\d+)$")
+_REWARDS_PATH = re.compile(r"/rewards/bakers(/[^/]+)?$")
+_DELEGATE_PATH = re.compile(r"/delegates/[^/]+$")
+_BLOCK_PATH = re.compile(r"/chains/[^/]+/blocks/(\d+)/")
+
+
+class CachePolicy:
+    """
+    Decides how long a TzKT/RPC response may be cached.
+
+    Responses about finalized cycles and levels never change and are kept
+    forever. Anything about the running cycle or the chain head is short-lived.
+    Finality is judged against the last head seen through observe_head; until
+    a head has been seen nothing is treated as immutable.
+    """
+
+    def __init__(self):
+        self.head_level: Optional[int] = None
+        self.head_cycle: Optional[int] = None
+
+    def observe_head(self, head: Dict):
+        """Record the latest /head response"""
+        try:
+            self.head_level = int(head["level"])
+            self.head_cycle = int(head["cycle"])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def _cycle_ttl(self, cycle: int) -> Optional[float]:
+        if self.head_cycle is not None and cycle < self.head_cycle:
+            return IMMUTABLE
+        return RECENT_TTL
+
+    def _level_ttl(self, level: int) -> Optional[float]:
+        if self.head_level is not None and level <= self.head_level - FINALITY_BLOCKS:
+            return IMMUTABLE
+        return HEAD_TTL
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """
+        Get the time-to-live of a response.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            TTL in seconds, or IMMUTABLE for responses that never change
+        """
+        parsed = urlparse(url)
+        path = parsed.path.rstrip("/")
+        query = parse_qs(parsed.query)
+
+        if path.endswith("/head"):
+            return HEAD_TTL
+
+        match = _BLOCK_PATH.search(path)
+        if match:
+            return self._level_ttl(int(match.group(1)))
+
+        match = _CYCLE_PATH.search(path)
+        if match:
+            return self._cycle_ttl(int(match.group(1)))
+
+        if _REWARDS_PATH.search(path) and "cycle" in query:
+            try:
+                return self._cycle_ttl(int(query["cycle"][0]))
+            except ValueError:
+                return RECENT_TTL
+
+        if _DELEGATE_PATH.search(path) and "at" in query:
+            try:
+                return self._level_ttl(int(query["at"][0]))
+            except ValueError:
+                return RECENT_TTL
+
+        return DEFAULT_TTL
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded JSON response cache stored in SQLite and keyed by URL.
+
+    Bodies are stored zlib-compressed. When the store grows past max_bytes,
+    expired entries are dropped first, then the least recently used ones.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total size of stored bodies
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Decoded JSON body, or None on miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+        try:
+            return json.loads(zlib.decompress(body))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping corrupt cache entry for {url}: {e}")
+            self.delete(url)
+            return None
+
+    def put(self, url: str, data: Any, ttl: Optional[float]):
+        """
+        Store a response.
+
+        Args:
+            url: Requested URL
+            data: JSON-serializable body
+            ttl: Time-to-live in seconds, or IMMUTABLE
+        """
+        if ttl is not IMMUTABLE and ttl <= 0:
+            return
+        now = time.time()
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        expires_at = None if ttl is IMMUTABLE else now + ttl
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, size, stored_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, body, len(body), now, expires_at, now),
+            )
+            self._conn.commit()
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(now)
+
+    def delete(self, url: str):
+        """Remove a single entry"""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+                self._total_bytes -= row[0]
+
+    def _evict(self, now: float):
+        """Shrink the store to 90% of max_bytes. Caller must hold the lock."""
+        self._conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if self._total_bytes > target:
+            excess = self._total_bytes - target
+            rows = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access")
+            victims = []
+            for url, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((url,))
+                excess -= size
+                self._total_bytes -= size
+            self._conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+            logger.info(f"Evicted {len(victims)} cached responses")
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
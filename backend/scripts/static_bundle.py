@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # .br siblings are skipped without the Brotli package
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Cycles per history page; page N holds cycles [N * size, (N + 1) * size)
+DEFAULT_PAGE_SIZE = 20
+
+MANIFEST_NAME = "manifest.json"
+
+
+def minify(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _write_atomic(path: Path, payload: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f".{path.name}.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, path)
+
+
+def _siblings(path: Path) -> List[Path]:
+    return [path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")]
+
+
+def _write_file(path: Path, payload: bytes):
+    """Write a payload with its precompressed siblings"""
+    gz_file, br_file = _siblings(path)
+    _write_atomic(path, payload)
+    # mtime=0 keeps the gzip output identical for identical content
+    _write_atomic(gz_file, gzip.compress(payload, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(br_file, brotli.compress(payload, quality=11))
+
+
+def _load_manifest(output_dir: Path) -> Dict:
+    try:
+        with open(output_dir / MANIFEST_NAME, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def bundle_payloads(stats: Dict, history: List[Dict], page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]:
+    """
+    Split the statistics into the files of the bundle.
+
+    Returns:
+        Content keyed by path relative to the bundle root
+    """
+    entries = sorted(history, key=lambda entry: entry["cycle"], reverse=True)
+    payloads: Dict[str, object] = {"stats.json": stats, "history/latest.json": entries[:page_size]}
+    pages: Dict[int, List[Dict]] = {}
+    for entry in entries:
+        pages.setdefault(entry["cycle"] // page_size, []).append(entry)
+        payloads[f"cycle/{entry['cycle']}.json"] = entry
+    for page, page_entries in pages.items():
+        payloads[f"history/page-{page}.json"] = page_entries
+    return payloads
+
+
+def build_bundle(output_dir: Path, stats: Dict, history: List[Dict], page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """
+    Write the static API bundle served by GitHub Pages.
+
+    Every file is minified JSON with .gz (and, when Brotli is installed, .br)
+    siblings. Files whose content hash matches the previous manifest are left
+    untouched, so a new cycle only rewrites a handful of files.
+
+    Args:
+        output_dir: Bundle root (e.g. docs/api)
+        stats: Latest cycle results (dal_stats.json)
+        history: History entries (dal_stats_history.json)
+        page_size: Cycles per history page
+
+    Returns:
+        The manifest: content hash and size of every file, plus the history layout
+    """
+    encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+    previous = _load_manifest(output_dir)
+    # A change of available encodings rewrites every file with the new siblings
+    previous_files = previous.get("files", {}) if previous.get("encodings") == encodings else {}
+    files = {}
+    written = 0
+    for name, data in bundle_payloads(stats, history, page_size).items():
+        payload = minify(data)
+        digest = content_hash(payload)
+        files[name] = {"hash": digest, "size": len(payload)}
+        path = output_dir / name
+        if previous_files.get(name, {}).get("hash") != digest or not path.exists():
+            _write_file(path, payload)
+            written += 1
+
+    removed = [name for name in previous.get("files", {}) if name not in files]
+    for name in removed:
+        for path in [output_dir / name] + _siblings(output_dir / name):
+            path.unlink(missing_ok=True)
+
+    cycles = sorted(entry["cycle"] for entry in history)
+    manifest = {
+        "generated_at": previous.get("generated_at"),
+        "latest_cycle": stats.get("cycle"),
+        "first_cycle": cycles[0] if cycles else None,
+        "last_cycle": cycles[-1] if cycles else None,
+        "page_size": page_size,
+        "pages": sorted({cycle // page_size for cycle in cycles}),
+        "encodings": encodings,
+        "files": files,
+    }
+    if written or removed or manifest["generated_at"] is None:
+        manifest["generated_at"] = datetime.now().isoformat()
+        _write_atomic(output_dir / MANIFEST_NAME, minify(manifest))
+    logger.info(f"Static bundle in {output_dir}: {written} file(s) written, {len(removed)} removed")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the static API bundle published on GitHub Pages')
+    parser.add_argument('--stats-file', type=str, default=str(DATA_DIR / "dal_stats.json"),
+                        help='Latest cycle results (default: backend/data/dal_stats.json)')
+    parser.add_argument('--history-file', type=str, default=str(DATA_DIR / "dal_stats_history.json"),
+                        help='History (default: backend/data/dal_stats_history.json)')
+    parser.add_argument('--output-dir', type=str, required=True, help='Bundle root, e.g. docs/api')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f'Cycles per history page (default: {DEFAULT_PAGE_SIZE})')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(args.stats_file, 'r') as f:
+        stats = json.load(f)
+    with open(args.history_file, 'r') as f:
+        history = json.load(f)
+    build_bundle(Path(args.output_dir), stats, history, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
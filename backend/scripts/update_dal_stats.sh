@@ -68,23 +68,43 @@ if [ "$CURRENT_BRANCH" != "main" ]; then
     git checkout main
 fi
 
-# Get current cycle and calculate for previous cycle (current is not yet complete)
-CURRENT_CYCLE=$(curl -s "https://api.mainnet.tzkt.io/v1/head" | jq -r '.cycle')
-PREVIOUS_CYCLE=$((CURRENT_CYCLE - 1))
-
-# Check if we already have data for the previous cycle
-EXISTING_CYCLE=$(jq -r '.cycle' backend/data/dal_stats.json 2>/dev/null || echo "0")
+# Networks to update, as configured in backend/config/config.json
+NETWORKS=$(backend/scripts/configured_networks.sh)
+echo "Networks: $NETWORKS"
+
+# Results and history files of each network (mainnet keeps the unsuffixed names, see network_files)
+DATA_FILES=()
+STALE_NETWORKS=()
+for NETWORK in ${NETWORKS//,/ }; do
+    if [ "$NETWORK" == "mainnet" ]; then SUFFIX=""; else SUFFIX="_$NETWORK"; fi
+    DATA_FILES+=("dal_stats${SUFFIX}.json" "dal_stats_history${SUFFIX}.json")
+
+    # Get current cycle; the previous one is the last completed cycle
+    API_URL=$(jq -r --arg network "$NETWORK" '.networks[$network].api_url // empty' \
+        backend/config/config.json backend/config/config.example.json 2>/dev/null | head -1)
+    API_URL=${API_URL:-https://api.$NETWORK.tzkt.io/v1}
+    CURRENT_CYCLE=$(curl -s "$API_URL/head" | jq -r '.cycle')
+    PREVIOUS_CYCLE=$((CURRENT_CYCLE - 1))
+
+    # Check if we already have data for the previous cycle
+    EXISTING_CYCLE=$(jq -r '.cycle' "backend/data/dal_stats${SUFFIX}.json" 2>/dev/null || echo "0")
+    if [ "$EXISTING_CYCLE" == "$PREVIOUS_CYCLE" ]; then
+        echo "Cycle $PREVIOUS_CYCLE of $NETWORK already calculated. Skipping."
+    else
+        STALE_NETWORKS+=("$NETWORK")
+    fi
+done
 
-if [ "$EXISTING_CYCLE" == "$PREVIOUS_CYCLE" ]; then
-    echo "Cycle $PREVIOUS_CYCLE already calculated. Skipping."
-else
-    # Run the calculation script for the previous cycle
-    echo "Running DAL calculation script for cycle $PREVIOUS_CYCLE..."
-    python backend/scripts/dal_calculation.py --network mainnet --output-dir backend/data --cycle $PREVIOUS_CYCLE
+if [ ${#STALE_NETWORKS[@]} -gt 0 ]; then
+    # Run the calculation script for the last completed cycle of every stale network at once
+    STALE=$(IFS=,; echo "${STALE_NETWORKS[*]}")
+    echo "Running DAL calculation script for the last completed cycle of $STALE..."
+    python backend/scripts/dal_calculation.py --networks "$STALE" --last-completed --output-dir backend/data
 fi
 
 # Check if there are changes to commit
-if git diff --quiet backend/data/dal_stats.json; then
+# git status also reports the files of a network published for the first time
+if [ -z "$(cd backend/data && git status --porcelain -- "${DATA_FILES[@]}")" ]; then
     echo "No changes to DAL stats detected."
 else
     echo "Changes detected, committing and pushing..."
@@ -92,13 +112,23 @@ else
     # Ensure docs directory exists
     mkdir -p docs
     
-    # Copy JSON files to docs directory for GitHub Pages
-    cp backend/data/dal_stats.json docs/
-    cp backend/data/dal_stats_history.json docs/
+    # Copy JSON files of every network to docs directory for GitHub Pages
+    PUBLISHED_FILES=()
+    for FILE in "${DATA_FILES[@]}"; do
+        if [ -f "backend/data/$FILE" ]; then
+            cp "backend/data/$FILE" docs/
+            PUBLISHED_FILES+=("backend/data/$FILE" "docs/$FILE")
+        fi
+    done
+    
+    # Rebuild the static API bundle (minified history pages, per-cycle files, .gz/.br)
+    python backend/scripts/static_bundle.py --output-dir docs/api
     
-    # Copy JSON files to frontend/public for local fallback in the frontend
+    # Copy JSON files to frontend/public for local fallback in the frontend (mainnet only)
     cp backend/data/dal_stats.json frontend/public/
     cp backend/data/dal_stats_history.json frontend/public/
+
+    COMMIT_MESSAGE="Update DAL stats for cycle $(jq -r '.cycle' backend/data/dal_stats.json) ($(date +%Y-%m-%d))"
     
     # Set up SSH agent with the automation key
     eval "$(ssh-agent -s)"
@@ -117,12 +147,12 @@ else
         # Reset to remote to avoid conflicts (cron should work with latest remote state)
         git reset --hard origin/main
         # Re-add and commit the changes
-        git add backend/data/dal_stats.json backend/data/dal_stats_history.json docs/ frontend/public/dal_stats.json frontend/public/dal_stats_history.json
-        git commit -m "Update DAL stats for cycle $(jq -r '.cycle' backend/data/dal_stats.json) ($(date +%Y-%m-%d))"
+        git add "${PUBLISHED_FILES[@]}" docs/ frontend/public/dal_stats.json frontend/public/dal_stats_history.json
+        git commit -m "$COMMIT_MESSAGE"
     else
         # Add and commit changes
-        git add backend/data/dal_stats.json backend/data/dal_stats_history.json docs/ frontend/public/dal_stats.json frontend/public/dal_stats_history.json
-        git commit -m "Update DAL stats for cycle $(jq -r '.cycle' backend/data/dal_stats.json) ($(date +%Y-%m-%d))"
+        git add "${PUBLISHED_FILES[@]}" docs/ frontend/public/dal_stats.json frontend/public/dal_stats_history.json
+        git commit -m "$COMMIT_MESSAGE"
     fi
     
     # Push changes
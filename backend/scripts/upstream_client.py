@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import time
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_MAX_CONNECTIONS = 20
+
+# Consecutive failures that open a host's circuit, and how long it stays open
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised without any network access while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    After failure_threshold failures in a row the circuit opens and calls
+    fail fast for reset_timeout seconds. The first call after that is let
+    through as a probe: success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Half-open: let this probe through, keep failing fast until it ends
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def on_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def on_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    """
+    Shared async HTTP client of the API.
+
+    One keep-alive connection pool serves every handler. Concurrent GETs of
+    the same URL share a single in-flight request, and each host sits behind
+    a circuit breaker so callers fall back to local files immediately while
+    the host is down.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the client; the connection pool is created on first use.
+
+        Args:
+            timeout: Connect/read timeout of every request in seconds
+            max_connections: Size of the connection pool
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds a circuit stays open before a probe is let through
+            metrics: Registry receiving coalescing and circuit-breaker counters
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = metrics or MetricsRegistry()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    async def _fetch(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self.metrics.inc("upstream_short_circuits_total", host=urlparse(url).netloc)
+            raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+        try:
+            response = await self.client.get(url, headers=headers)
+        except httpx.HTTPError:
+            breaker.on_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.on_failure()
+        else:
+            breaker.on_success()
+        return response
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        GET a URL, joining an identical request already in flight.
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            httpx.HTTPError: Timeout or transport failure
+        """
+        headers = headers or {}
+        key = (url, tuple(sorted(headers.items())))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.create_task(self._fetch(url, headers))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.metrics.inc("upstream_coalesced_total", host=urlparse(url).netloc)
+        # A cancelled caller must not cancel the fetch the others are waiting for
+        return await asyncio.shield(task)
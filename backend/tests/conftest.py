@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND / "scripts"))
+# main.py, for the API tests
+sys.path.insert(0, str(BACKEND))
@@ -0,0 +1,111 @@
+import random
+
+import numpy as np
+import pytest
+
+from aggregation import (DEFAULT_STAKE_BUCKETS, STATUS_ACTIVE, aggregate_columns, aggregate_cycles,
+                         decode_status, encode_status)
+
+
+def baseline(bakers):
+    """The per-baker loop the aggregation replaced, over (stake, dal_status) pairs"""
+    dal_active = dal_inactive = unclassified = non_attesting = 0
+    total_stake = dal_stake = 0.0
+    for stake, dal_status in bakers:
+        total_stake += stake
+        if dal_status is None and stake == 0:
+            non_attesting += 1
+        elif dal_status is None:
+            unclassified += 1
+        elif dal_status:
+            dal_active += 1
+            dal_stake += stake
+        else:
+            dal_inactive += 1
+
+    total = len(bakers)
+    attesting = total - non_attesting
+    return {
+        "total_bakers": total,
+        "dal_active_bakers": dal_active,
+        "dal_inactive_bakers": dal_inactive,
+        "unclassified_bakers": unclassified,
+        "non_attesting_bakers": non_attesting,
+        "total_baking_power": total_stake,
+        "dal_baking_power": dal_stake,
+        "dal_baking_power_percentage": (dal_stake / total_stake * 100) if total_stake > 0 else 0,
+        "dal_participation_percentage": (dal_active / attesting * 100) if attesting > 0 else 0,
+        "dal_adoption_percentage":
+            ((total - dal_inactive - unclassified - non_attesting) / total * 100) if total > 0 else 0,
+    }
+
+
+def random_cycle(rng, size):
+    bakers = []
+    for _ in range(size):
+        dal_status = rng.choice([True, False, None])
+        # Zero stakes make the UNKNOWN bakers non-attesting
+        stake = 0.0 if rng.random() < 0.2 else float(rng.randrange(1, 10**14))
+        bakers.append((stake, dal_status))
+    return bakers
+
+
+def columns(bakers):
+    stake = np.array([s for s, _ in bakers], dtype=np.float64)
+    status = np.array([encode_status(d) for _, d in bakers], dtype=np.int8)
+    return stake, status
+
+
+@pytest.fixture
+def cycles():
+    rng = random.Random(16)
+    # An empty cycle and one without stake exercise the zero divisions
+    return [random_cycle(rng, n) for n in (0, 1, 7, 50, 300)] + [[(0.0, None), (0.0, True)]]
+
+
+def assert_matches_baseline(stats, bakers):
+    for field, expected in baseline(bakers).items():
+        assert stats[field] == pytest.approx(expected), field
+
+
+def test_aggregate_cycles_matches_per_baker_baseline(cycles):
+    groups = np.concatenate([np.full(len(bakers), g, dtype=np.int64) for g, bakers in enumerate(cycles)])
+    stake, status = columns([baker for bakers in cycles for baker in bakers])
+
+    # The rows of a cycle need not be contiguous
+    shuffle = np.random.default_rng(16).permutation(len(groups))
+    results = aggregate_cycles(groups[shuffle], stake[shuffle], status[shuffle], len(cycles))
+
+    assert len(results) == len(cycles)
+    for stats, bakers in zip(results, cycles):
+        assert_matches_baseline(stats, bakers)
+
+
+def test_aggregate_columns_matches_per_baker_baseline(cycles):
+    for bakers in cycles:
+        assert_matches_baseline(aggregate_columns(*columns(bakers)), bakers)
+
+
+def test_top_bakers_and_buckets_match_per_baker_baseline(cycles):
+    bakers = cycles[-2]
+    stats = aggregate_columns(*columns(bakers), top_n=5)
+
+    top = sorted(bakers, key=lambda baker: baker[0], reverse=True)[:5]
+    total_stake = sum(stake for stake, _ in bakers)
+    assert stats["top_stake_percentage"] == pytest.approx(100 * sum(s for s, _ in top) / total_stake)
+    assert stats["top_dal_active_bakers"] == sum(1 for _, d in top if d)
+
+    bounds = [0.0, *DEFAULT_STAKE_BUCKETS, float("inf")]
+    for bucket, low, high in zip(stats["stake_buckets"], bounds, bounds[1:]):
+        members = [(s, d) for s, d in bakers if low <= s < high]
+        assert bucket["bakers"] == len(members)
+        assert bucket["dal_active_bakers"] == sum(1 for _, d in members if d)
+        assert bucket["stake"] == pytest.approx(sum(s for s, _ in members))
+        assert bucket["dal_stake"] == pytest.approx(sum(s for s, d in members if d))
+    assert sum(bucket["bakers"] for bucket in stats["stake_buckets"]) == len(bakers)
+
+
+def test_status_encoding_round_trips():
+    for dal_status in (True, False, None):
+        assert decode_status(encode_status(dal_status)) is dal_status
+    assert encode_status(True) == STATUS_ACTIVE
@@ -0,0 +1,28 @@
+import multiprocessing
+
+from baker_archive import BakerArchive
+from baker_store import BakerResult
+
+
+def archive_bakers(root, cycle, addresses):
+    BakerArchive(root).write_cycle(cycle, [BakerResult(address, 1.0, True, 1) for address in addresses])
+
+
+def test_concurrent_writers_agree_on_baker_ids(tmp_path):
+    # Each process adds its own bakers plus a set shared by all of them, in a different order
+    shared = [f"tz1shared{i:027d}" for i in range(200)]
+    jobs = [(tmp_path, cycle, [f"tz1cycle{cycle:04d}{i:024d}" for i in range(200)] + shared[::1 if cycle % 2 else -1])
+            for cycle in range(8)]
+    processes = [multiprocessing.Process(target=archive_bakers, args=job) for job in jobs]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    archive = BakerArchive(tmp_path)
+    assert archive.cycles() == list(range(8))
+    for _, cycle, addresses in jobs:
+        for address in addresses:
+            assert [entry["cycle"] for entry in archive.baker_timeline(address)] == (
+                list(range(8)) if address in shared else [cycle])
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def address(i: int) -> str:
+    """Well-formed tz1 address number i"""
+    digits = ""
+    for _ in range(33):
+        i, digit = divmod(i, len(BASE58))
+        digits = BASE58[digit] + digits
+    return "tz1" + digits
+
+
+class FakeLookup:
+    """BakerLookup stand-in recording the addresses it is asked for"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def get_many(self, addresses):
+        self.requests.append(addresses)
+        return 100, [{"address": a, "dal_status": True} for a in addresses]
+
+
+@pytest.fixture
+def lookup(monkeypatch):
+    lookup = FakeLookup()
+    monkeypatch.setitem(main.baker_lookups, "mainnet", lookup)
+    return lookup
+
+
+@pytest.fixture
+def client():
+    # Without the lifespan: no background refresh of the stats
+    return TestClient(main.app)
+
+
+def test_bakers_are_looked_up_once_each_in_request_order(client, lookup):
+    addresses = [address(2), address(1), address(2), address(3), address(1)]
+    response = client.post("/api/bakers", json={"addresses": addresses})
+
+    assert response.status_code == 200
+    assert lookup.requests == [[address(2), address(1), address(3)]]
+    body = response.json()
+    assert body["network"] == "mainnet" and body["cycle"] == 100
+    assert [baker["address"] for baker in body["bakers"]] == [address(2), address(1), address(3)]
+
+
+@pytest.mark.parametrize("bad", [
+    "tz1short",
+    "tz5" + address(1)[3:],
+    "KT1" + address(1)[3:],
+    # 0, O, I and l are not base58
+    address(1)[:-1] + "0",
+    address(1)[:-1] + "l",
+    address(1) + "x",
+    "",
+])
+def test_invalid_address_is_rejected_before_any_lookup(client, lookup, bad):
+    response = client.post("/api/bakers", json={"addresses": [address(1), bad]})
+    assert response.status_code == 400
+    assert lookup.requests == []
+
+
+def test_at_most_500_addresses_per_request(client, lookup):
+    addresses = [address(i) for i in range(main.MAX_BAKERS_PER_REQUEST)]
+    assert client.post("/api/bakers", json={"addresses": addresses}).status_code == 200
+    assert len(lookup.requests[-1]) == 500
+
+    response = client.post("/api/bakers", json={"addresses": addresses + [address(500)]})
+    assert response.status_code == 400
+    assert "500" in response.json()["detail"]
+    assert len(lookup.requests) == 1
+
+
+def test_the_cap_counts_distinct_addresses(client, lookup):
+    addresses = [address(i) for i in range(main.MAX_BAKERS_PER_REQUEST)]
+    response = client.post("/api/bakers", json={"addresses": addresses + addresses[:10]})
+    assert response.status_code == 200
+    assert len(lookup.requests[-1]) == 500
+
+
+def test_unknown_network_is_not_found(client, lookup):
+    response = client.post("/api/bakers", json={"addresses": [address(1)], "network": "nonexistent"})
+    assert response.status_code == 404
+
+
+def test_failed_lookup_is_unavailable(client, monkeypatch):
+    class FailingLookup:
+        async def get_many(self, addresses):
+            raise RuntimeError("TzKT unavailable")
+
+    monkeypatch.setitem(main.baker_lookups, "mainnet", FailingLookup())
+    response = client.post("/api/bakers", json={"addresses": [address(1)]})
+    assert response.status_code == 503
@@ -0,0 +1,86 @@
+import pytest
+
+from baker_store import BakerStore
+from benchmark import HEAD_CYCLE, MockServer, synthetic_bakers
+from dal_calculation import DALCalculator
+
+CYCLE = HEAD_CYCLE - 1
+
+
+@pytest.fixture
+def chain():
+    server = MockServer(synthetic_bakers(5))
+    yield server
+    server.stop()
+
+
+def test_baker_whose_stake_fetch_failed_is_queried_again(chain, tmp_path, monkeypatch):
+    store = BakerStore(tmp_path / "baker_results.sqlite3")
+    bakers = synthetic_bakers(5)
+    target = bakers[0]["address"]
+    # Bakers whose DAL participation the mock never answers stay unsettled too
+    unclassified = [baker["address"] for baker in bakers if baker["attestedSlots"] is None]
+    assert target not in unclassified
+    queried = []
+
+    # Leave the baker out of the bulk baking powers so its stake is fetched on its own
+    get_cycle_baking_powers = DALCalculator.get_cycle_baking_powers
+    monkeypatch.setattr(DALCalculator, "get_cycle_baking_powers", lambda self, cycle: {
+        address: power for address, power in get_cycle_baking_powers(self, cycle).items() if address != target
+    })
+    process_delegate = DALCalculator.process_delegate
+    monkeypatch.setattr(DALCalculator, "process_delegate", lambda self, delegate, *args, **kwargs: (
+        queried.append(delegate["address"]), process_delegate(self, delegate, *args, **kwargs))[1])
+
+    def run():
+        calculator = DALCalculator(api_url=chain.api_url, rpc_url=chain.rpc_url, baker_store=store)
+        return calculator.calculate_stats(cycle=CYCLE)
+
+    # First run: every stake lookup of the baker fails
+    fetch_json = DALCalculator._fetch_json
+    with monkeypatch.context() as failing:
+        failing.setattr(DALCalculator, "_fetch_json",
+                        lambda self, url: None if target in url else fetch_json(self, url))
+        run()
+    stored = store.get_result("mainnet", CYCLE, target)
+    assert stored.stake is None
+    assert stored.dal_status is not None
+    assert not stored.settled
+
+    # Second run: only the bakers left unsettled are queried again
+    queried.clear()
+    run()
+    assert sorted(queried) == sorted([target] + unclassified)
+    stored = store.get_result("mainnet", CYCLE, target)
+    assert stored.stake == bakers[0]["stakingBalance"]
+    assert stored.settled
+    store.close()
+
+
+def test_dal_participation_is_resolved_in_bulk(chain, tmp_path, monkeypatch):
+    store = BakerStore(tmp_path / "baker_results.sqlite3")
+    resolved = []
+    init = DALCalculator.__init__
+
+    def track_resolver(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        bulk = self.dal_resolver.resolve
+
+        async def resolve_in_bulk(addresses, level):
+            addresses = list(addresses)
+            resolved.append(addresses)
+            return await bulk(addresses, level)
+        self.dal_resolver.resolve = resolve_in_bulk
+
+    monkeypatch.setattr(DALCalculator, "__init__", track_resolver)
+    monkeypatch.setattr(DALCalculator, "get_dal_attested_slots", lambda self, delegate, cycle: pytest.fail(
+        f"{delegate['address']} looked up on its own"))
+
+    calculator = DALCalculator(api_url=chain.api_url, rpc_url=chain.rpc_url, baker_store=store)
+    calculator.calculate_stats(cycle=CYCLE)
+
+    bakers = synthetic_bakers(5)
+    assert sorted(resolved[0]) == sorted(baker["address"] for baker in bakers)
+    for baker in bakers:
+        assert store.get_result("mainnet", CYCLE, baker["address"]).attested_slots == baker["attestedSlots"]
+    store.close()
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from dal_checker import DIFF_SUFFIX, FULL_SUFFIX, StatusBackups
+
+START = datetime(2025, 1, 1)
+
+
+def status(at: datetime, online) -> dict:
+    """dal_status.json content with the given bakers online (the others offline)"""
+    checked = at.isoformat()
+    return {
+        "timestamp": checked,
+        "data": {baker: {"online": baker in online, "peers": 1, "last_checked": checked}
+                 for baker in ("tz1a", "tz1b", "tz1c", "tz1d")},
+    }
+
+
+def kinds(backups: StatusBackups) -> str:
+    return "".join("F" if is_full else "d" for _, _, is_full in backups.entries())
+
+
+@pytest.fixture
+def hourly(tmp_path):
+    """Back up a status every hour, a different baker online each time"""
+    backups = StatusBackups(tmp_path, retention_days=1, full_every=4)
+
+    def save(hours: int):
+        saved = []
+        for hour in range(hours):
+            at = START + timedelta(hours=hour)
+            saved.append((at, status(at, {("tz1a", "tz1b", "tz1c")[hour % 3]})))
+            backups.save(saved[-1][1], now=at)
+        return saved
+
+    return backups, save
+
+
+def test_full_backup_every_n_backups(hourly):
+    backups, save = hourly
+    save(10)
+    assert kinds(backups) == "FdddFdddFd"
+    names = [path.name for _, path, _ in backups.entries()]
+    assert names[0] == "dal_status_20250101_000000" + FULL_SUFFIX
+    assert names[1] == "dal_status_20250101_010000" + DIFF_SUFFIX
+
+
+def test_diff_only_holds_changed_and_removed_bakers(tmp_path):
+    backups = StatusBackups(tmp_path, full_every=4)
+    backups.save(status(START, {"tz1a"}), now=START)
+
+    later = START + timedelta(hours=1)
+    current = status(later, {"tz1b"})
+    del current["data"]["tz1d"]
+    path = backups.save(current, now=later)
+
+    diff = json.loads(path.read_text())
+    # tz1c only has a new last_checked, which restore rebuilds
+    assert sorted(diff["changed"]) == ["tz1a", "tz1b"]
+    assert diff["removed"] == ["tz1d"]
+
+
+def test_restore_rebuilds_every_backup(hourly):
+    backups, save = hourly
+    saved = save(10)
+    assert backups.restore() == saved[-1][1]
+    for at, expected in saved:
+        assert backups.restore(until=at) == expected
+
+
+def test_rotation_keeps_the_full_backup_the_remaining_diffs_build_on(hourly):
+    backups, save = hourly
+    saved = save(30)
+
+    entries = backups.entries()
+    cutoff = saved[-1][0] - timedelta(days=1)
+    # Hour 5 is the first within the retention period; it is a diff of the hour 4 full backup
+    assert entries[0][0] == START + timedelta(hours=4) < cutoff
+    assert entries[0][2]
+    assert entries[1][0] >= cutoff
+    assert len(entries) == 26
+    assert backups.restore() == saved[-1][1]
+    assert backups.restore(until=cutoff) == saved[5][1]
+
+
+def test_rotation_drops_whole_chains_once_expired(hourly):
+    backups, save = hourly
+    save(8)
+    removed = backups.rotate(now=START + timedelta(days=1, hours=4))
+    # Hours 4 to 7 are kept as one chain starting with the hour 4 full backup
+    assert len(removed) == 4
+    assert kinds(backups) == "Fddd"
+
+
+def test_legacy_backups_are_never_read_nor_deleted(tmp_path):
+    legacy = tmp_path / "dal_status_20240101_000000.json"
+    legacy.write_text(json.dumps(status(START, {"tz1a"})))
+    other = tmp_path / "dal_status_latest.full.json"
+    other.write_text("{}")
+
+    backups = StatusBackups(tmp_path, retention_days=1, full_every=4)
+    assert backups.restore() is None
+    # With only legacy files, the first backup is a full one
+    later = START + timedelta(days=30)
+    path = backups.save(status(later, {"tz1b"}), now=later)
+    assert path.name.endswith(FULL_SUFFIX)
+    assert legacy.exists() and other.exists()
+    assert backups.restore() == status(later, {"tz1b"})
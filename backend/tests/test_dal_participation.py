@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dal_participation import DALParticipationResolver, sample_levels
+from fetch_engine import FetchEngine
+
+RPC = "https://rpc.tzkt.io/mainnet"
+
+
+class BlockingFetch:
+    """dal_participation answers held until released, counting the requests per URL"""
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.calls = {}
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        with self._lock:
+            self.calls[url] = self.calls.get(url, 0) + 1
+        self.started.set()
+        assert self.release.wait(5)
+        address = url.split("/delegates/")[1].split("/")[0]
+        slots = self.slots.get(address)
+        return None if slots is None else {"delegate_attested_dal_slots": slots}
+
+
+@pytest.fixture
+def engine():
+    engine = FetchEngine(max_concurrency=8)
+    yield engine
+    engine.close()
+
+
+class CountingDict(dict):
+    """In-flight table counting how many lookups have checked it"""
+
+    def __init__(self):
+        super().__init__()
+        self.checked = threading.Semaphore(0)
+
+    def get(self, key, default=None):
+        self.checked.release()
+        return super().get(key, default)
+
+
+def test_concurrent_lookups_of_a_baker_share_one_request(engine):
+    fetch = BlockingFetch({"tz1a": 12})
+    resolver = DALParticipationResolver(RPC, fetch, engine)
+    resolver._in_flight = in_flight = CountingDict()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        lookups = [pool.submit(resolver.lookup, "tz1a", 99) for _ in range(4)]
+        # Every lookup has joined the first one before it is answered
+        for _ in range(4):
+            assert in_flight.checked.acquire(timeout=5)
+        assert fetch.started.wait(5)
+        fetch.release.set()
+        assert [lookup.result(timeout=5) for lookup in lookups] == [12] * 4
+
+    assert fetch.calls == {resolver.url("tz1a", 99): 1}
+    # Once answered, the lookup is no longer in flight and a new one is sent
+    resolver.lookup("tz1a", 99)
+    assert fetch.calls[resolver.url("tz1a", 99)] == 2
+
+
+def test_lookups_at_different_levels_are_not_shared(engine):
+    fetch = BlockingFetch({"tz1a": 12})
+    fetch.release.set()
+    resolver = DALParticipationResolver(RPC, fetch, engine)
+
+    resolver.lookup("tz1a", 98)
+    resolver.lookup("tz1a", 99)
+    assert len(fetch.calls) == 2
+
+
+def test_resolve_returns_a_map_of_every_baker(engine):
+    fetch = BlockingFetch({"tz1a": 12, "tz1b": 0})
+    fetch.release.set()
+    resolver = DALParticipationResolver(RPC, fetch, engine)
+
+    slots = asyncio.run(resolver.resolve(["tz1a", "tz1b", "tz1c"], 99))
+
+    assert slots == {"tz1a": 12, "tz1b": 0, "tz1c": None}
+
+
+def test_resolve_sampled_only_retries_unresolved_bakers_at_earlier_levels(engine):
+    answers = {(99, "tz1a"): 12, (50, "tz1b"): 3}
+    queried = []
+
+    def fetch(url):
+        level = int(url.split("/blocks/")[1].split("/")[0])
+        address = url.split("/delegates/")[1].split("/")[0]
+        queried.append((level, address))
+        slots = answers.get((level, address))
+        return None if slots is None else {"delegate_attested_dal_slots": slots}
+
+    resolver = DALParticipationResolver(RPC, fetch, engine)
+    slots = asyncio.run(resolver.resolve_sampled(["tz1a", "tz1b", "tz1c"], [99, 50]))
+
+    assert slots == {"tz1a": 12, "tz1b": 3, "tz1c": None}
+    assert sorted(queried) == [(50, "tz1b"), (50, "tz1c"), (99, "tz1a"), (99, "tz1b"), (99, "tz1c")]
+
+
+def test_sample_levels_start_before_the_last_block():
+    assert sample_levels(1, 100) == [99]
+    assert sample_levels(1, 100, samples=3) == [99, 66, 34]
@@ -0,0 +1,186 @@
+import pytest
+import requests
+
+import fetch_engine
+from fetch_engine import (RETRY_STATUSES, AdaptiveConcurrency, FetchEngine, HostRateLimiter, RetryPolicy,
+                          TokenBucket)
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping only advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        # Like a real clock, always move forward (float rounding can ask for a few ulps)
+        self.now += max(seconds, 1e-9)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fetch_engine, "time", clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_the_configured_rate(clock):
+    bucket = TokenBucket(rate=5, capacity=2)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    # The burst is spent: the next tokens come every 1/rate seconds
+    assert bucket.acquire() == pytest.approx(0.2)
+    assert bucket.acquire() == pytest.approx(0.2)
+
+
+def test_bucket_refills_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=5, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now += 60
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.2)
+
+
+def test_limiter_keeps_one_bucket_per_host(clock):
+    limiter = HostRateLimiter({"api.tzkt.io": 1}, default_rate=1)
+
+    assert limiter.acquire("https://api.tzkt.io/v1/head") == 0
+    # Another host has its own bucket, created with the default rate
+    assert limiter.acquire("https://rpc.tzkt.io/mainnet/chains/main/blocks/head") == 0
+    assert limiter.acquire("https://api.tzkt.io/v1/cycles/900") == pytest.approx(1.0)
+    assert limiter.bucket_for("https://rpc.tzkt.io/x").rate == 1
+
+
+def test_configured_rate_wins_over_later_ones(clock):
+    limiter = HostRateLimiter({"api.tzkt.io": 10})
+    limiter.ensure_rate("api.tzkt.io", 1)
+    limiter.ensure_rate("rpc.tzkt.io", 2)
+
+    assert limiter.bucket_for("https://api.tzkt.io/v1/head").rate == 10
+    assert limiter.bucket_for("https://rpc.tzkt.io/mainnet").rate == 2
+
+
+def test_paused_bucket_hands_out_no_token_until_the_pause_ends(clock):
+    bucket = TokenBucket(rate=5, capacity=2)
+    bucket.pause(3)
+
+    # The burst was dropped by the pause: tokens accumulate again from its end
+    assert bucket.acquire() == pytest.approx(3.2)
+    assert bucket.acquire() == pytest.approx(0.2)
+
+
+def response(status, **headers):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers)
+    return result
+
+
+def test_retry_after_accepts_seconds_and_http_dates(clock):
+    policy = RetryPolicy(max_delay=30)
+    clock.now = 1_700_000_000.0
+
+    assert policy.retry_after(response(429, **{"Retry-After": "2"})) == 2
+    assert policy.retry_after(response(503, **{"Retry-After": "Tue, 14 Nov 2023 22:13:30 GMT"})) == pytest.approx(10)
+    assert policy.retry_after(response(429, **{"Retry-After": "3600"})) == 30
+    assert policy.retry_after(response(429, **{"Retry-After": "soon"})) is None
+    assert policy.retry_after(response(429)) is None
+
+
+def test_concurrency_grows_by_one_per_round_of_successes():
+    concurrency = AdaptiveConcurrency(max_limit=16)
+    assert concurrency.limit == 8
+
+    for _ in range(8):
+        concurrency.on_success()
+    assert concurrency.limit == pytest.approx(9, abs=0.1)
+
+    for _ in range(1000):
+        concurrency.on_success()
+    assert concurrency.limit == 16
+
+
+def test_concurrency_halves_at_most_once_per_cooldown(clock):
+    concurrency = AdaptiveConcurrency(max_limit=16, cooldown=1.0)
+
+    assert concurrency.on_overload()
+    assert concurrency.limit == 4
+    # A burst of failures is one overload signal
+    assert not concurrency.on_overload()
+    assert concurrency.limit == 4
+
+    clock.now += 1.0
+    assert concurrency.on_overload()
+    assert concurrency.limit == 2
+    clock.now += 1.0
+    concurrency.on_overload()
+    clock.now += 1.0
+    concurrency.on_overload()
+    assert concurrency.limit == 1
+
+
+class ScriptedSession:
+    """Answers GETs with the given statuses in turn"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, timeout):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def engine(clock):
+    engine = FetchEngine(max_concurrency=4, default_rate=1000, retry=RetryPolicy(max_attempts=3))
+    yield engine
+    engine.close()
+
+
+@pytest.mark.parametrize("status", sorted(RETRY_STATUSES))
+def test_throttled_and_unavailable_responses_are_retried(engine, status):
+    engine.session = ScriptedSession(response(status), response(200))
+
+    assert engine.get("https://api.tzkt.io/v1/head").status_code == 200
+    assert engine.session.calls == 2
+
+
+@pytest.mark.parametrize("status", [200, 404, 500])
+def test_other_responses_are_returned_as_is(engine, status):
+    engine.session = ScriptedSession(response(status))
+
+    assert engine.get("https://rpc.tzkt.io/mainnet/dal_participation").status_code == status
+    assert engine.session.calls == 1
+
+
+def test_last_failed_response_is_returned_once_attempts_are_exhausted(engine):
+    engine.session = ScriptedSession(response(429), response(503), response(502))
+
+    assert engine.get("https://api.tzkt.io/v1/head").status_code == 502
+    assert engine.session.calls == 3
+
+
+def test_retry_after_pauses_the_whole_host(engine, clock):
+    engine.session = ScriptedSession(response(429, **{"Retry-After": "5"}), response(200))
+    started = clock.now
+
+    assert engine.get("https://api.tzkt.io/v1/head").status_code == 200
+    assert clock.now - started == pytest.approx(5, abs=0.01)
+    # Requests to the host wait out the pause, not only the retried one
+    assert engine.limiter.bucket_for("https://api.tzkt.io/v1/cycles/1")._paused_until == pytest.approx(started + 5)
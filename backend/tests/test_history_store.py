@@ -0,0 +1,43 @@
+import json
+
+from history_store import HISTORY_FIELDS, HistoryStore
+
+
+def cycle_results(cycle: int) -> dict:
+    return {field: cycle for field in HISTORY_FIELDS}
+
+
+def test_update_appends_without_rewriting_earlier_entries(tmp_path):
+    history_file = tmp_path / "dal_stats_history.json"
+    store = HistoryStore(history_file)
+    store.update([cycle_results(cycle) for cycle in range(1, 11)])
+    store.export()
+    log_before = store.log_file.read_bytes()
+    export_before = history_file.read_bytes()
+
+    store.update([cycle_results(11)])
+
+    log_after = store.log_file.read_bytes()
+    assert log_after.startswith(log_before)
+    assert [json.loads(line)["cycle"] for line in log_after[len(log_before):].splitlines()] == [11]
+    assert history_file.read_bytes() == export_before
+
+    store.export()
+    assert [entry["cycle"] for entry in json.loads(history_file.read_bytes())] == list(range(11, 0, -1))
+    assert HistoryStore(history_file).cycles() == list(range(1, 12))
+
+
+def test_cycles_appended_before_a_crash_are_exported_by_the_next_run(tmp_path):
+    history_file = tmp_path / "dal_stats_history.json"
+    store = HistoryStore(history_file)
+    store.update([cycle_results(cycle) for cycle in range(1, 4)])
+    store.export()
+
+    # The run appends cycle 4 to the log, then crashes before exporting
+    HistoryStore(history_file).update([cycle_results(4)])
+
+    # The next run computes the same cycle again, which changes nothing in the log
+    store = HistoryStore(history_file)
+    assert store.update([cycle_results(4)]) == []
+    store.export()
+    assert [entry["cycle"] for entry in json.loads(history_file.read_bytes())] == [4, 3, 2, 1]
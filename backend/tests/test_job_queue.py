@@ -0,0 +1,115 @@
+import asyncio
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+class Work:
+    """Job body held until released, counting its runs"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error:
+            raise RuntimeError(self.error)
+        return self.result
+
+
+def test_submitting_an_active_key_returns_the_same_job():
+    queue = JobQueue()
+
+    async def run():
+        work, other = Work(result={"cycle": 1}), Work()
+        first = queue.submit("calculation:mainnet", work)
+        assert first.status == QUEUED
+        # Queued: every caller shares the job
+        assert queue.submit("calculation:mainnet", other) is first
+
+        await work.started.wait()
+        assert first.status == RUNNING
+        # Running: still shared
+        assert queue.submit("calculation:mainnet", other) is first
+        assert queue.active("calculation:mainnet") is first
+
+        work.release.set()
+        while first.active:
+            await asyncio.sleep(0)
+        await queue.aclose()
+        return first, work, other
+
+    job, work, other = asyncio.run(run())
+    assert job.status == DONE and job.result == {"cycle": 1}
+    assert work.runs == 1 and other.runs == 0
+    assert queue.active("calculation:mainnet") is None
+    assert queue.get(job.id) is job
+
+
+def test_a_finished_key_gets_a_new_job():
+    queue = JobQueue()
+
+    async def run():
+        failing, retry = Work(error="TzKT unavailable"), Work()
+        failing.release.set()
+        retry.release.set()
+        first = queue.submit("calculation:mainnet", failing)
+        while first.active:
+            await asyncio.sleep(0)
+        second = queue.submit("calculation:mainnet", retry)
+        while second.active:
+            await asyncio.sleep(0)
+        await queue.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+    assert first.status == FAILED and first.error == "TzKT unavailable"
+    assert second.status == DONE
+
+
+def test_different_keys_run_one_at_a_time():
+    queue = JobQueue()
+
+    async def run():
+        mainnet, ghostnet = Work(), Work()
+        first = queue.submit("calculation:mainnet", mainnet)
+        second = queue.submit("calculation:ghostnet", ghostnet)
+        assert first is not second
+
+        await mainnet.started.wait()
+        await asyncio.sleep(0)
+        assert second.status == QUEUED and ghostnet.runs == 0
+
+        mainnet.release.set()
+        await ghostnet.started.wait()
+        assert first.status == DONE and second.status == RUNNING
+        ghostnet.release.set()
+        while second.active:
+            await asyncio.sleep(0)
+        await queue.aclose()
+
+    asyncio.run(run())
+
+
+def test_finished_jobs_are_pruned():
+    queue = JobQueue(max_finished=2)
+
+    async def run():
+        jobs = []
+        for i in range(4):
+            work = Work(result=i)
+            work.release.set()
+            jobs.append(queue.submit(f"job:{i}", work))
+            while jobs[-1].active:
+                await asyncio.sleep(0)
+        await queue.aclose()
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert list(queue.jobs) == [job.id for job in jobs[2:]]
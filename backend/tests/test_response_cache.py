@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+import response_cache
+from response_cache import DEFAULT_TTL, HEAD_TTL, IMMUTABLE, RECENT_TTL, CachePolicy, ResponseCache
+
+API = "https://api.tzkt.io/v1"
+RPC = "https://rpc.tzkt.io/mainnet"
+
+
+@pytest.fixture
+def policy():
+    policy = CachePolicy()
+    policy.observe_head({"level": 10_000, "cycle": 100})
+    return policy
+
+
+@pytest.mark.parametrize("url, ttl", [
+    (f"{API}/head", HEAD_TTL),
+    # Finalized levels never change, the last ones may still be reorganized
+    (f"{RPC}/chains/main/blocks/9998/context/delegates/tz1x/dal_participation", IMMUTABLE),
+    (f"{RPC}/chains/main/blocks/9999/context/delegates/tz1x/dal_participation", HEAD_TTL),
+    (f"{API}/delegates/tz1x?at=9000", IMMUTABLE),
+    (f"{API}/delegates/tz1x?at=9999", HEAD_TTL),
+    # Past cycles are final, the running one is not
+    (f"{API}/cycles/99", IMMUTABLE),
+    (f"{API}/cycles/100", RECENT_TTL),
+    (f"{API}/rewards/bakers?cycle=99&limit=10000", IMMUTABLE),
+    (f"{API}/rewards/bakers/tz1x?cycle=100", RECENT_TTL),
+    (f"{API}/rewards/bakers/tz1x?cycle=latest", RECENT_TTL),
+    # Listings of the current state
+    (f"{API}/delegates?active=true&limit=10000", DEFAULT_TTL),
+    (f"{API}/delegates/tz1x", DEFAULT_TTL),
+])
+def test_ttl_by_endpoint_class(policy, url, ttl):
+    assert policy.ttl_for(url) == ttl
+
+
+def test_nothing_is_immutable_before_head_was_seen():
+    policy = CachePolicy()
+
+    assert policy.ttl_for(f"{API}/cycles/1") == RECENT_TTL
+    assert policy.ttl_for(f"{RPC}/chains/main/blocks/1/context/delegates/tz1x/dal_participation") == HEAD_TTL
+
+
+def test_entries_expire_after_their_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    cache.put(f"{API}/head", {"cycle": 100}, HEAD_TTL)
+    cache.put(f"{API}/cycles/99", {"index": 99}, IMMUTABLE)
+
+    now[0] += HEAD_TTL - 1
+    assert cache.get(f"{API}/head") == {"cycle": 100}
+    now[0] += 1
+    assert cache.get(f"{API}/head") is None
+    now[0] += 10 ** 9
+    assert cache.get(f"{API}/cycles/99") == {"index": 99}
+    cache.close()
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+import main
+from broadcaster import Broadcaster
+
+HISTORY_CYCLES = range(100, 106)
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Stream state of mainnet: cycles 100-105 in the history, 105 in the stats snapshot"""
+    history = tmp_path / "dal_stats_history.json"
+    history.write_text(json.dumps([{"cycle": cycle} for cycle in reversed(HISTORY_CYCLES)]))
+    index = main.HistoryIndex(history, "http://127.0.0.1:9/history.json", max_age=300)
+    snapshot = main.StatsSnapshot(max_age=300)
+    snapshot.data = {"cycle": HISTORY_CYCLES[-1]}
+    monkeypatch.setattr(main, "history_index", index)
+    monkeypatch.setitem(main.stats_snapshots, "mainnet", snapshot)
+    monkeypatch.setitem(main.live_stats, "mainnet", main.LiveStats(tmp_path / "dal_stats_live.json"))
+    monkeypatch.setitem(main.broadcasters, "mainnet", Broadcaster())
+    return main.broadcasters["mainnet"]
+
+
+def request(last_event_id=None) -> Request:
+    headers = [] if last_event_id is None else [(b"last-event-id", last_event_id.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/api/stream", "query_string": b"", "headers": headers})
+
+
+def parse(frame: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return {"id": fields["id"], "event": fields["event"], "data": json.loads(fields["data"])}
+
+
+async def open_stream(last_event_id=None, last_cycle=None):
+    response = await main.stream(request(last_event_id), network="mainnet", last_cycle=last_cycle)
+    body = response.body_iterator
+    assert (await body.__anext__()).startswith(b"retry: ")
+    return body
+
+
+async def receive(body, count: int):
+    return [parse(await asyncio.wait_for(body.__anext__(), 5)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("last_event_id, cycle", [
+    (None, None),
+    ("", None),
+    ("103", 103),
+    # A live estimate of cycle 104 means the client has cycle 103 at most
+    ("104.7", 103),
+    ("not-a-cycle", None),
+])
+def test_resume_cycle_from_last_event_id(last_event_id, cycle):
+    assert main.resume_cycle(last_event_id) == cycle
+
+
+def test_new_client_gets_the_latest_cycle_then_updates(api):
+    async def run():
+        body = await open_stream()
+        first = await receive(body, 1)
+        api.publish("live", "106.3", {"cycle": 106, "level": 3})
+        update = await receive(body, 1)
+        await body.aclose()
+        return first + update
+
+    events = asyncio.run(run())
+    assert [(e["event"], e["id"]) for e in events] == [("stats", "105"), ("live", "106.3")]
+    assert api.subscribers == 0
+
+
+@pytest.mark.parametrize("last_event_id, missed", [
+    ("102", ["103", "104", "105"]),
+    ("104.9", ["104", "105"]),
+])
+def test_reconnecting_client_resumes_after_last_event_id(api, last_event_id, missed):
+    async def run():
+        body = await open_stream(last_event_id)
+        events = await receive(body, len(missed))
+        # The latest cycle was among the missed ones and is not sent again
+        api.publish("stats", "106", {"cycle": 106})
+        events += await receive(body, 1)
+        await body.aclose()
+        return events
+
+    events = asyncio.run(run())
+    assert [e["id"] for e in events] == missed + ["106"]
+    assert all(e["event"] == "stats" for e in events)
+    assert [e["data"]["cycle"] for e in events] == [int(cycle) for cycle in missed] + [106]
+
+
+def test_last_cycle_query_overrides_last_event_id(api):
+    async def run():
+        body = await open_stream("100", last_cycle=104)
+        events = await receive(body, 1)
+        await body.aclose()
+        return events
+
+    assert [e["id"] for e in asyncio.run(run())] == ["105"]
+
+
+def test_up_to_date_client_only_gets_new_events(api):
+    async def run():
+        body = await open_stream("105")
+        api.publish("stats", "106", {"cycle": 106})
+        events = await receive(body, 1)
+        await body.aclose()
+        return events
+
+    assert [e["id"] for e in asyncio.run(run())] == ["106"]
+
+
+def test_lagged_subscriber_is_disconnected_to_resume(api, monkeypatch):
+    monkeypatch.setitem(main.broadcasters, "mainnet", Broadcaster(backlog=2))
+    broadcaster = main.broadcasters["mainnet"]
+
+    async def run():
+        body = await open_stream("105")
+        for cycle in range(106, 110):
+            broadcaster.publish("stats", str(cycle), {"cycle": cycle})
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(body.__anext__(), 5)
+
+    asyncio.run(run())
+    assert broadcaster.subscribers == 0
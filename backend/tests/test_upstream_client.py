@@ -0,0 +1,180 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import upstream_client
+from upstream_client import CircuitBreaker, CircuitOpenError, UpstreamClient
+
+URL = "https://api.tzkt.io/v1/head"
+
+
+class FakeClock:
+    """time.monotonic stand-in moved by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(upstream_client, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+class Upstream:
+    """MockTransport handler answering the queued statuses, held until released"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        self.started.set()
+        await self.release.wait()
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status is None:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status, json={"level": 1})
+
+
+def connect(client: UpstreamClient, upstream: Upstream):
+    """Point the client's pool at the handler; must run inside the event loop"""
+    client._loop = asyncio.get_running_loop()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+
+
+def counter(client: UpstreamClient, name: str) -> float:
+    return sum(c["value"] for c in client.metrics.snapshot()["counters"] if c["name"] == name)
+
+
+def test_concurrent_gets_of_a_url_share_one_request():
+    client = UpstreamClient()
+
+    async def run():
+        upstream = Upstream()
+        upstream.release.clear()
+        connect(client, upstream)
+        gets = asyncio.gather(*(client.get(URL) for _ in range(4)))
+        await upstream.started.wait()
+        upstream.release.set()
+        responses = await gets
+        # Once answered, the request is no longer in flight
+        await client.get(URL)
+        await client.aclose()
+        return upstream, responses
+
+    upstream, responses = asyncio.run(run())
+    assert len(upstream.requests) == 2
+    assert all(response.json() == {"level": 1} for response in responses)
+    assert counter(client, "upstream_coalesced_total") == 3
+    assert client._in_flight == {}
+
+
+def test_gets_with_different_headers_are_not_shared():
+    client = UpstreamClient()
+
+    async def run():
+        upstream = Upstream()
+        connect(client, upstream)
+        await asyncio.gather(client.get(URL), client.get(URL, {"Accept": "application/json"}))
+        await client.aclose()
+        return upstream
+
+    assert len(asyncio.run(run()).requests) == 2
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_request():
+    client = UpstreamClient()
+
+    async def run():
+        upstream = Upstream()
+        upstream.release.clear()
+        connect(client, upstream)
+        first = asyncio.create_task(client.get(URL))
+        second = asyncio.create_task(client.get(URL))
+        await upstream.started.wait()
+        first.cancel()
+        upstream.release.set()
+        response = await second
+        await client.aclose()
+        return first, response, upstream
+
+    first, response, upstream = asyncio.run(run())
+    assert first.cancelled()
+    assert response.status_code == 200
+    assert len(upstream.requests) == 1
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    breaker.on_failure()
+    breaker.on_failure()
+    # A success resets the count
+    breaker.on_success()
+    breaker.on_failure()
+    breaker.on_failure()
+    assert breaker.allow() and not breaker.is_open
+
+    breaker.on_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+    clock.now += 29.9
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.on_failure()
+
+    clock.now += 30
+    assert breaker.allow()
+    # Callers keep failing fast while the probe is running
+    assert not breaker.allow()
+
+    # A failed probe re-opens the circuit for a full reset_timeout
+    breaker.on_failure()
+    clock.now += 29.9
+    assert not breaker.allow()
+    clock.now += 0.1
+    assert breaker.allow()
+
+    breaker.on_success()
+    assert not breaker.is_open
+    assert breaker.allow() and breaker.allow()
+
+
+def test_open_circuit_fails_fast_without_network_access(clock):
+    client = UpstreamClient(failure_threshold=2, reset_timeout=30)
+
+    async def run():
+        # A transport error and a 5xx both count as failures, a 4xx does not
+        upstream = Upstream(404, None, 503)
+        connect(client, upstream)
+        assert (await client.get(URL)).status_code == 404
+        with pytest.raises(httpx.ConnectError):
+            await client.get(URL)
+        assert (await client.get(URL)).status_code == 503
+        with pytest.raises(CircuitOpenError):
+            await client.get(URL)
+        assert len(upstream.requests) == 3
+
+        # Other hosts have their own circuit
+        assert (await client.get("https://rpc.tzkt.io/mainnet/version")).status_code == 200
+
+        clock.now += 30
+        assert (await client.get(URL)).status_code == 200
+        assert not client.breaker(URL).is_open
+        await client.aclose()
+
+    asyncio.run(run())
+    assert counter(client, "upstream_short_circuits_total") == 1
@@ -1,13 +1,23 @@
 #!/bin/bash
 
-# This script sets up the cron job for updating DAL statistics
+# This script sets up the cycle scheduler service and a fallback cron job for updating DAL statistics
 
 # Create log directory if it doesn't exist
 mkdir -p /opt/dal_dashboard/logs
 
-# Set up cron job to run update_dal_stats.sh every 6 hours
+# The scheduler calculates each cycle as soon as it ends and runs update_dal_stats.sh to publish it
+if command -v systemctl >/dev/null 2>&1; then
+    sudo cp /opt/dal_dashboard/dal_scheduler.service /etc/systemd/system/dal_scheduler.service
+    sudo systemctl daemon-reload
+    sudo systemctl enable --now dal_scheduler.service
+    echo "Scheduler service enabled. Check it with: systemctl status dal_scheduler"
+else
+    echo "systemctl not found: start backend/scripts/cycle_scheduler.py with your process manager"
+fi
+
+# Keep a daily cron run as a safety net in case the scheduler is down
 (crontab -l 2>/dev/null | grep -v "dal_dashboard.*update_dal_stats" || true; 
- echo "0 */6 * * * cd /opt/dal_dashboard && ./backend/scripts/update_dal_stats.sh > /opt/dal_dashboard/logs/dal_update.log 2>&1") | crontab -
+ echo "0 3 * * * cd /opt/dal_dashboard && ./backend/scripts/update_dal_stats.sh > /opt/dal_dashboard/logs/dal_update.log 2>&1") | crontab -
 
-echo "Cron job set up successfully. It will run every 6 hours."
-echo "Check the current crontab with: crontab -l" 
\ No newline at end of file
+echo "Fallback cron job set up successfully. It will run once a day."
+echo "Check the current crontab with: crontab -l"
@@ -1,6 +1,41 @@
 import { NextRequest, NextResponse } from 'next/server';
 
 const HISTORY_URL = process.env.NEXT_PUBLIC_HISTORY_URL || 'https://aurelienmonteillet.github.io/dal-dashboard/dal_stats_history.json';
+const BUNDLE_URL = process.env.NEXT_PUBLIC_BUNDLE_URL || 'https://aurelienmonteillet.github.io/dal-dashboard/api';
+
+/**
+ * Fetch the bundle manifest, whose content hashes version the bundle URLs
+ */
+async function fetchManifest(): Promise<any | null> {
+    try {
+        const response = await fetch(`${BUNDLE_URL}/manifest.json`, {
+            next: { revalidate: 300 } // The manifest changes with every new cycle
+        });
+        return response.ok ? await response.json() : null;
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * Fetch a single cycle from the static API bundle, or null if the bundle does not have it
+ */
+async function fetchBundledCycle(cycle: number): Promise<any | null> {
+    try {
+        const manifest = await fetchManifest();
+        const hash = manifest?.files?.[`cycle/${cycle}.json`]?.hash;
+        if (!hash) {
+            return null;
+        }
+        // A new hash is a new URL, so a cached copy of an older content is never served
+        const response = await fetch(`${BUNDLE_URL}/cycle/${cycle}.json?v=${hash}`, {
+            next: { revalidate: 86400 }
+        });
+        return response.ok ? await response.json() : null;
+    } catch {
+        return null;
+    }
+}
 
 /**
  * GET handler for specific cycle statistics
@@ -20,18 +55,21 @@ export async function GET(
             );
         }
 
-        // Fetch all history data
-        const response = await fetch(HISTORY_URL, {
-            next: { revalidate: 3600 } // Revalidate every hour
-        });
+        // Fetch only this cycle from the bundle, falling back to the full history
+        let cycleData = await fetchBundledCycle(cycle);
+        if (!cycleData) {
+            const response = await fetch(HISTORY_URL, {
+                next: { revalidate: 3600 } // Revalidate every hour
+            });
 
-        if (!response.ok) {
-            throw new Error(`Failed to fetch history: ${response.status}`);
-        }
+            if (!response.ok) {
+                throw new Error(`Failed to fetch history: ${response.status}`);
+            }
 
-        // Find the specific cycle
-        const allData = await response.json();
-        const cycleData = allData.find((entry: any) => entry.cycle === cycle);
+            // Find the specific cycle
+            const allData = await response.json();
+            cycleData = allData.find((entry: any) => entry.cycle === cycle);
+        }
 
         if (!cycleData) {
             return NextResponse.json(